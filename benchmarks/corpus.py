@@ -0,0 +1,152 @@
+"""Синтетический корпус страниц docs.python.org и peps.python.org.
+
+Страницы повторяют разметку, которую разбирает парсер, и дополнены
+текстом, чтобы их размер был близок к настоящему.
+"""
+import random
+
+MAIN_DOC_URL = "https://docs.python.org/3/"
+MAIN_PEPS_URL = "https://peps.python.org/"
+
+PEP_TYPES = {
+    "S": "Standards Track",
+    "I": "Informational",
+    "P": "Process",
+}
+PEP_STATUSES = {
+    "A": "Active",
+    "D": "Deferred",
+    "F": "Final",
+    "P": "Provisional",
+    "R": "Rejected",
+    "S": "Superseded",
+    "W": "Withdrawn",
+    "": "Draft",
+}
+WORDS = (
+    "python interpreter module syntax object runtime proposal "
+    "specification rationale backwards compatibility reference "
+    "implementation typing annotation generator coroutine"
+).split()
+
+
+def paragraphs(rng, kilobytes):
+    """HTML-абзацы текста суммарным размером около `kilobytes` КБ."""
+
+    chunks = []
+    size = 0
+    while size < kilobytes * 1024:
+        text = " ".join(rng.choice(WORDS) for _ in range(80))
+        chunk = f"<p>{text}.</p>\n"
+        chunks.append(chunk)
+        size += len(chunk)
+    return "".join(chunks)
+
+
+def page(title, body):
+    return (
+        "<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'>"
+        f"<title>{title}</title></head><body>"
+        "<nav><ul><li><a href='/'>Home</a></li></ul></nav>"
+        f"{body}</body></html>"
+    )
+
+
+def docs_main(versions=12):
+    items = "".join(
+        f"<li><a href='https://docs.python.org/3.{minor}/'>"
+        f"Python 3.{minor} (stable)</a></li>"
+        for minor in range(versions, 0, -1)
+    )
+    body = (
+        "<div class='sphinxsidebar'><div class='sphinxsidebarwrapper'>"
+        "<h3>Download</h3><ul><li><a href='download.html'>Download</a>"
+        "</li></ul><h3>Docs by version</h3><ul>"
+        f"{items}<li><a href='https://www.python.org/doc/versions/'>"
+        "All versions</a></li></ul></div></div>"
+    )
+    return page("Python documentation", body)
+
+
+def whats_new_index(versions):
+    items = "".join(
+        f"<li class='toctree-l1'><a class='reference internal' "
+        f"href='{version}.html'>What’s New In Python {version}</a></li>"
+        for version in versions
+    )
+    body = (
+        "<section id='what-s-new-in-python'><h1>What’s New in Python</h1>"
+        f"<div class='toctree-wrapper compound'><ul>{items}</ul></div>"
+        "</section>"
+    )
+    return page("What’s New in Python", body)
+
+
+def whats_new_page(rng, version, kilobytes):
+    body = (
+        f"<section><h1>What’s New In Python {version}"
+        "<a class='headerlink' href='#'>¶</a></h1>"
+        "<dl class='field-list simple'><dt>Editor<span>:</span></dt>"
+        f"<dd><p>Editor {version}</p></dd></dl>"
+        f"{paragraphs(rng, kilobytes)}</section>"
+    )
+    return page(f"What’s New In Python {version}", body)
+
+
+def pep_index(peps):
+    rows = "".join(
+        f"<tr><td><abbr title='{title}'>{code}</abbr></td>"
+        f"<td><a class='pep reference internal' href='pep-{number:04d}/'>"
+        f"{number}</a></td><td>PEP {number}</td><td>Author</td></tr>"
+        for number, code, title, _ in peps
+    )
+    body = (
+        "<section id='numerical-index'><h2>Numerical Index</h2>"
+        f"<table><tbody>{rows}</tbody></table></section>"
+    )
+    return page("PEP 0", body)
+
+
+def pep_card(rng, number, status, pep_type, kilobytes):
+    body = (
+        f"<section id='pep-content'><h1>PEP {number}</h1>"
+        "<dl class='rfc2822 field-list simple'>"
+        f"<dt>Author<span>:</span></dt><dd>Author {number}</dd>"
+        f"<dt>Status<span>:</span></dt><dd><abbr>{status}</abbr></dd>"
+        f"<dt>Type<span>:</span></dt><dd><abbr>{pep_type}</abbr></dd>"
+        "<dt>Created<span>:</span></dt><dd>01-Jan-2020</dd></dl>"
+        f"{paragraphs(rng, kilobytes)}</section>"
+    )
+    return page(f"PEP {number}", body)
+
+
+def build_corpus(size, kilobytes=20, seed=0):
+    """Словарь URL -> HTML для `size` PEP и `size` версий whats-new."""
+
+    rng = random.Random(seed)
+    peps = []
+    for number in range(1, size + 1):
+        type_code = rng.choice(list(PEP_TYPES))
+        status_code = rng.choice(list(PEP_STATUSES))
+        peps.append((
+            number,
+            type_code + status_code,
+            PEP_STATUSES[status_code],
+            PEP_TYPES[type_code],
+        ))
+    versions = [f"3.{minor}" for minor in range(size, 0, -1)]
+
+    corpus = {
+        MAIN_DOC_URL: docs_main(),
+        MAIN_DOC_URL + "whatsnew/": whats_new_index(versions),
+        MAIN_PEPS_URL: pep_index(peps),
+    }
+    for version in versions:
+        corpus[f"{MAIN_DOC_URL}whatsnew/{version}.html"] = whats_new_page(
+            rng, version, kilobytes
+        )
+    for number, _, status, pep_type in peps:
+        corpus[f"{MAIN_PEPS_URL}pep-{number:04d}/"] = pep_card(
+            rng, number, status, pep_type, kilobytes
+        )
+    return {url: html.encode() for url, html in corpus.items()}
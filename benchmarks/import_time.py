@@ -0,0 +1,152 @@
+"""Замер времени запуска парсера и импорта модулей.
+
+Каждый сценарий запускается в новом процессе интерпретатора с
+`-X importtime`: сохраняются медиана полного времени запуска, общее
+время импортов, загруженные тяжёлые зависимости и самые дорогие по
+накопленному времени импорты.
+
+Пример:
+    python benchmarks/import_time.py --repeat 10 --output startup.json
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+pep_table = importlib.import_module("pep_table")
+
+# зависимости, которые не должны загружаться без необходимости
+HEAVY_MODULES = (
+    "requests_cache",
+    "requests",
+    "bs4",
+    "lxml",
+    "prettytable",
+    "tqdm",
+)
+
+
+def scenarios(table_path):
+    """Аргументы интерпретатора для каждого сценария запуска."""
+
+    return {
+        "import main": ["-c", "import main"],
+        "--help": ["main.py", "--help"],
+        "pep-table": ["main.py", "pep-table", "--pep-table", str(table_path)],
+    }
+
+
+def parse_importtime(stderr):
+    """Накопленное время импорта модулей и общее время импортов в
+    микросекундах по выводу `-X importtime`."""
+
+    cumulative = {}
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        cumulative[name.strip()] = int(cumulative_us)
+        # вложенные импорты выводятся с дополнительным отступом
+        if name[1:] == name.strip():
+            total += int(cumulative_us)
+    return cumulative, total
+
+
+def run_scenario(arguments, repeat):
+    """Время запуска сценария и накопленное время импортов."""
+
+    walls = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", *arguments],
+            cwd=SRC_DIR,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        )
+        walls.append(time.perf_counter() - start)
+        process.check_returncode()
+    return walls, parse_importtime(process.stderr)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Замер времени запуска парсера и импорта модулей"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Число запусков каждого сценария",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Число самых дорогих импортов в отчёте",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Файл для JSON-отчёта (по умолчанию stdout)",
+    )
+    return parser.parse_args()
+
+
+def main_bench():
+    args = parse_args()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        table_path = Path(tmp_dir) / "pep_table.bin"
+        pep_table.PepTable().save(table_path)
+        for name, arguments in scenarios(table_path).items():
+            walls, (imports, total) = run_scenario(arguments, args.repeat)
+            top = sorted(imports.items(), key=lambda item: -item[1])
+            result = {
+                "scenario": name,
+                "wall_s": round(statistics.median(walls), 4),
+                "imports_ms": round(total / 1000, 2),
+                "heavy_modules": [
+                    module for module in HEAVY_MODULES if module in imports
+                ],
+                "top_imports_ms": {
+                    module: round(microseconds / 1000, 2)
+                    for module, microseconds in top[:args.top]
+                },
+            }
+            results.append(result)
+            print(
+                "{scenario:12} {wall_s:>8.3f}s imports {imports_ms:>8.2f} ms "
+                "heavy {heavy_modules}".format(**result),
+                file=sys.stderr,
+            )
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main_bench()
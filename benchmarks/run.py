@@ -0,0 +1,239 @@
+"""Офлайн-замеры режимов парсера на синтетическом корпусе.
+
+Пример:
+    python benchmarks/run.py --sizes 100 500 --engines bs4 lxml \
+        --output bench.json
+"""
+import argparse
+import importlib
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from argparse import Namespace
+from datetime import datetime, timezone
+from functools import partial, wraps
+from pathlib import Path
+
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3 import HTTPResponse
+
+from corpus import build_corpus
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+main = importlib.import_module("main")
+utils = importlib.import_module("utils")
+
+MODES = ("whats-new", "latest-versions", "pep")
+EXTRACTORS = (
+    "whats_new_links",
+    "whats_new_card",
+    "versions_links",
+    "pdf_a4_link",
+    "archive_links",
+    "pep_index",
+    "pep_card",
+)
+
+
+class CorpusAdapter(HTTPAdapter):
+    """Транспорт requests, отвечающий страницами из корпуса."""
+
+    def __init__(self, corpus):
+        super().__init__()
+        self.corpus = corpus
+        self.requests = 0
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        body = self.corpus.get(request.url)
+        raw = HTTPResponse(
+            body=io.BytesIO(body or b""),
+            headers={"Content-Type": "text/html; charset=utf-8"},
+            status=200 if body is not None else 404,
+            preload_content=False,
+            request_url=request.url,
+        )
+        return self.build_response(request, raw)
+
+
+class ParseTimer:
+    """Число разобранных страниц и суммарное время разбора по всем потокам."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.pages = 0
+        self.seconds = 0.0
+        self.originals = {}
+
+    def wrap(self, function):
+        @wraps(function)
+        def timed(html):
+            start = time.perf_counter()
+            try:
+                return function(html)
+            finally:
+                self.pages += 1
+                self.seconds += time.perf_counter() - start
+
+        return timed
+
+    def __enter__(self):
+        for name in EXTRACTORS:
+            self.originals[name] = getattr(self.engine, name)
+            setattr(self.engine, name, self.wrap(self.originals[name]))
+        return self
+
+    def __exit__(self, *exc_info):
+        for name, function in self.originals.items():
+            setattr(self.engine, name, function)
+
+
+def run_mode(session, adapter, mode, cli_args, trace_memory):
+    """Один прогон режима: время, число страниц, разбор и пик памяти."""
+
+    # в ENGINES могут быть прокси отложенного импорта: замена функций
+    # на прокси не видна pickle при разборе в пуле процессов
+    engine = importlib.import_module(main.ENGINES[cli_args.engine].__name__)
+    requests_before = adapter.requests
+    if trace_memory:
+        tracemalloc.start()
+    with ParseTimer(engine) as timer:
+        start = time.perf_counter()
+        results = main.MODE_TO_FUNCTION[mode](session, cli_args)
+        rows = len(list(results.rows))
+        wall = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    # при разборе в пуле процессов разбор отсюда не виден
+    in_process = cli_args.processes == 1
+    return {
+        "rows": rows,
+        "wall_s": round(wall, 4),
+        "network_requests": adapter.requests - requests_before,
+        "pages": timer.pages if in_process else None,
+        "pages_per_s": round(timer.pages / wall, 1) if in_process else None,
+        "parse_s": round(timer.seconds, 4) if in_process else None,
+        "peak_mem_bytes": peak,
+    }
+
+
+def bench(sizes, engines, workers, processes, kilobytes, trace_memory):
+    """Замеры по всем сочетаниям размера корпуса, движка и режима.
+
+    Для каждого сочетания выполняются холодный прогон с пустым кешем
+    requests_cache и тёплый прогон, в котором все ответы берутся из кеша.
+    """
+
+    for size in sizes:
+        corpus = build_corpus(size, kilobytes)
+        for engine in engines:
+            for mode in MODES:
+                adapter = CorpusAdapter(corpus)
+                session = CachedSession(backend="memory")
+                session.mount("https://", adapter)
+                cli_args = Namespace(
+                    mode=mode,
+                    engine=engine,
+                    workers=workers,
+                    processes=processes,
+                )
+                for phase in ("cold", "warm"):
+                    yield {
+                        "mode": mode,
+                        "engine": engine,
+                        "size": size,
+                        "phase": phase,
+                        **run_mode(
+                            session, adapter, mode, cli_args, trace_memory
+                        ),
+                    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Замеры режимов парсера на синтетическом корпусе"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 500, 1000],
+        help="Число PEP и версий whats-new в корпусе",
+    )
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        default=list(main.ENGINES),
+        choices=list(main.ENGINES),
+        help="Движки извлечения данных",
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument(
+        "--page-kb",
+        type=int,
+        default=20,
+        help="Примерный размер страницы карточки в КБ",
+    )
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="Не замерять пик памяти (tracemalloc замедляет прогон)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Файл для JSON-отчёта (по умолчанию stdout)",
+    )
+    return parser.parse_args()
+
+
+def main_bench():
+    args = parse_args()
+    # прогресс-бары мешают чтению отчёта
+    utils.tqdm = partial(utils.tqdm, disable=True)
+
+    results = []
+    for result in bench(
+        args.sizes,
+        args.engines,
+        args.workers,
+        args.processes,
+        args.page_kb,
+        not args.no_memory,
+    ):
+        results.append(result)
+        print(
+            "{mode:16} {engine:5} {size:>6} {phase:5} {wall_s:>9.3f}s "
+            "{network_requests:>6} req {pages_per_s} pages/s "
+            "parse {parse_s}s peak {peak_mem_bytes} B".format(**result),
+            file=sys.stderr,
+        )
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "workers": args.workers,
+        "processes": args.processes,
+        "page_kb": args.page_kb,
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,167 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class CacheAccessLog:
+    """Журнал обращений к кешу запросов для вытеснения по LRU.
+
+    Для каждого ключа кеша requests_cache хранятся размер тела ответа
+    и время последнего обращения, а также общие счётчики попаданий и
+    промахов. Журнал лежит в отдельной базе рядом с кешем и не зависит
+    от выбранного хранилища. Обращения копятся в памяти и записываются
+    в базу одной транзакцией в `flush()`, а не на каждый запрос.
+    """
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._counters = {"hits": 0, "misses": 0}
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS access ("
+                "key TEXT PRIMARY KEY, size INTEGER, used REAL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS counters ("
+                "name TEXT PRIMARY KEY, value INTEGER)"
+            )
+
+    def touch(self, key, size, from_cache):
+        """Учёт обращения к ответу с ключом `key`."""
+
+        with self._lock:
+            self._pending[key] = (size, time.time())
+            self._counters["hits" if from_cache else "misses"] += 1
+
+    def flush(self):
+        """Запись накопленных обращений в базу журнала."""
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO access VALUES (?, ?, ?)",
+                (
+                    (key, size, used)
+                    for key, (size, used) in self._pending.items()
+                ),
+            )
+            self._connection.executemany(
+                "INSERT INTO counters VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET value = value + ?",
+                (
+                    (name, value, value)
+                    for name, value in self._counters.items()
+                    if value
+                ),
+            )
+            self._pending.clear()
+            self._counters = dict.fromkeys(self._counters, 0)
+
+    def sync(self, cache):
+        """Согласование журнала с содержимым кеша.
+
+        Ключи, которых уже нет в кеше, удаляются из журнала. Ответы,
+        которые попали в кеш без журнала, добавляются с нулевым
+        временем обращения и вытесняются первыми.
+        """
+
+        self.flush()
+        keys = set(cache.responses.keys())
+        with self._lock, self._connection:
+            logged = {
+                key
+                for key, in self._connection.execute("SELECT key FROM access")
+            }
+            self._connection.executemany(
+                "DELETE FROM access WHERE key = ?",
+                ((key,) for key in logged - keys),
+            )
+            for key in keys - logged:
+                response = cache.responses.get(key)
+                if response is None:
+                    continue
+                self._connection.execute(
+                    "INSERT INTO access VALUES (?, ?, 0)",
+                    (key, len(response.content)),
+                )
+
+    def evict(self, cache, max_bytes):
+        """Удаление давно не использованных ответов сверх `max_bytes`."""
+
+        self.sync(cache)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, size FROM access ORDER BY used DESC"
+            ).fetchall()
+        total = 0
+        evicted = []
+        for key, size in rows:
+            total += size
+            if total > max_bytes:
+                evicted.append(key)
+        if not evicted:
+            return evicted
+
+        cache.delete(*evicted)
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "DELETE FROM access WHERE key = ?",
+                ((key,) for key in evicted),
+            )
+        logging.info(f"Из кеша запросов вытеснено ответов: {len(evicted)}")
+        return evicted
+
+    def stats(self):
+        """Число записей, объём тел ответов и счётчики обращений."""
+
+        self.flush()
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT count(*), coalesce(sum(size), 0) FROM access"
+            ).fetchone()
+            counters = dict(
+                self._connection.execute("SELECT name, value FROM counters")
+            )
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+        }
+
+    def clear(self):
+        """Удаление журнала и счётчиков."""
+
+        with self._lock, self._connection:
+            self._pending.clear()
+            self._counters = dict.fromkeys(self._counters, 0)
+            self._connection.execute("DELETE FROM access")
+            self._connection.execute("DELETE FROM counters")
+
+    def close(self):
+        """Запись накопленных обращений и закрытие соединения с базой."""
+
+        self.flush()
+        self._connection.close()
+
+
+def cache_disk_size(cache):
+    """Размер хранилища кеша на диске в байтах или None для памяти."""
+
+    db_path = getattr(cache.responses, "db_path", None)
+    if db_path is not None:
+        return os.path.getsize(db_path) if Path(db_path).exists() else 0
+
+    cache_dir = getattr(cache, "cache_dir", None)
+    if cache_dir is not None:
+        return sum(
+            path.stat().st_size
+            for path in Path(cache_dir).rglob("*")
+            if path.is_file()
+        )
+
+    return None
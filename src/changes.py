@@ -0,0 +1,51 @@
+from constants import (
+    PEP_NEW,
+    PEP_STATUS,
+    VERSION_LINK,
+    VERSION_NEW,
+    VERSION_STATUS,
+)
+
+
+def pep_events(old, new):
+    """События между снимками статусов PEP: новые PEP и смены статуса.
+
+    Снимок - словарь номера PEP (строкой) и статуса из карточки. Для
+    первого снимка (`old` равен None) событий нет.
+    """
+
+    if old is None:
+        return []
+
+    events = []
+    for number, status in new.items():
+        if number not in old:
+            events.append((PEP_NEW, f"PEP {number}", "", status))
+        elif old[number] != status:
+            events.append((PEP_STATUS, f"PEP {number}", old[number], status))
+    return events
+
+
+def version_events(old, new):
+    """События между снимками версий Python: новые версии, смена статуса
+    и ссылки на документацию.
+
+    Снимок - словарь версии и пары (ссылка, статус). Для первого снимка
+    (`old` равен None) событий нет.
+    """
+
+    if old is None:
+        return []
+
+    events = []
+    for version, (link, status) in new.items():
+        if version not in old:
+            events.append((VERSION_NEW, version, "", status))
+            continue
+
+        old_link, old_status = old[version]
+        if old_status != status:
+            events.append((VERSION_STATUS, version, old_status, status))
+        if old_link != link:
+            events.append((VERSION_LINK, version, old_link, link))
+    return events
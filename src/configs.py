@@ -1,16 +1,46 @@
 import argparse
 import logging
+import zlib
 from logging.handlers import RotatingFileHandler
+from pathlib import Path
 
 from constants import (
+    ARCHIVE_FORMATS,
     BASE_DIR,
+    BS4,
+    CACHE_BACKENDS,
+    CACHE_NAME,
+    DEFAULT_CACHE_BACKEND,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_ENGINE,
+    DEFAULT_HOST_CONCURRENCY,
+    DEFAULT_EXPIRE_AFTER,
+    DEFAULT_PROCESSES,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_RETRIES,
+    DEFAULT_SERVE_TTL,
+    DEFAULT_WATCH_INTERVAL,
+    DEFAULT_WORKERS,
     DT_FORMAT,
+    HTML_SOURCE,
     LOGS_DIR,
     LOG_FORMAT,
     LOG_FILE,
-    FILE,
-    PRETTY,
+    LXML,
+    PEP_GROUP_KEYS,
+    PEP_SOURCES,
+    PEP_TABLE_FILE,
+    INITIAL_RATE,
+    OUTPUTS,
+    STATE_DIR,
+    URLS_EXPIRE_AFTER,
 )
+from lazy import lazy_import
+
+# тяжёлые зависимости нужны только сессии, а не разбору аргументов
+limiter_module = lazy_import("limiter")
+requests_cache = lazy_import("requests_cache")
+transport = lazy_import("transport")
 
 
 def configure_argument_parser(available_modes):
@@ -19,6 +49,7 @@ def configure_argument_parser(available_modes):
     parser = argparse.ArgumentParser(description="Парсер документации Python")
     parser.add_argument(
         "mode",
+        nargs="+",
         choices=available_modes,
         help="Режимы работы парсера",
     )
@@ -31,12 +62,308 @@ def configure_argument_parser(available_modes):
     parser.add_argument(
         "-o",
         "--output",
-        choices=(PRETTY, FILE),
+        choices=OUTPUTS,
         help="Дополнительные способы вывода данных",
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=positive_int,
+        default=DEFAULT_WORKERS,
+        help="Количество потоков для загрузки страниц",
+    )
+    parser.add_argument(
+        "-p",
+        "--processes",
+        type=positive_int,
+        default=DEFAULT_PROCESSES,
+        help="Количество процессов для разбора HTML",
+    )
+    parser.add_argument(
+        "-e",
+        "--engine",
+        choices=(BS4, LXML),
+        default=DEFAULT_ENGINE,
+        help="Движок извлечения данных из HTML",
+    )
+    parser.add_argument(
+        "-i",
+        "--incremental",
+        action="store_true",
+        help="Загружать только новые и изменившиеся карточки PEP",
+    )
+    parser.add_argument(
+        "--source",
+        choices=PEP_SOURCES,
+        default=HTML_SOURCE,
+        help="Источник данных режима pep: индекс и карточки или JSON API",
+    )
+    parser.add_argument(
+        "--verify-sample",
+        type=positive_int,
+        metavar="K",
+        help="Сверить статусы из API с K случайными карточками PEP",
+    )
+    parser.add_argument(
+        "--cache-backend",
+        choices=CACHE_BACKENDS,
+        default=DEFAULT_CACHE_BACKEND,
+        help="Хранилище кеша запросов",
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=positive_float,
+        metavar="MB",
+        help="Предельный объём ответов в кеше запросов, МБ",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=positive_float,
+        metavar="MB",
+        help="Предел памяти процесса, МБ: у предела обход страниц "
+        "не берёт новые страницы, пока не разобраны загруженные",
+    )
+    parser.add_argument(
+        "--pep-table",
+        type=Path,
+        default=BASE_DIR / STATE_DIR / PEP_TABLE_FILE,
+        metavar="FILE",
+        help="Файл столбцовой таблицы PEP, которую сохраняет режим pep",
+    )
+    parser.add_argument(
+        "--group-by",
+        nargs="+",
+        choices=PEP_GROUP_KEYS,
+        default=["card_status"],
+        help="Столбцы группировки для режима pep-table",
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=list(ARCHIVE_FORMATS),
+        default=list(ARCHIVE_FORMATS),
+        help="Форматы архивов документации для режима mirror",
+    )
+    parser.add_argument(
+        "--host-concurrency",
+        type=positive_int,
+        default=DEFAULT_HOST_CONCURRENCY,
+        help="Одновременных загрузок архивов с одного хоста в режиме mirror",
+    )
+    parser.add_argument(
+        "--no-results-cache",
+        action="store_true",
+        help="Не использовать кеш извлечённых из страниц данных",
+    )
+    parser.add_argument(
+        "--cache-downloads",
+        action="store_true",
+        help="Сохранять скачиваемые архивы в кеше запросов",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=positive_int,
+        help="Соединений keep-alive на хост (по умолчанию по числу потоков)",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=positive_float,
+        default=DEFAULT_CONNECT_TIMEOUT,
+        help="Тайм-аут установки соединения, секунд",
+    )
+    parser.add_argument(
+        "--read-timeout",
+        type=positive_float,
+        default=DEFAULT_READ_TIMEOUT,
+        help="Тайм-аут ожидания данных от сервера, секунд",
+    )
+    parser.add_argument(
+        "--rate",
+        type=positive_float,
+        default=INITIAL_RATE,
+        help="Начальный темп запросов в секунду, дальше подбирается сам",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=positive_float,
+        help="Верхняя граница темпа запросов в секунду",
+    )
+    parser.add_argument(
+        "--retries",
+        type=non_negative_int,
+        default=DEFAULT_RETRIES,
+        help="Число повторов запроса при сбоях и ответах 429/5xx",
+    )
+    parser.add_argument(
+        "--record",
+        type=Path,
+        metavar="DIR",
+        help="Записать полученные страницы в корпус для воспроизведения",
+    )
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        metavar="DIR",
+        help="Отвечать на запросы из записанного корпуса без сети",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=non_negative_float,
+        default=0,
+        metavar="SECONDS",
+        help="Задержка перед каждым ответом при воспроизведении",
+    )
+    parser.add_argument(
+        "--replay-bandwidth",
+        type=positive_int,
+        metavar="KB",
+        help="Скорость отдачи тела ответа при воспроизведении, КБ/с",
+    )
+    parser.add_argument(
+        "--interval",
+        type=positive_float,
+        default=DEFAULT_WATCH_INTERVAL,
+        metavar="SECONDS",
+        help="Интервал между опросами страниц в режиме watch, секунд",
+    )
+    parser.add_argument(
+        "--polls",
+        type=positive_int,
+        metavar="N",
+        help="Число опросов в режиме watch (по умолчанию без ограничения)",
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        metavar="PATH",
+        help="Unix-сокет процесса serve (по умолчанию parser.sock в src)",
+    )
+    parser.add_argument(
+        "--serve-ttl",
+        type=positive_float,
+        default=DEFAULT_SERVE_TTL,
+        metavar="SECONDS",
+        help="Сколько секунд serve отдаёт результат режима без пересчёта",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Выполнять режимы в текущем процессе, даже если запущен serve",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Вывести в stderr время по фазам работы и статистику кеша",
+    )
+    parser.add_argument(
+        "--profile-json",
+        type=Path,
+        metavar="FILE",
+        help="Сохранить отчёт профилирования в JSON (включает --profile)",
+    )
     return parser
 
 
+def positive_int(value):
+    """Проверка, что аргумент командной строки - натуральное число."""
+
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            f"Ожидается число больше нуля, получено {value}"
+        )
+    return number
+
+
+def non_negative_int(value):
+    """Проверка, что аргумент командной строки - целое число не меньше 0."""
+
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(
+            f"Ожидается неотрицательное число, получено {value}"
+        )
+    return number
+
+
+def positive_float(value):
+    """Проверка, что аргумент командной строки - положительное число."""
+
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(
+            f"Ожидается число больше нуля, получено {value}"
+        )
+    return number
+
+
+def non_negative_float(value):
+    """Проверка, что аргумент командной строки - число не меньше 0."""
+
+    number = float(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(
+            f"Ожидается неотрицательное число, получено {value}"
+        )
+    return number
+
+
+def decompress(data):
+    """Распаковка записи кеша; записи без сжатия возвращаются как есть."""
+
+    try:
+        return zlib.decompress(data)
+    except zlib.error:
+        return data
+
+
+def compressed_serializer():
+    """Сериализатор requests_cache со сжатием записей zlib."""
+
+    serializers = requests_cache.serializers
+    return serializers.SerializerPipeline(
+        [
+            *serializers.pickle_serializer.stages,
+            serializers.Stage(dumps=zlib.compress, loads=decompress),
+        ],
+        name="pickle_zlib",
+        is_binary=True,
+    )
+
+
+def configure_session(
+    workers=DEFAULT_WORKERS,
+    backend=DEFAULT_CACHE_BACKEND,
+    adapter=None,
+    limiter=None,
+):
+    """Создание кеширующей сессии с пулом соединений под число потоков.
+
+    Срок хранения ответов задаётся по шаблонам URL, устаревшие ответы
+    с валидаторами перепроверяются условными запросами. Если передан
+    `limiter`, запросы мимо кеша идут с адаптивным темпом и повтором.
+    """
+
+    session = requests_cache.CachedSession(
+        CACHE_NAME,
+        backend=backend,
+        serializer=compressed_serializer(),
+        expire_after=DEFAULT_EXPIRE_AFTER,
+        urls_expire_after=URLS_EXPIRE_AFTER,
+        stale_if_error=True,
+    )
+    if adapter is None:
+        adapter = transport.PooledAdapter(workers)
+    if isinstance(adapter, transport.PooledAdapter):
+        session.transport = adapter
+    if limiter is not None:
+        adapter = limiter_module.LimitedAdapter(adapter, limiter)
+        session.limiter = limiter
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 def configure_logging():
     """Функция конфигурации логгирования."""
 
@@ -1,12 +1,17 @@
+from datetime import timedelta
 from pathlib import Path
 
 # paths
 MAIN_DOC_URL = "https://docs.python.org/3/"
 MAIN_PEPS_URL = "https://peps.python.org/"
+PEPS_API_URL = MAIN_PEPS_URL + "api/peps.json"
 BASE_DIR = Path(__file__).parent
 LOGS_DIR = "logs"
 LOG_FILE = BASE_DIR / "parser.log"
 RESULTS_DIR = "results"
+STATE_DIR = "state"
+PEP_STATE_FILE = "peps.json"
+PEP_TABLE_FILE = "peps.table"
 
 # logging
 LOG_FORMAT = '"%(asctime)s - [%(levelname)s] - %(message)s"'
@@ -14,11 +19,153 @@ DT_FORMAT = "%d.%m.%Y %H:%M:%S"
 
 # output.py
 DATETIME_FORMAT = "%Y-%m-%d_%H-%M-%S"
+DOWNLOAD_MODE = "download"
 DOWNLOADS_DIR = "downloads"
+DOWNLOADS_MANIFEST_FILE = "manifest.json"
+# каталог хранилища архивов по SHA-256 содержимого
+STORE_OBJECTS_DIR = "objects"
+LINK_SUFFIX = ".link"
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+MIRROR_MODE = "mirror"
+MIRROR_DIR = "mirror"
+MIRROR_MANIFEST_FILE = "manifest.json"
+# форматы архивов документации и шаблоны имён их файлов
+ARCHIVE_FORMATS = {
+    "pdf-a4": r"-pdf-a4\.zip$",
+    "html": r"-html\.zip$",
+    "text": r"-text\.zip$",
+    "epub": r"\.epub$",
+}
+# одновременных загрузок архивов с одного хоста в режиме mirror
+DEFAULT_HOST_CONCURRENCY = 2
+ARCHIVE_DOWNLOADED = "downloaded"
+ARCHIVE_UNCHANGED = "unchanged"
+ARCHIVE_FAILED = "error"
+PART_SUFFIX = ".part"
+# валидатор ответа, с которого начат временный файл загрузки
+PART_VALIDATOR_SUFFIX = ".validator"
+# доля предела --max-memory, с которой обход перестаёт брать новые страницы
+MEMORY_HIGH_WATER = 0.9
+# не чаще, чем раз в столько секунд, проверяется память процесса
+MEMORY_CHECK_INTERVAL = 0.2
 PRETTY = "pretty"
 FILE = "file"
+JSONL = "jsonl"
+CSV_GZ = "csv.gz"
+SQLITE = "sqlite"
+OUTPUTS = (PRETTY, FILE, JSONL, CSV_GZ, SQLITE)
+RESULTS_DB_FILE = "results.sqlite"
+SQLITE_BATCH_SIZE = 1000
+
+# modes
+ALL_MODES = "all"
+# режимы, которые выполняет `all`: только получение данных без загрузок
+ALL_MODES_SELECTION = ("whats-new", "latest-versions", "pep")
+# режимы, которые работают только с локальными данными и не создают сессию
+LOCAL_MODES = ("pep-table",)
+# группа точек входа, через которую пакеты добавляют свои режимы
+MODES_ENTRY_POINT_GROUP = "bs4_parser_pep.modes"
+
+# extractors
+BS4 = "bs4"
+LXML = "lxml"
+DEFAULT_ENGINE = BS4
+
+# http
+DEFAULT_WORKERS = 1
+DEFAULT_PROCESSES = 1
+# сколько страниц на поток загружается наперёд
+PREFETCH = 2
+# docs.python.org, peps.python.org и запас под перенаправления
+POOL_HOSTS = 4
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+
+# rate limiter
+INITIAL_RATE = 10
+MIN_RATE = 0.5
+# AIMD: прибавка к темпу после успеха и множитель после сбоя
+RATE_INCREASE = 1
+RATE_DECREASE = 0.5
+# ответ медленнее этого числа секунд считается признаком перегрузки
+SLOW_RESPONSE = 2.0
+RATE_LOG_EVERY = 100
+DEFAULT_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# cache
+CACHE_NAME = "http_cache"
+RESULTS_CACHE_FILE = "results_cache.sqlite"
+# увеличивается при изменении функций извлечения или формата их записей:
+# записи прежней версии кеша извлечённых данных не используются
+RESULTS_CACHE_VERSION = 1
+CACHE_BACKENDS = ("sqlite", "filesystem", "memory")
+DEFAULT_CACHE_BACKEND = "sqlite"
+CACHE_ACCESS_FILE = "{backend}_cache_access.sqlite"
+DEFAULT_EXPIRE_AFTER = timedelta(days=1)
+# Шаблоны проверяются по порядку, срабатывает первый подходящий.
+# Устаревший ответ с ETag/Last-Modified перепроверяется условным
+# запросом и при ответе 304 обновляется без повторной загрузки.
+URLS_EXPIRE_AFTER = {
+    # карточки PEP и страницы изменений версий меняются редко
+    "peps.python.org/pep-*": timedelta(days=7),
+    "docs.python.org/3/whatsnew/*.html": timedelta(days=7),
+    # индекс PEP, боковая панель документации и страница загрузок
+    "peps.python.org": timedelta(hours=1),
+    "docs.python.org": timedelta(hours=1),
+}
+
+# watch
+WATCH_MODE = "watch"
+WATCH_STATE_FILE = "watch.json"
+# режимы, которые выдают строки бесконечным потоком
+STREAMING_MODES = (WATCH_MODE,)
+# интервал между опросами страниц в режиме watch, секунд
+DEFAULT_WATCH_INTERVAL = 60
+PEP_NEW = "pep-new"
+PEP_STATUS = "pep-status"
+VERSION_NEW = "version-new"
+VERSION_STATUS = "version-status"
+VERSION_LINK = "version-link"
+
+# daemon
+SERVE_MODE = "serve"
+DAEMON_SOCKET_FILE = "parser.sock"
+# сколько секунд процесс `serve` отдаёт результат режима без пересчёта
+DEFAULT_SERVE_TTL = 60
+# аргументы, которые клиент передаёт процессу `serve` вместе с режимом
+SERVE_QUERY_ARGS = (
+    "engine",
+    "incremental",
+    "group_by",
+    "source",
+    "verify_sample",
+)
+# режимы, которые не передаются процессу `serve`: режимы download
+# и mirror сохраняют архивы, их результат нельзя брать из памяти
+NOT_FORWARDED_MODES = (SERVE_MODE, WATCH_MODE, DOWNLOAD_MODE, MIRROR_MODE)
+# аргументы, при которых режимы выполняются без обращения к `serve`
+DAEMON_LOCAL_ARGS = (
+    "clear_cache",
+    "record",
+    "replay",
+    "profile",
+    "profile_json",
+)
+
+# replay
+REPLAY_INDEX_FILE = "index.json"
+REPLAY_BODIES_DIR = "bodies"
 
 # pep.py
+# источники данных режима pep: индекс с карточками или JSON API
+HTML_SOURCE = "html"
+API_SOURCE = "api"
+PEP_SOURCES = (HTML_SOURCE, API_SOURCE)
+# столбцы таблицы PEP, по которым строятся отчёты режима pep-table
+PEP_GROUP_KEYS = ("index_code", "card_status", "type", "year")
 EXPECTED_STATUS = {
     "A": ("Active", "Accepted"),
     "D": ("Deferred",),
@@ -29,3 +176,16 @@ EXPECTED_STATUS = {
     "W": ("Withdrawn",),
     "": ("Draft", "Active"),
 }
+# код статуса в индексе PEP по статусу PEP из JSON API
+STATUS_CODES = {
+    "Accepted": "A",
+    "Active": "A",
+    "Deferred": "D",
+    "Final": "F",
+    "Provisional": "P",
+    "Rejected": "R",
+    "April Fool!": "R",
+    "Superseded": "S",
+    "Withdrawn": "W",
+    "Draft": "",
+}
@@ -0,0 +1,137 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+from functools import partial
+
+from constants import (
+    DAEMON_LOCAL_ARGS,
+    NOT_FORWARDED_MODES,
+    SERVE_QUERY_ARGS,
+)
+from memo import TimedMemo
+
+
+class QueryHandler(socketserver.StreamRequestHandler):
+    """Обработка одного запроса к процессу `serve`.
+
+    Запрос - строка JSON с режимами и аргументами, ответ - строка JSON
+    со списком результатов режимов в том же порядке.
+    """
+
+    def handle(self):
+        line = self.rfile.readline()
+        # проверка, запущен ли процесс, соединяется без запроса
+        if not line:
+            return
+
+        try:
+            query = json.loads(line)
+            answers = [
+                self.server.answer(mode, query.get("args", {}))
+                for mode in query["modes"]
+            ]
+        except (ValueError, KeyError, TypeError) as error:
+            answers = [{"mode": None, "error": f"Неверный запрос: {error}"}]
+
+        self.wfile.write(
+            json.dumps(answers, ensure_ascii=False, default=str).encode()
+            + b"\n"
+        )
+
+
+class ParserServer(socketserver.ThreadingUnixStreamServer):
+    """Сервер режимов парсера на Unix-сокете.
+
+    Каждый запрос выполняется в отдельном потоке функцией `run_query`
+    с общей сессией процесса. Результат режима с теми же аргументами
+    отдаётся из памяти `ttl` секунд.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, run_query, ttl):
+        remove_stale_socket(path)
+        super().__init__(str(path), QueryHandler)
+        self.path = path
+        self.run_query = run_query
+        self.memo = TimedMemo(ttl)
+        self.queries = 0
+
+    def answer(self, mode, query_args):
+        """Результат режима `mode` в виде словаря для ответа клиенту."""
+
+        self.queries += 1
+        if mode in NOT_FORWARDED_MODES:
+            return {
+                "mode": mode,
+                "error": "Режим не выполняется процессом serve",
+            }
+
+        key = json.dumps([mode, query_args], sort_keys=True)
+        try:
+            results = self.memo.get_or_compute(
+                key, partial(self.run_query, mode, query_args)
+            )
+        except Exception as error:
+            logging.exception(f"Сбой обработки запроса режима {mode}.")
+            return {"mode": mode, "error": str(error)}
+
+        if results is None:
+            return {"mode": mode, "header": None, "rows": []}
+        return {"mode": mode, "header": results.header, "rows": results.rows}
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def remove_stale_socket(path):
+    """Удаление файла сокета, который остался от остановленного процесса.
+
+    Если по пути уже отвечает запущенный процесс, второй не стартует.
+    """
+
+    if not os.path.exists(path):
+        return
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(str(path))
+        except OSError:
+            os.unlink(path)
+            return
+
+    raise RuntimeError(f"Процесс serve уже запущен: {path}")
+
+
+def forwardable(args, modes):
+    """Можно ли передать режимы процессу `serve`."""
+
+    return not set(modes) & set(NOT_FORWARDED_MODES) and not any(
+        getattr(args, name, None) for name in DAEMON_LOCAL_ARGS
+    )
+
+
+def query_args(args):
+    """Аргументы командной строки, от которых зависит результат режима."""
+
+    return {name: getattr(args, name, None) for name in SERVE_QUERY_ARGS}
+
+
+def query(path, modes, arguments):
+    """Запрос результатов режимов у процесса `serve`.
+
+    Если процесс не запущен, исключение `OSError` передаётся
+    вызывающему коду, который выполняет режимы сам.
+    """
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(path))
+        client.sendall(
+            json.dumps({"modes": modes, "args": arguments}).encode() + b"\n"
+        )
+        with client.makefile("rb") as answer:
+            return json.loads(answer.readline())
@@ -0,0 +1,142 @@
+import logging
+import re
+from contextlib import contextmanager
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from exceptions import VersionsNotFound
+import profiling
+from utils import find_tag
+
+# Области страниц, которые нужны режимам парсера
+WHATS_NEW_INDEX = SoupStrainer("section", {"id": "what-s-new-in-python"})
+WHATS_NEW_CARD = SoupStrainer(["h1", "dl"])
+DOCS_SIDEBAR = SoupStrainer("div", {"class": "sphinxsidebarwrapper"})
+DOWNLOADS_TABLE = SoupStrainer("table")
+PEP_INDEX = SoupStrainer("section", {"id": "numerical-index"})
+PEP_CARD = SoupStrainer("dl")
+
+
+def make_soup(html, parse_only=None):
+    """Построение дерева BeautifulSoup из байтов ответа."""
+
+    with profiling.phase("parse"):
+        return BeautifulSoup(
+            html, "lxml", from_encoding="utf-8", parse_only=parse_only
+        )
+
+
+@contextmanager
+def parsed(html, parse_only=None):
+    """Дерево BeautifulSoup, которое разрушается после извлечения данных.
+
+    Узлы дерева ссылаются друг на друга, и без `decompose` дерево
+    освобождается только сборщиком циклического мусора. Извлечённые
+    данные должны быть строками, а не узлами дерева.
+    """
+
+    soup = make_soup(html, parse_only)
+    try:
+        yield soup
+    finally:
+        soup.decompose()
+
+
+def whats_new_links(html):
+    """Извлечение ссылок на страницы изменений версий."""
+
+    with parsed(html, WHATS_NEW_INDEX) as soup:
+        main_div = find_tag(
+            soup, "section", attrs={"id": "what-s-new-in-python"}
+        )
+        div_with_ul = find_tag(
+            main_div, "div", attrs={"class": "toctree-wrapper"}
+        )
+        sections_by_python = div_with_ul.find_all(
+            "li",
+            attrs={"class": "toctree-l1"},
+        )
+        return [
+            find_tag(section, "a")["href"] for section in sections_by_python
+        ]
+
+
+def whats_new_card(html):
+    """Извлечение заголовка и авторов со страницы изменений версии."""
+
+    with parsed(html, WHATS_NEW_CARD) as soup:
+        h1 = find_tag(soup, "h1")
+        dl2 = find_tag(soup, "dl")
+        return h1.text, dl2.text.replace("\n", " ")
+
+
+def versions_links(html):
+    """Извлечение ссылок и подписей из списка всех версий Python."""
+
+    with parsed(html, DOCS_SIDEBAR) as soup:
+        sidebar = find_tag(
+            soup, "div", attrs={"class": "sphinxsidebarwrapper"}
+        )
+        for ul in sidebar.find_all("ul"):
+            if "All versions" in ul.text:
+                return [
+                    (a_tag["href"], a_tag.text) for a_tag in ul.find_all("a")
+                ]
+
+    err_msg = "Список версий Python на странице не найден."
+    logging.exception(err_msg, stack_info=True)
+    raise VersionsNotFound(err_msg)
+
+
+def pdf_a4_link(html):
+    """Извлечение ссылки на архив документации в формате PDF A4."""
+
+    with parsed(html, DOWNLOADS_TABLE) as soup:
+        table = find_tag(soup, "table")
+        pdf_a4_tag = find_tag(
+            table, "a", {"href": re.compile(r".+pdf-a4\.zip$")}
+        )
+        return pdf_a4_tag["href"]
+
+
+def archive_links(html):
+    """Извлечение ссылок на все архивы со страницы загрузок документации."""
+
+    with parsed(html, DOWNLOADS_TABLE) as soup:
+        table = find_tag(soup, "table")
+        return [a_tag["href"] for a_tag in table.find_all("a", href=True)]
+
+
+def pep_index(html):
+    """Извлечение статуса из индекса и ссылки для каждого PEP."""
+
+    with parsed(html, PEP_INDEX) as soup:
+        table_index = find_tag(soup, "section", {"id": "numerical-index"})
+        table_body = find_tag(table_index, "tbody")
+        return [
+            (find_tag(row, "abbr").text[1:], find_tag(row, "a")["href"])
+            for row in table_body.find_all("tr")
+        ]
+
+
+def card_field(pep_card, name):
+    """Значение поля карточки PEP с заголовком `name` или пустая строка."""
+
+    for dt in pep_card.find_all("dt"):
+        if dt.text.strip() == f"{name}:":
+            return dt.find_next_sibling("dd").text.strip()
+
+    return ""
+
+
+def pep_card(html):
+    """Извлечение статуса, типа и даты создания из карточки PEP."""
+
+    with parsed(html, PEP_CARD) as soup:
+        pep_card = find_tag(soup, "dl")
+        status_row_sibling = pep_card.select('dt:-soup-contains("Status")')[0]
+        return (
+            status_row_sibling.find_next_sibling("dd").text,
+            card_field(pep_card, "Type"),
+            card_field(pep_card, "Created"),
+        )
@@ -0,0 +1,73 @@
+import importlib
+import sys
+import types
+from functools import reduce
+
+
+class LazyModule(types.ModuleType):
+    """Модуль, который импортируется при первом обращении к атрибуту.
+
+    Импорт идёт через `importlib.import_module` и поэтому безопасен при
+    одновременном первом обращении из нескольких потоков.
+    """
+
+    def __getattr__(self, name):
+        return getattr(importlib.import_module(self.__name__), name)
+
+    def __repr__(self):
+        return f"<lazy module {self.__name__!r}>"
+
+
+def lazy_import(name):
+    """Модуль `name`; если он ещё не загружен - с отложенным импортом."""
+
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
+
+
+def resolve(target):
+    """Объект по ссылке вида `модуль:атрибут`."""
+
+    module_name, _, attribute = target.partition(":")
+    module = importlib.import_module(module_name)
+    if not attribute:
+        return module
+    return reduce(getattr, attribute.split("."), module)
+
+
+class ModeRegistry(dict):
+    """Словарь режимов парсера с отложенной загрузкой функций режимов.
+
+    Значением может быть сама функция или ссылка `модуль:функция`.
+    Модуль по ссылке импортируется при первом обращении к режиму, а для
+    списка режимов в командной строке достаточно ключей словаря.
+    """
+
+    def __getitem__(self, mode):
+        function = super().__getitem__(mode)
+        if isinstance(function, str):
+            function = resolve(function)
+            self[mode] = function
+        return function
+
+    def get(self, mode, default=None):
+        return self[mode] if mode in self else default
+
+    def values(self):
+        return [self[mode] for mode in self]
+
+    def items(self):
+        return [(mode, self[mode]) for mode in self]
+
+    def load_entry_points(self, group):
+        """Добавление режимов из точек входа `group` установленных пакетов.
+
+        Встроенные режимы точками входа не переопределяются.
+        """
+
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=group):
+            self.setdefault(entry_point.name, entry_point.value)
@@ -0,0 +1,183 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+from requests.adapters import BaseAdapter
+from requests.exceptions import ConnectionError, Timeout
+
+from constants import (
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    DEFAULT_RETRIES,
+    INITIAL_RATE,
+    MIN_RATE,
+    RATE_DECREASE,
+    RATE_INCREASE,
+    RATE_LOG_EVERY,
+    RETRY_STATUSES,
+    SLOW_RESPONSE,
+)
+
+
+def retry_after(response):
+    """Пауза в секундах из заголовка Retry-After или None."""
+
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Адаптивное ограничение темпа и числа одновременных запросов.
+
+    Темп (запросов в секунду) и допустимое число одновременных
+    запросов растут аддитивно после каждого быстрого успешного ответа
+    и уменьшаются мультипликативно (AIMD) при ответах 429/5xx, сбоях
+    соединения и ответах медленнее `slow_response` секунд. Заголовок
+    Retry-After приостанавливает все запросы на указанное время.
+    """
+
+    def __init__(
+        self,
+        rate=INITIAL_RATE,
+        max_rate=None,
+        max_concurrency=1,
+        retries=DEFAULT_RETRIES,
+        slow_response=SLOW_RESPONSE,
+        backoff_base=BACKOFF_BASE,
+    ):
+        self.rate = rate
+        self.max_rate = max_rate
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(max_concurrency)
+        self.retries = retries
+        self.slow_response = slow_response
+        self.backoff_base = backoff_base
+        self.in_flight = 0
+        self.next_slot = 0.0
+        self.paused_until = 0.0
+        self.successes = 0
+        self.failures = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        """Ожидание очереди на запрос с учётом темпа и паузы."""
+
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.in_flight < int(self.concurrency)
+            )
+            self.in_flight += 1
+            now = time.monotonic()
+            start = max(now, self.next_slot, self.paused_until)
+            self.next_slot = start + 1 / self.rate
+
+        time.sleep(start - now)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= 1
+                self._condition.notify()
+
+    def success(self, latency):
+        if latency > self.slow_response:
+            self.decrease(f"ответ за {latency:.2f} с")
+            return
+
+        with self._condition:
+            self.successes += 1
+            self.rate += RATE_INCREASE
+            if self.max_rate is not None:
+                self.rate = min(self.rate, self.max_rate)
+            self.concurrency = min(
+                self.max_concurrency, self.concurrency + 1 / self.concurrency
+            )
+            self._condition.notify()
+            if self.successes % RATE_LOG_EVERY == 0:
+                logging.info(self.describe())
+
+    def decrease(self, reason, pause=None):
+        """Снижение темпа после сбоя и, если задана, общая пауза."""
+
+        with self._condition:
+            self.failures += 1
+            self.rate = max(MIN_RATE, self.rate * RATE_DECREASE)
+            self.concurrency = max(1.0, self.concurrency * RATE_DECREASE)
+            if pause is not None:
+                self.paused_until = max(
+                    self.paused_until, time.monotonic() + pause
+                )
+            logging.warning(f"{self.describe()}; причина: {reason}")
+
+    def backoff(self, attempt):
+        """Экспоненциальная пауза перед повтором со случайным разбросом."""
+
+        delay = min(BACKOFF_MAX, self.backoff_base * 2**attempt)
+        return random.uniform(delay / 2, delay)
+
+    def describe(self):
+        return (
+            f"Темп запросов: {self.rate:.1f} в секунду, "
+            f"одновременно до {int(self.concurrency)}, "
+            f"успешных {self.successes}, сбоев {self.failures}"
+        )
+
+
+class LimitedAdapter(BaseAdapter):
+    """Транспорт requests с адаптивным темпом и повтором запросов.
+
+    Оборачивает другой транспорт, поэтому ограничиваются только
+    запросы, которые не были обслужены кешем. Сбои соединения и ответы
+    с кодами из RETRY_STATUSES повторяются до `limiter.retries` раз.
+    """
+
+    def __init__(self, adapter, limiter):
+        super().__init__()
+        self.adapter = adapter
+        self.limiter = limiter
+
+    def send(self, request, **kwargs):
+        limiter = self.limiter
+        for attempt in range(limiter.retries + 1):
+            last_attempt = attempt == limiter.retries
+            with limiter.slot():
+                start = time.monotonic()
+                try:
+                    response = self.adapter.send(request, **kwargs)
+                except (ConnectionError, Timeout) as error:
+                    limiter.decrease(type(error).__name__)
+                    if last_attempt:
+                        raise
+                    response = None
+                latency = time.monotonic() - start
+
+            if response is not None:
+                if response.status_code not in RETRY_STATUSES:
+                    limiter.success(latency)
+                    return response
+                pause = retry_after(response)
+                limiter.decrease(f"ответ {response.status_code}", pause)
+                if last_attempt:
+                    return response
+                response.close()
+
+            # пауза по Retry-After выдерживается в limiter.slot()
+            if response is None or pause is None:
+                time.sleep(limiter.backoff(attempt))
+
+    def close(self):
+        self.adapter.close()
@@ -1,212 +1,947 @@
-import re
+import datetime as dt
+import hashlib
+import itertools
 import logging
-from collections import defaultdict
+import random
+import re
+import signal
+import time
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from urllib.parse import urljoin
 
-import requests_cache
-from tqdm import tqdm
-
-from configs import configure_argument_parser, configure_logging
+from configs import (
+    configure_argument_parser,
+    configure_logging,
+    configure_session,
+)
 from constants import (
+    ALL_MODES,
+    ALL_MODES_SELECTION,
+    API_SOURCE,
+    ARCHIVE_FORMATS,
     BASE_DIR,
+    BS4,
+    CACHE_ACCESS_FILE,
+    DAEMON_SOCKET_FILE,
+    DEFAULT_ENGINE,
+    DEFAULT_HOST_CONCURRENCY,
+    DEFAULT_PROCESSES,
+    DEFAULT_SERVE_TTL,
+    DEFAULT_WATCH_INTERVAL,
+    DEFAULT_WORKERS,
+    DOWNLOAD_MODE,
     DOWNLOADS_DIR,
+    DOWNLOADS_MANIFEST_FILE,
+    LXML,
     MAIN_DOC_URL,
     MAIN_PEPS_URL,
+    MIRROR_DIR,
+    ARCHIVE_FAILED,
+    ARCHIVE_UNCHANGED,
+    MIRROR_MANIFEST_FILE,
+    MIRROR_MODE,
     EXPECTED_STATUS,
+    HTML_SOURCE,
+    LOCAL_MODES,
+    MODES_ENTRY_POINT_GROUP,
+    PEP_STATE_FILE,
+    PEP_TABLE_FILE,
+    PEPS_API_URL,
+    PRETTY,
+    RESULTS_CACHE_FILE,
+    SERVE_MODE,
+    STATE_DIR,
+    STREAMING_MODES,
+    WATCH_MODE,
+    WATCH_STATE_FILE,
 )
-from exceptions import VersionsNotFound
-from outputs import control_output
-from utils import get_response, get_soup, find_tag, status_mismatch
+from cache_access import CacheAccessLog, cache_disk_size
+import changes
+import daemon
+from exceptions import RequestSendError
+from lazy import ModeRegistry, lazy_import
+from memo import DocumentMemo
+from memory import MemoryCeiling, describe_peak
+import profiling
+from outputs import Results, control_output
+import pep_api
+from pep_table import PepTable
+from results_cache import ResultsCache
+from state import load_state, save_state
+
+# модули с тяжёлыми зависимостями загружаются, когда их использует режим
+extractors = lazy_import("extractors")
+limiter_module = lazy_import("limiter")
+mirror_module = lazy_import("mirror")
+replay = lazy_import("replay")
+store = lazy_import("store")
+transport = lazy_import("transport")
+utils = lazy_import("utils")
+xpath_extractors = lazy_import("xpath_extractors")
+
+ENGINES = {
+    BS4: extractors,
+    LXML: xpath_extractors,
+}
 
 
-def whats_new(session):
-    """Функция для парсинга страницы документации
-    с последними обновлениями."""
+def get_engine(cli_args):
+    """Модуль извлечения данных, выбранный в аргументах командной строки."""
 
-    whats_new_url = urljoin(MAIN_DOC_URL, "whatsnew/")
+    return ENGINES[getattr(cli_args, "engine", DEFAULT_ENGINE)]
 
-    soup = get_soup(session, whats_new_url)
-    if soup is None:
-        return
 
-    main_div = find_tag(soup, "section", attrs={"id": "what-s-new-in-python"})
-    div_with_ul = find_tag(main_div, "div", attrs={"class": "toctree-wrapper"})
-    sections_by_python = div_with_ul.find_all(
-        "li",
-        attrs={"class": "toctree-l1"},
+def crawl_cards(session, links, extract, cli_args, **kwargs):
+    """Загрузка карточек с числом потоков и процессов из аргументов."""
+
+    return utils.crawl(
+        session,
+        links,
+        extract,
+        getattr(cli_args, "workers", DEFAULT_WORKERS),
+        getattr(cli_args, "processes", DEFAULT_PROCESSES),
+        **kwargs,
     )
 
-    results = [
-        ("Ссылка на статью", "Заголовок", "Редактор, Автор"),
-    ]
 
-    for section in tqdm(sections_by_python):
-        version_a_tag = find_tag(section, "a")
-        href = version_a_tag["href"]
-        version_link = urljoin(whats_new_url, href)
+def whats_new(session, cli_args=None):
+    """Функция для парсинга страницы документации
+    с последними обновлениями."""
 
-        soup_version = get_soup(session, version_link)
-        if soup_version is None:
-            continue
+    engine = get_engine(cli_args)
+    whats_new_url = urljoin(MAIN_DOC_URL, "whatsnew/")
+
+    response = utils.get_response(session, whats_new_url)
+    if response is None:
+        return
 
-        h1 = find_tag(soup_version, "h1")
-        dl2 = find_tag(soup_version, "dl")
-        name_author = dl2.text.replace("\n", " ")
-        results.append((version_link, h1.text, name_author))
+    versions_links = [
+        urljoin(whats_new_url, href)
+        for href in utils.extract_response(
+            session, response, engine.whats_new_links
+        )
+    ]
+    cards = crawl_cards(
+        session, versions_links, engine.whats_new_card, cli_args
+    )
 
-    return results
+    rows = (
+        (version_link, *card)
+        for version_link, card in zip(versions_links, cards)
+        if card is not None
+    )
+    return Results(
+        ("Ссылка на статью", "Заголовок", "Редактор, Автор"), rows
+    )
 
 
-def latest_versions(session):
+def latest_versions(session, cli_args=None):
     """Функция для получения таблицы с ссылками на
     все доступные документации Python.
     """
-    soup = get_soup(session, MAIN_DOC_URL)
-    if soup is None:
+    response = utils.get_response(session, MAIN_DOC_URL)
+    if response is None:
         return
 
-    sidebar = find_tag(soup, "div", attrs={"class": "sphinxsidebarwrapper"})
-    ul_tags = sidebar.find_all("ul")
-    for ul in ul_tags:
-        if "All versions" in ul.text:
-            a_tags = ul.find_all("a")
-            break
+    a_tags = utils.extract_response(
+        session, response, get_engine(cli_args).versions_links
+    )
+    return Results(
+        ("Ссылка на документацию", "Версия", "Статус"), version_rows(a_tags)
+    )
 
-    else:
-        err_msg = "Список версий Python на странице не найден."
-        logging.exception(err_msg, stack_info=True)
-        raise VersionsNotFound(err_msg)
+
+def version_rows(a_tags):
+    """Ссылка, версия и статус из ссылок боковой панели документации."""
 
     pattern = r"Python (?P<version>\d\.\d+) \((?P<status>.*)\)"
-    result = [
-        ("Ссылка на документацию", "Версия", "Статус"),
-    ]
-    for a_tag in a_tags:
-        link = a_tag["href"]
-        comp = re.search(pattern, a_tag.text)
+    result = []
+    for link, text in a_tags:
+        comp = re.search(pattern, text)
         if comp:
             version, status = comp.groups()
         else:
-            version, status = a_tag.text, ""
+            version, status = text, ""
         result.append((link, version, status))
-
     return result
 
 
-def download(session):
-    """Функция для загрузки файла с документацией Python."""
+def download(session, cli_args=None):
+    """Функция для загрузки файла с документацией Python.
+
+    Архив хранится по SHA-256 содержимого, а имя файла в `downloads`
+    ссылается на него. Архив, который не изменился на сервере
+    с прошлого запуска, повторно не загружается.
+    """
 
     downloads_url = urljoin(MAIN_DOC_URL, "download.html")
 
-    soup = get_soup(session, downloads_url)
-    if soup is None:
+    response = utils.get_response(session, downloads_url)
+    if response is None:
         return
 
-    table = find_tag(soup, "table")
-    pdf_a4_tag = find_tag(table, "a", {"href": re.compile(r".+pdf-a4\.zip$")})
+    pdf_a4_href = utils.extract_response(
+        session, response, get_engine(cli_args).pdf_a4_link
+    )
 
-    archive_url = urljoin(downloads_url, pdf_a4_tag["href"])
+    archive_url = urljoin(downloads_url, pdf_a4_href)
     filename = archive_url.split("/")[-1]
 
     download_dir = BASE_DIR / DOWNLOADS_DIR
     download_dir.mkdir(exist_ok=True)
     archive_path = download_dir / filename
+    manifest_path = download_dir / DOWNLOADS_MANIFEST_FILE
+    manifest = load_state(manifest_path)
+
+    archives = store.ContentStore(download_dir)
+    status, entry = archives.fetch(
+        session,
+        archive_url,
+        archive_path,
+        manifest.get(archive_url),
+        use_cache=getattr(cli_args, "cache_downloads", False),
+    )
+    manifest[archive_url] = {**entry, "path": filename}
+    save_state(manifest_path, manifest)
+    archives.prune(manifest)
+    if status == ARCHIVE_UNCHANGED:
+        logging.info(f"Архив не изменился на сервере: {archive_path}")
+    else:
+        logging.info(f"Архив был загружен и сохранён: {archive_path}")
+
+
+def mirror_jobs(session, engine, cli_args):
+    """Версия, формат и ссылка каждого архива для режима `mirror`.
+
+    Версии берутся из боковой панели документации, ссылки на архивы -
+    со страницы загрузок `download.html` каждой версии.
+    """
+
+    response = utils.get_response(session, MAIN_DOC_URL)
+    a_tags = utils.extract_response(session, response, engine.versions_links)
+    versions = [
+        (link, version)
+        for link, version, _ in version_rows(a_tags)
+        if re.fullmatch(r"\d\.\d+", version)
+    ]
+    download_urls = [urljoin(link, "download.html") for link, _ in versions]
+    pages = crawl_cards(
+        session, download_urls, engine.archive_links, cli_args
+    )
+    formats = getattr(cli_args, "formats", None) or list(ARCHIVE_FORMATS)
+    for (_, version), download_url, hrefs in zip(
+        versions, download_urls, pages
+    ):
+        for archive_format in formats:
+            for href in hrefs or ():
+                if re.search(ARCHIVE_FORMATS[archive_format], href):
+                    yield version, archive_format, urljoin(download_url, href)
+                    break
+
+
+def mirror(session, cli_args=None):
+    """Функция зеркалирования архивов документации всех версий Python.
+
+    Архивы загружаются параллельно с ограничением числа загрузок
+    с одного хоста. Архив, который не изменился на сервере с прошлого
+    запуска, повторно не загружается; сведения об архивах хранятся
+    в манифесте зеркала. Одинаковые архивы разных версий хранятся
+    на диске один раз.
+    """
+
+    mirror_dir = BASE_DIR / MIRROR_DIR
+    manifest_path = mirror_dir / MIRROR_MANIFEST_FILE
+    manifest = load_state(manifest_path)
+    host_concurrency = getattr(
+        cli_args, "host_concurrency", DEFAULT_HOST_CONCURRENCY
+    )
+    limits = mirror_module.HostLimits(host_concurrency)
+    archives = store.ContentStore(mirror_dir)
+    jobs = list(mirror_jobs(session, get_engine(cli_args), cli_args))
+
+    def fetch(job):
+        version, archive_format, url = job
+        path = mirror_dir / version / url.rsplit("/", 1)[-1]
+        try:
+            status, entry = mirror_module.mirror_archive(
+                session, url, path, manifest.get(url), limits, archives
+            )
+        except RequestSendError as error:
+            logging.error(error)
+            return version, archive_format, ARCHIVE_FAILED, ""
+
+        relative_path = str(path.relative_to(mirror_dir))
+        manifest[url] = {
+            **entry,
+            "version": version,
+            "format": archive_format,
+            "path": relative_path,
+        }
+        return version, archive_format, status, relative_path
+
+    # загрузки ограничены числом мест на хост, а не числом потоков
+    workers = max(
+        getattr(cli_args, "workers", DEFAULT_WORKERS), host_concurrency
+    )
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            rows = list(executor.map(fetch, jobs))
+        finally:
+            save_state(manifest_path, manifest)
+    archives.prune(manifest)
+
+    logging.info(f"Манифест зеркала сохранён: {manifest_path}")
+    return Results(("Версия", "Формат", "Результат", "Файл"), rows)
+
+
+def pep_cards(session, index_rows, engine, cli_args):
+    """Статус, тип и дата создания из карточек всех PEP индекса."""
+
+    peps_links = [urljoin(MAIN_PEPS_URL, href) for _, href in index_rows]
+    return crawl_cards(session, peps_links, engine.pep_card, cli_args)
+
 
-    response_dowanload = get_response(session, archive_url)
-    if response_dowanload is None:
+def pep_cards_incremental(session, index_rows, engine, cli_args):
+    """Данные карточек PEP с загрузкой только изменившихся карточек.
+
+    Для каждого PEP в состоянии хранятся статус из индекса, статус,
+    тип и дата создания из карточки и SHA-256 карточки. Загружаются
+    карточки новых PEP и тех, у которых изменился статус в индексе,
+    причём ответы из кеша перепроверяются условными запросами, а ответы
+    без валидаторов загружаются заново; пропавшие из индекса PEP
+    удаляются из состояния.
+    """
+
+    state_path = BASE_DIR / STATE_DIR / PEP_STATE_FILE
+    saved_state = load_state(state_path)
+    state = {}
+    changed = []
+    for status, href in index_rows:
+        number = str(utils.pep_number(href))
+        record = saved_state.get(number)
+        # в записях старого формата нет типа и даты создания
+        if (
+            record is not None
+            and record["index_status"] == status
+            and "type" in record
+        ):
+            state[number] = record
+        else:
+            changed.append((number, status, href))
+
+    logging.info(
+        f"Карточек PEP к загрузке: {len(changed)} из {len(index_rows)}"
+    )
+    # сохранённая в кеше карточка могла устареть вместе со статусом
+    cards = crawl_cards(
+        session,
+        [urljoin(MAIN_PEPS_URL, href) for _, _, href in changed],
+        partial(utils.with_digest, engine.pep_card),
+        cli_args,
+        fetch=utils.get_fresh_response,
+    )
+    for (number, status, _), card in zip(changed, cards):
+        if card is None:
+            continue
+
+        (status_current_card, pep_type, created), digest = card
+        state[number] = {
+            "index_status": status,
+            "card_status": status_current_card,
+            "type": pep_type,
+            "created": created,
+            "sha256": digest,
+        }
+
+    save_state(state_path, state)
+    records = (
+        state.get(str(utils.pep_number(href))) for _, href in index_rows
+    )
+    return [
+        record and (record["card_status"], record["type"], record["created"])
+        for record in records
+    ]
+
+
+def build_pep_table(index_rows, cards):
+    """Столбцовая таблица PEP по строкам индекса и данным карточек."""
+
+    table = PepTable()
+    for (status, href), card in zip(index_rows, cards):
+        if card is None:
+            link_pep = urljoin(MAIN_PEPS_URL, href)
+            logging.info(f"Ссылка на {link_pep} вернула None")
+            continue
+
+        table.append(utils.pep_number(href), status, *card)
+
+    return table
+
+
+def count_statuses(table):
+    """Подсчёт PEP по статусам в карточках со сверкой статусов индекса."""
+
+    for number, status, status_current_card in table.mismatches():
+        logging.info(
+            f"""Несовпадающие статусы:
+            {urljoin(MAIN_PEPS_URL, f"pep-{number:04d}/")}
+            Статус в карточке: {status_current_card}
+            Ожидаемые статусы: {EXPECTED_STATUS[status]}
+            """
+        )
+
+    for (status,), count in table.group_by("card_status").items():
+        yield status, count
+    yield ("Total", len(table))
+
+
+def pep_rows(index_rows, cards, cli_args):
+    """Строки итоговой таблицы `pep` после обработки всех карточек.
+
+    Если задан путь `--pep-table`, таблица PEP сохраняется для отчётов
+    режима `pep-table` без повторного обхода карточек.
+    """
+
+    table = build_pep_table(index_rows, cards)
+    table_path = getattr(cli_args, "pep_table", None)
+    if table_path is not None:
+        table.save(table_path)
+        logging.info(f"Таблица PEP сохранена: {table_path}")
+
+    yield from count_statuses(table)
+
+
+def verify_api_sample(session, index_rows, cards, engine, cli_args):
+    """Сверка статусов из JSON API с карточками `--verify-sample` PEP.
+
+    Карточки выбираются случайно. Статус карточки, отличный от статуса
+    в API, сверяется с кодом статуса PEP в API функцией
+    `status_mismatch`.
+    """
+
+    size = min(getattr(cli_args, "verify_sample", None) or 0, len(cards))
+    if not size:
         return
 
-    with open(archive_path, "wb") as file:
-        file.write(response_dowanload.content)
+    sample = random.sample(range(len(cards)), size)
+    links = [urljoin(MAIN_PEPS_URL, index_rows[i][1]) for i in sample]
+    checked = crawl_cards(session, links, engine.pep_card, cli_args)
+    mismatches = 0
+    for i, link, card in zip(sample, links, checked):
+        if card is None:
+            continue
+
+        if card[0] != cards[i][0] and utils.status_mismatch(
+            card[0], index_rows[i][0]
+        ):
+            mismatches += 1
+            logging.warning(
+                f"Статус в API не совпадает с карточкой {link}: "
+                f"{cards[i][0]} в API, {card[0]} в карточке"
+            )
+    logging.info(
+        f"Сверка API с карточками PEP: проверено {size}, "
+        f"расхождений {mismatches}"
+    )
 
-    logging.info(f"Архив был загружен и сохранён: {archive_path}")
 
+def pep_from_api(session, cli_args):
+    """Подсчёт статусов PEP по одному документу JSON API вместо индекса
+    и карточек всех PEP."""
 
-def pep(session):
+    response = utils.get_response(session, PEPS_API_URL)
+    if response is None:
+        return
+
+    peps = utils.extract_response(session, response, pep_api.api_peps)
+    index_rows = [(status, href) for status, href, _ in peps]
+    cards = [card for _, _, card in peps]
+    verify_api_sample(
+        session, index_rows, cards, get_engine(cli_args), cli_args
+    )
+    return Results(("Status", "Count"), pep_rows(index_rows, cards, cli_args))
+
+
+def pep(session, cli_args=None):
     """Функция парсинга всех разделов PEP для подсчета
     общего количества документов и различных статусов."""
 
-    soup = get_soup(session, MAIN_PEPS_URL)
-    if soup is None:
+    if getattr(cli_args, "source", HTML_SOURCE) == API_SOURCE:
+        return pep_from_api(session, cli_args)
+
+    engine = get_engine(cli_args)
+
+    response = utils.get_response(session, MAIN_PEPS_URL)
+    if response is None:
         return
 
-    table_index = find_tag(soup, "section", {"id": "numerical-index"})
+    index_rows = utils.extract_response(session, response, engine.pep_index)
+    if getattr(cli_args, "incremental", False):
+        cards = pep_cards_incremental(session, index_rows, engine, cli_args)
+    else:
+        cards = pep_cards(session, index_rows, engine, cli_args)
 
-    table_body = find_tag(table_index, "tbody")
-    table_rows = table_body.find_all("tr")
-    rows_status = [find_tag(row, "abbr").text[1:] for row in table_rows]
-    peps_href = [find_tag(row, "a")["href"] for row in table_rows]
+    return Results(("Status", "Count"), pep_rows(index_rows, cards, cli_args))
 
-    counts_per_status = defaultdict(int)
 
-    for status, href in zip(rows_status, peps_href):
-        link_pep = urljoin(MAIN_PEPS_URL, href)
+def pep_table(session, cli_args=None):
+    """Функция отчёта по сохранённой таблице PEP без загрузки страниц."""
 
-        soup_card = get_soup(session, link_pep)
-        if soup_card is None:
-            logging.info(f"Ссылка на {link_pep} вернула None")
-            continue
+    table = PepTable.load(
+        getattr(cli_args, "pep_table", None)
+        or BASE_DIR / STATE_DIR / PEP_TABLE_FILE
+    )
+    keys = getattr(cli_args, "group_by", None) or ["card_status"]
+    rows = [
+        (*group, count) for group, count in table.group_by(*keys).items()
+    ]
+    rows.append(("Total", *[""] * (len(keys) - 1), len(table)))
+    return Results((*keys, "count"), rows)
+
+
+def cache_stats(session, cli_args=None):
+    """Функция вывода статистики кеша запросов."""
+
+    cache = session.cache
+    stats = {"bytes": None, "hits": 0, "misses": 0}
+    access_log = getattr(session, "access_log", None)
+    if access_log is not None:
+        access_log.sync(cache)
+        stats = access_log.stats()
+
+    lookups = stats["hits"] + stats["misses"]
+    max_size = getattr(cli_args, "cache_max_size", None)
+    return Results(
+        ("Показатель", "Значение"),
+        [
+            ("Хранилище", getattr(cli_args, "cache_backend", "-")),
+            ("Записей", len(cache.responses)),
+            ("Объём ответов, байт", stats["bytes"]),
+            ("Размер на диске, байт", cache_disk_size(cache)),
+            ("Попаданий", stats["hits"]),
+            ("Промахов", stats["misses"]),
+            (
+                "Доля попаданий",
+                f"{stats['hits'] / lookups:.1%}" if lookups else "-",
+            ),
+            (
+                "Предел, байт",
+                int(max_size * 1024**2) if max_size else "-",
+            ),
+        ],
+    )
 
-        pep_card = find_tag(soup_card, "dl")
 
-        status_row_sibling = pep_card.select('dt:-soup-contains("Status")')[0]
-        status_current_card = status_row_sibling.find_next_sibling("dd").text
+def poll_page(session, snapshot, url, extract):
+    """Данные страницы `url` и SHA-256 её тела для режима `watch`.
 
-        # проверяем соответствие статусов
-        mismatch = status_mismatch(status_current_card, status, link_pep)
-        if mismatch:
-            logging.info(
-                f"""Несовпадающие статусы:
-                {href}
-                Статус в карточке: {status_current_card}
-                Ожидаемые статусы: {EXPECTED_STATUS[status]}
-                """
-            )
+    Ответ из кеша перепроверяется условным запросом, и неизменившаяся
+    страница обходится ответом 304 без тела. Ответ без `ETag` и
+    `Last-Modified` загружается заново. Если тело совпадает с прошлым
+    опросом, страница не разбирается и данные равны None.
+    """
 
-        counts_per_status[status_current_card] += 1
+    response = utils.get_fresh_response(session, url)
+    digest = hashlib.sha256(response.content).hexdigest()
+    if snapshot.get("pages", {}).get(url) == digest:
+        return None, digest
+    return utils.extract_response(session, response, extract), digest
+
+
+def apply_update(snapshot, update):
+    """Перенос в снимок данных и дайджестов страниц из опроса."""
+
+    pages = {**snapshot.get("pages", {}), **update["pages"]}
+    snapshot.update({**update, "pages": pages})
+
+
+def watch_peps(session, snapshot, engine, cli_args):
+    """События PEP с прошлого опроса и обновление снимка; None, если
+    индекс не изменился.
+
+    Карточки загружаются только для новых PEP и PEP, у которых в индексе
+    сменился код статуса, через состояние инкрементального режима `pep`.
+    """
+
+    index_rows, digest = poll_page(
+        session, snapshot, MAIN_PEPS_URL, engine.pep_index
+    )
+    if index_rows is None:
+        return None
+
+    cards = pep_cards_incremental(session, index_rows, engine, cli_args)
+    peps = {
+        str(utils.pep_number(href)): card[0]
+        for (_, href), card in zip(index_rows, cards)
+        if card is not None
+    }
+    events = changes.pep_events(snapshot.get("peps"), peps)
+    return events, {"peps": peps, "pages": {MAIN_PEPS_URL: digest}}
+
+
+def watch_versions(session, snapshot, engine, cli_args):
+    """События версий Python с прошлого опроса и обновление снимка;
+    None, если список версий не изменился."""
+
+    a_tags, digest = poll_page(
+        session, snapshot, MAIN_DOC_URL, engine.versions_links
+    )
+    if a_tags is None:
+        return None
+
+    versions = {
+        version: [link, status]
+        for link, version, status in version_rows(a_tags)
+    }
+    events = changes.version_events(snapshot.get("versions"), versions)
+    return events, {"versions": versions, "pages": {MAIN_DOC_URL: digest}}
+
+
+def watch_events(session, cli_args):
+    """Бесконечный (или на `--polls` опросов) поток изменений.
+
+    Последний снимок хранится в памяти и в файле состояния, поэтому
+    после перезапуска выводятся изменения с последнего опроса. Индекс
+    PEP и список версий опрашиваются независимо: снимок источника
+    обновляется только после вывода его событий, поэтому сбой опроса
+    не теряет изменения. Остановка по Ctrl+C завершает поток, после
+    чего вывод и сессия закрываются как обычно.
+    """
+
+    try:
+        yield from poll_events(session, cli_args)
+    except KeyboardInterrupt:
+        logging.info("Наблюдение остановлено.")
+
+
+def poll_events(session, cli_args):
+    """События всех опросов режима `watch`."""
+
+    engine = get_engine(cli_args)
+    state_path = BASE_DIR / STATE_DIR / WATCH_STATE_FILE
+    snapshot = load_state(state_path)
+    polls = getattr(cli_args, "polls", None)
+    interval = getattr(cli_args, "interval", DEFAULT_WATCH_INTERVAL)
+    for poll in itertools.count(1):
+        now = dt.datetime.now().isoformat(timespec="seconds")
+        for watch_source in (watch_peps, watch_versions):
+            try:
+                polled = watch_source(session, snapshot, engine, cli_args)
+            except RequestSendError as error:
+                logging.warning(f"Опрос страниц не удался: {error}")
+                continue
+            if polled is None:
+                continue
+
+            events, update = polled
+            for event in events:
+                yield (now, *event)
+            apply_update(snapshot, update)
+            save_state(state_path, snapshot)
+
+        if polls is not None and poll >= polls:
+            return
+        time.sleep(interval)
+
+
+def watch(session, cli_args=None):
+    """Функция наблюдения за статусами PEP и версиями Python, которая
+    выводит только изменения с прошлого опроса."""
+
+    return Results(
+        ("Время", "Событие", "Объект", "Было", "Стало"),
+        watch_events(session, cli_args),
+    )
+
+
+def socket_path(cli_args):
+    """Путь к Unix-сокету процесса `serve`."""
+
+    return getattr(cli_args, "socket", None) or BASE_DIR / DAEMON_SOCKET_FILE
 
-    result = [("Status", "Count")] + list(counts_per_status.items())
-    result.append(("Total", sum(counts_per_status.values())))
-    return result
 
+def serve_query(session, cli_args, mode, query_args):
+    """Выполнение режима по запросу клиента в процессе `serve`."""
 
-MODE_TO_FUNCTION = {
+    return collect_mode(
+        session, Namespace(**{**vars(cli_args), **query_args, "mode": mode})
+    )
+
+
+def serve(session, cli_args=None):
+    """Функция постоянного процесса, который держит сессию и кеши
+    загруженными и отвечает на запросы режимов через Unix-сокет."""
+
+    path = socket_path(cli_args)
+    server = daemon.ParserServer(
+        path,
+        partial(serve_query, session, cli_args),
+        ttl=getattr(cli_args, "serve_ttl", DEFAULT_SERVE_TTL),
+    )
+    # остановка по SIGTERM, как и по Ctrl+C, удаляет файл сокета
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    logging.info(f"Парсер ожидает запросы режимов: {path}")
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logging.info(f"Обработано запросов режимов: {server.queries}")
+
+
+MODE_TO_FUNCTION = ModeRegistry({
     "whats-new": whats_new,
     "latest-versions": latest_versions,
-    "download": download,
+    DOWNLOAD_MODE: download,
+    MIRROR_MODE: mirror,
     "pep": pep,
-}
+    "cache-stats": cache_stats,
+    "pep-table": pep_table,
+    SERVE_MODE: serve,
+    WATCH_MODE: watch,
+})
 
 
-def main():
-    """Основная функция для работы с парсером в различных режимах."""
-    configure_logging()
+def session_concurrency(args):
+    """Наибольшее число одновременных запросов сессии.
 
-    logging.info("Парсер запущен!")
-    arg_parser = configure_argument_parser(MODE_TO_FUNCTION.keys())
-    args = arg_parser.parse_args()
+    Обход страниц запускает не меньше потоков, чем процессов разбора,
+    а режим `mirror` - не меньше, чем загрузок с одного хоста; пул
+    соединений и ограничитель темпа не должны быть уже.
+    """
 
-    logging.info(f"Аргументы командной строки: {args}")
+    concurrency = max(args.workers, args.processes)
+    if MIRROR_MODE in selected_modes(args.mode):
+        concurrency = max(concurrency, args.host_concurrency)
+    return concurrency
+
+
+def prepare_session(args):
+    """Сессия с кешами, записью и воспроизведением из аргументов."""
+
+    concurrency = session_concurrency(args)
+    limiter = limiter_module.RateLimiter(
+        rate=args.rate,
+        max_rate=args.max_rate,
+        max_concurrency=concurrency,
+        retries=args.retries,
+    )
+    if args.replay:
+        # воспроизведение не должно попадать в постоянный кеш запросов
+        adapter = replay.ReplayAdapter(
+            args.replay,
+            latency=args.replay_latency,
+            bandwidth=args.replay_bandwidth and args.replay_bandwidth * 1024,
+        )
+        session = configure_session(
+            concurrency, backend="memory", adapter=adapter, limiter=limiter
+        )
+    else:
+        adapter = transport.PooledAdapter(
+            args.pool_size or concurrency,
+            timeout=(args.connect_timeout, args.read_timeout),
+        )
+        session = configure_session(
+            concurrency, args.cache_backend, adapter=adapter, limiter=limiter
+        )
+        if args.cache_backend != "memory":
+            session.access_log = CacheAccessLog(
+                BASE_DIR / CACHE_ACCESS_FILE.format(backend=args.cache_backend)
+            )
 
-    session = requests_cache.CachedSession()
+    if args.record:
+        session.recorder = replay.Recorder(args.record)
+
+    if not args.no_results_cache:
+        session.results_cache = ResultsCache(BASE_DIR / RESULTS_CACHE_FILE)
+
+    if args.max_memory:
+        session.memory = MemoryCeiling(int(args.max_memory * 1024**2))
 
     if args.clear_cache:
         session.cache.clear()
+        if not args.no_results_cache:
+            session.results_cache.clear()
+        if hasattr(session, "access_log"):
+            session.access_log.clear()
+
+    return session
+
+
+def finish_session(session, args):
+    """Сохранение записанного корпуса, вытеснение из кеша и статистика."""
+
+    if session is None:
+        return
+
+    if args.record:
+        session.recorder.close()
+        logging.info(f"Корпус ответов сохранён: {args.record}")
+
+    if hasattr(session, "access_log"):
+        session.access_log.flush()
+    if args.cache_max_size and hasattr(session, "access_log"):
+        session.access_log.evict(
+            session.cache, int(args.cache_max_size * 1024**2)
+        )
+
+    logging.info(session.limiter.describe())
+    if hasattr(session, "transport"):
+        transport.log_connection_stats(session.transport)
+
+
+def selected_modes(modes):
+    """Режимы из командной строки без повторов, `all` раскрывается."""
 
-    parser_mode = args.mode
+    selected = []
+    for mode in modes:
+        for name in ALL_MODES_SELECTION if mode == ALL_MODES else (mode,):
+            if name not in selected:
+                selected.append(name)
+    return selected
+
+
+def mode_args(args, mode):
+    """Аргументы командной строки для одного из выбранных режимов."""
+
+    return Namespace(**{**vars(args), "mode": mode})
+
+
+def run_mode(session, cli_args):
+    """Выполнение режима с потоковым выводом результатов."""
 
     try:
-        results = MODE_TO_FUNCTION[parser_mode](session)
+        with profiling.phase("mode"):
+            results = MODE_TO_FUNCTION[cli_args.mode](session, cli_args)
 
         if results is not None:
-            control_output(results, args)
+            control_output(results, cli_args)
+
+    except KeyboardInterrupt:
+        # сессия всё равно закрывается в finish_session
+        logging.info(f"Режим {cli_args.mode} прерван.")
 
     except Exception:
         logging.exception(
-            "Сбой работы парсера.",
+            f"Сбой работы парсера в режиме {cli_args.mode}.",
             stack_info=True,
         )
 
+
+def collect_mode(session, cli_args):
+    """Выполнение режима с получением всех строк результата."""
+
+    with profiling.phase("mode"):
+        results = MODE_TO_FUNCTION[cli_args.mode](session, cli_args)
+        if results is None:
+            return None
+        return Results(results.header, list(results.rows))
+
+
+def run_modes(session, args, modes):
+    """Одновременное выполнение нескольких режимов в общей сессии.
+
+    Режимы используют общие кеши и память извлечённых данных. Чтобы
+    выводы режимов не перемешивались, результаты каждого режима
+    собираются полностью и выводятся по очереди в порядке `modes`.
+    """
+
+    if session is not None:
+        session.memo = DocumentMemo()
+    modes_args = [mode_args(args, mode) for mode in modes]
+    with ThreadPoolExecutor(max_workers=len(modes)) as executor:
+        futures = [
+            executor.submit(collect_mode, session, cli_args)
+            for cli_args in modes_args
+        ]
+        for cli_args, future in zip(modes_args, futures):
+            try:
+                results = future.result()
+                if results is not None:
+                    control_output(results, cli_args)
+
+            except Exception:
+                logging.exception(
+                    f"Сбой работы парсера в режиме {cli_args.mode}.",
+                    stack_info=True,
+                )
+
+
+def forward_to_daemon(args, modes):
+    """Выполнение режимов запущенным процессом `serve`.
+
+    Возвращает False, если процесс не запущен или режимы с такими
+    аргументами нужно выполнять в текущем процессе.
+    """
+
+    if args.no_daemon or not daemon.forwardable(args, modes):
+        return False
+
+    try:
+        answers = daemon.query(
+            socket_path(args), modes, daemon.query_args(args)
+        )
+    except (OSError, ValueError):
+        return False
+
+    logging.info(f"Режимы выполнены процессом serve: {socket_path(args)}")
+    for answer in answers:
+        if "error" in answer:
+            logging.error(
+                f"Сбой работы парсера в режиме {answer['mode']}: "
+                f"{answer['error']}"
+            )
+        elif answer["header"] is not None:
+            results = Results(
+                tuple(answer["header"]), [tuple(row) for row in answer["rows"]]
+            )
+            control_output(results, mode_args(args, answer["mode"]))
+    return True
+
+
+def main():
+    """Основная функция для работы с парсером в различных режимах."""
+    configure_logging()
+
+    logging.info("Парсер запущен!")
+    MODE_TO_FUNCTION.load_entry_points(MODES_ENTRY_POINT_GROUP)
+    arg_parser = configure_argument_parser([*MODE_TO_FUNCTION, ALL_MODES])
+    args = arg_parser.parse_args()
+
+    logging.info(f"Аргументы командной строки: {args}")
+    modes = selected_modes(args.mode)
+    if args.output == PRETTY and set(modes) & set(STREAMING_MODES):
+        # таблице нужны все строки, а поток событий бесконечен
+        arg_parser.error(
+            "Вывод pretty недоступен для режимов с потоком событий: "
+            + ", ".join(STREAMING_MODES)
+        )
+    if args.profile or args.profile_json:
+        profiling.enable()
+
+    if forward_to_daemon(args, modes):
+        logging.info("Парсер завершил работу.")
+        return
+
+    # режимам с локальными данными не нужны сессия и её зависимости
+    session = (
+        None
+        if all(mode in LOCAL_MODES for mode in modes)
+        else prepare_session(args)
+    )
+    if len(modes) == 1:
+        run_mode(session, mode_args(args, modes[0]))
+    else:
+        run_modes(session, args, modes)
+
+    finish_session(session, args)
+    profiling.report(args.profile_json)
+    logging.info(
+        session.memory.describe()
+        if hasattr(session, "memory")
+        else describe_peak()
+    )
     logging.info("Парсер завершил работу.")
 
 
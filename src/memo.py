@@ -0,0 +1,92 @@
+import math
+import threading
+import time
+from concurrent.futures import Future
+
+
+class DocumentMemo:
+    """Общая для режимов память данных, извлечённых из страниц.
+
+    Запись хранится по URL страницы и имени функции извлечения. Если
+    два режима одновременно разбирают одну страницу, второй ждёт
+    результат первого, а не разбирает её повторно.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = {}
+
+    def get_or_compute(self, key, compute):
+        """Запись по ключу `key`; при отсутствии вычисляется `compute()`."""
+
+        with self._lock:
+            future = self._records.get(key)
+            owner = future is None
+            if owner:
+                future = self._records[key] = Future()
+
+        if owner:
+            try:
+                future.set_result(compute())
+            except BaseException as error:
+                # неудачная попытка не должна запоминаться
+                with self._lock:
+                    del self._records[key]
+                future.set_exception(error)
+                raise
+
+        return future.result()
+
+    def __len__(self):
+        return len(self._records)
+
+
+class TimedMemo:
+    """Память результатов с ограниченным сроком хранения.
+
+    Результат `compute()` отдаётся по ключу `ttl` секунд после
+    вычисления, затем вычисляется заново. Одновременные запросы с одним
+    ключом, как и в `DocumentMemo`, ждут одно вычисление.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._records = {}
+
+    def get_or_compute(self, key, compute):
+        """Запись по ключу `key`; устаревшая запись вычисляется заново."""
+
+        now = time.monotonic()
+        with self._lock:
+            # устаревшие записи удаляются, чтобы память не росла
+            self._records = {
+                record_key: record
+                for record_key, record in self._records.items()
+                if record[0] > now
+            }
+            record = self._records.get(key)
+            owner = record is None
+            if owner:
+                future = Future()
+                self._records[key] = (math.inf, future)
+            else:
+                future = record[1]
+
+        if owner:
+            try:
+                result = compute()
+            except BaseException as error:
+                with self._lock:
+                    self._records.pop(key, None)
+                future.set_exception(error)
+                raise
+
+            with self._lock:
+                self._records[key] = (time.monotonic() + self.ttl, future)
+            future.set_result(result)
+
+        return future.result()
+
+    def __len__(self):
+        return len(self._records)
@@ -0,0 +1,98 @@
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+from constants import MEMORY_CHECK_INTERVAL, MEMORY_HIGH_WATER
+
+try:
+    import resource
+except ImportError:
+    # модуля resource нет в Windows
+    resource = None
+
+
+def current_memory():
+    """Объём памяти процесса в байтах.
+
+    В Linux - резидентная память процесса (RSS) из `/proc`, в других
+    системах - память, выделенная интерпретатором, по tracemalloc.
+    """
+
+    try:
+        with open("/proc/self/statm") as file:
+            pages = int(file.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def peak_memory():
+    """Наибольший объём памяти процесса с начала работы в байтах."""
+
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS сообщает пик в байтах, Linux - в килобайтах
+        return peak if sys.platform == "darwin" else peak * 1024
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[1]
+    return None
+
+
+def describe_peak():
+    """Пиковое потребление памяти процессом для лога."""
+
+    peak = peak_memory()
+    if peak is None:
+        return "Пиковое потребление памяти неизвестно"
+    return f"Пиковое потребление памяти: {peak / 1024**2:.1f} МБ"
+
+
+class MemoryCeiling:
+    """Предел памяти процесса для обхода страниц.
+
+    Когда память процесса подходит к пределу, сначала собирается
+    циклический мусор; если это не помогло, `over()` сообщает обходу,
+    что новые страницы брать в работу не нужно. Память процессов
+    разбора (`--processes`) не учитывается.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._checked = None
+        self._over = False
+
+    def over(self):
+        """Подошла ли память процесса к пределу.
+
+        Память проверяется не чаще раза в `MEMORY_CHECK_INTERVAL`
+        секунд, между проверками возвращается последний результат.
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._checked is not None
+                and now - self._checked < MEMORY_CHECK_INTERVAL
+            ):
+                return self._over
+
+            self._checked = now
+            threshold = self.limit * MEMORY_HIGH_WATER
+            self._over = current_memory() >= threshold
+            if self._over:
+                gc.collect()
+                self._over = current_memory() >= threshold
+            return self._over
+
+    def describe(self):
+        """Описание предела и пикового потребления памяти для лога."""
+
+        return f"{describe_peak()}, предел {self.limit / 1024**2:.1f} МБ"
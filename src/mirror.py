@@ -0,0 +1,35 @@
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+
+class HostLimits:
+    """Ограничение числа одновременных загрузок с одного хоста."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    @contextmanager
+    def slot(self, url):
+        """Место для загрузки с хоста `url`; ждёт, пока оно освободится."""
+
+        host = urlsplit(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.setdefault(
+                host, threading.BoundedSemaphore(self.limit)
+            )
+        with semaphore:
+            yield
+
+
+def mirror_archive(session, url, path, entry, limits, store):
+    """Загрузка архива `url` в хранилище `store` под именем `path`,
+    если он изменился на сервере.
+
+    Возвращает результат и запись манифеста.
+    """
+
+    with limits.slot(url):
+        return store.fetch(session, url, path, entry)
@@ -1,50 +1,80 @@
 import csv
 import datetime as dt
+import gzip
+import json
 import logging
-
-from prettytable import PrettyTable
+import sqlite3
+from collections import namedtuple
+from itertools import islice
 
 from constants import (
     BASE_DIR,
+    CSV_GZ,
     DATETIME_FORMAT,
+    JSONL,
+    RESULTS_DB_FILE,
     RESULTS_DIR,
     PRETTY,
     FILE,
+    SQLITE,
+    SQLITE_BATCH_SIZE,
+    STREAMING_MODES,
 )
+from lazy import lazy_import
+import profiling
+
+prettytable = lazy_import("prettytable")
+
+
+# Результаты режима: строка заголовков и итерируемые строки данных,
+# которые режим может выдавать по мере получения
+Results = namedtuple("Results", ("header", "rows"))
 
 
 def control_output(results, cli_args):
-    """Функция определения способа вывода результатов работы парсера."""
+    """Функция определения способа вывода результатов работы парсера.
+
+    Принимает `Results` или последовательность строк с заголовками
+    в первой строке.
+    """
+
+    if not isinstance(results, Results):
+        results = Results(results[0], results[1:])
+    # ожидание строк от режима не входит во время вывода
+    results = Results(results.header, profiling.iterate("rows", results.rows))
 
     output = cli_args.output
-    if output == PRETTY:
-        pretty_output(results)
+    with profiling.phase("output"):
+        if output == PRETTY:
+            pretty_output(results)
 
-    elif output == FILE:
-        file_output(results, cli_args)
+        elif output in FILE_OUTPUTS:
+            FILE_OUTPUTS[output](results, cli_args)
 
-    else:
-        default_output(results)
+        else:
+            default_output(results)
 
 
 def default_output(results):
     """Функция вывода результатов в терминал построчно."""
-    for row in results:
-        print(*row)
+    print(*results.header)
+    for row in results.rows:
+        print(*row, flush=True)
 
 
 def pretty_output(results):
     """Функция вывода результатов в виде таблицы в терминал."""
 
-    table = PrettyTable()
-    table.field_names = results[0]
+    table = prettytable.PrettyTable()
+    table.field_names = results.header
     table.align = "l"
-    table.add_rows(results[1:])
+    # для выравнивания таблицы нужны все строки сразу
+    table.add_rows(list(results.rows))
     print(table)
 
 
-def file_output(results, cli_args):
-    """Функция записи информации в файл с сохранением в папку results."""
+def result_path(cli_args, extension):
+    """Путь к файлу результатов режима в папке results."""
 
     result_dir = BASE_DIR / RESULTS_DIR
     result_dir.mkdir(exist_ok=True)
@@ -52,11 +82,128 @@ def file_output(results, cli_args):
     parse_mod = cli_args.mode
     now = dt.datetime.now()
     data_formatted = now.strftime(DATETIME_FORMAT)
-    file_name = f"{parse_mod}_{data_formatted}.csv"
-    file_path = result_dir / file_name
+    file_name = f"{parse_mod}_{data_formatted}.{extension}"
+    return result_dir / file_name
+
+
+def file_output(results, cli_args):
+    """Функция записи информации в файл с сохранением в папку results."""
+
+    file_path = result_path(cli_args, "csv")
+    with open(file_path, "w", encoding="utf-8") as f:
+        writer = csv.writer(f, dialect="unix")
+        writer.writerow(results.header)
+        # строки сбрасываются на диск по мере поступления, чтобы
+        # при сбое сохранилась уже полученная часть результатов
+        for row in results.rows:
+            writer.writerow(row)
+            f.flush()
+
+    logging.info(f"Файл с результатами был сохранён: {file_path}")
 
+
+def jsonl_output(results, cli_args):
+    """Запись результатов в JSON Lines: объект с полями из заголовков
+    на каждую строку."""
+
+    file_path = result_path(cli_args, JSONL)
+    header = results.header
+    encoder = json.JSONEncoder(ensure_ascii=False)
     with open(file_path, "w", encoding="utf-8") as f:
+        # строки пишутся по мере поступления, на диск их сбрасывает
+        # буфер файла без системного вызова на каждую строку
+        for row in results.rows:
+            f.write(encoder.encode(dict(zip(header, row))) + "\n")
+
+    logging.info(f"Файл с результатами был сохранён: {file_path}")
+
+
+def csv_gz_output(results, cli_args):
+    """Запись результатов в CSV со сжатием gzip."""
+
+    file_path = result_path(cli_args, CSV_GZ)
+    # без сброса после каждой строки: он ухудшает сжатие, а уже
+    # записанные блоки gzip читаются и при обрыве файла
+    with gzip.open(file_path, "wt", encoding="utf-8", newline="") as f:
         writer = csv.writer(f, dialect="unix")
-        writer.writerows(results)
+        writer.writerow(results.header)
+        writer.writerows(results.rows)
 
     logging.info(f"Файл с результатами был сохранён: {file_path}")
+
+
+def quote_identifier(name):
+    """Имя таблицы или столбца SQLite в кавычках."""
+
+    return '"{}"'.format(str(name).replace('"', '""'))
+
+
+def add_missing_columns(connection, table, names):
+    """Добавление в таблицу SQLite столбцов `names`, которых в ней нет."""
+
+    existing = {
+        column[1]
+        for column in connection.execute(f"PRAGMA table_info({table})")
+    }
+    for name in names:
+        if str(name) not in existing:
+            connection.execute(
+                f"ALTER TABLE {table} ADD COLUMN {quote_identifier(name)}"
+            )
+
+
+def sqlite_output(results, cli_args):
+    """Запись результатов в базу SQLite в таблицу с именем режима.
+
+    Строки добавляются пакетами по SQLITE_BATCH_SIZE в одной
+    транзакции вместе со временем запуска в столбце `run_at`. Строки
+    режимов с бесконечным потоком (`watch`) сохраняются каждая своей
+    транзакцией, чтобы событие попадало в таблицу сразу. Столбцы,
+    которых нет в таблице от прошлых запусков (например, при другом
+    `--group-by`), добавляются в неё.
+    """
+
+    db_path = BASE_DIR / RESULTS_DIR / RESULTS_DB_FILE
+    db_path.parent.mkdir(exist_ok=True)
+    table = quote_identifier(cli_args.mode.replace("-", "_"))
+    columns = ", ".join(
+        quote_identifier(name) for name in ("run_at", *results.header)
+    )
+    placeholders = ", ".join("?" * (len(results.header) + 1))
+    run_at = dt.datetime.now().strftime(DATETIME_FORMAT)
+    rows = ((run_at, *row) for row in results.rows)
+
+    insert = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+    streaming = cli_args.mode in STREAMING_MODES
+    batch_size = 1 if streaming else SQLITE_BATCH_SIZE
+    batches = iter(lambda: list(islice(rows, batch_size)), [])
+
+    connection = sqlite3.connect(db_path)
+    try:
+        with connection:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ({columns})"
+            )
+            add_missing_columns(connection, table, results.header)
+        if streaming:
+            for batch in batches:
+                with connection:
+                    connection.executemany(insert, batch)
+        else:
+            with connection:
+                for batch in batches:
+                    connection.executemany(insert, batch)
+    finally:
+        connection.close()
+
+    logging.info(
+        f"Результаты были сохранены в таблицу {table} базы {db_path}"
+    )
+
+
+FILE_OUTPUTS = {
+    FILE: file_output,
+    JSONL: jsonl_output,
+    CSV_GZ: csv_gz_output,
+    SQLITE: sqlite_output,
+}
@@ -0,0 +1,23 @@
+import json
+
+from constants import STATUS_CODES
+
+
+def api_peps(content):
+    """Строки индекса и данные карточек PEP из документа `api/peps.json`.
+
+    Возвращает список троек: код статуса, ссылка на карточку относительно
+    индекса и кортеж (статус, тип, дата создания), как у `pep_card`.
+    Код статуса восстанавливается по статусу так же, как в индексе PEP;
+    у неизвестных статусов код пустой.
+    """
+
+    peps = sorted(json.loads(content).values(), key=lambda pep: pep["number"])
+    return [
+        (
+            STATUS_CODES.get(pep["status"], ""),
+            f"pep-{pep['number']:04d}/",
+            (pep["status"], pep["type"], pep["created"]),
+        )
+        for pep in peps
+    ]
@@ -0,0 +1,200 @@
+import json
+import os
+import struct
+import sys
+from array import array
+from datetime import date, datetime
+
+from lazy import lazy_import
+
+utils = lazy_import("utils")
+
+MAGIC = b"PEPTABLE1\n"
+HEADER_SIZE = struct.Struct("<I")
+CREATED_FORMAT = "%d-%b-%Y"
+
+# столбцы-справочники хранят коды значений, а сами значения - в словаре
+ENCODED_COLUMNS = ("index_code", "card_status", "type")
+COLUMNS = {
+    "number": "I",
+    "index_code": "H",
+    "card_status": "H",
+    "type": "H",
+    "created": "I",
+}
+
+
+def created_ordinal(created):
+    """Дата создания PEP как порядковый номер дня, 0 - дата не распознана."""
+
+    try:
+        return datetime.strptime(created.strip(), CREATED_FORMAT).toordinal()
+    except ValueError:
+        return 0
+
+
+class PepTable:
+    """Столбцовая таблица PEP: номер, код статуса в индексе, статус
+    в карточке, тип и дата создания.
+
+    Каждый столбец - массив `array` фиксированного типа. Строковые
+    столбцы хранятся словарным кодированием: в массиве лежат номера
+    значений в словаре столбца. Группировки считаются подсчётом кодов
+    без разбора строк таблицы.
+    """
+
+    def __init__(self):
+        self.columns = {
+            name: array(typecode) for name, typecode in COLUMNS.items()
+        }
+        self.dictionaries = {name: [] for name in ENCODED_COLUMNS}
+        self._codes = {name: {} for name in ENCODED_COLUMNS}
+
+    def __len__(self):
+        return len(self.columns["number"])
+
+    def encode(self, column, value):
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.dictionaries[column])
+            self.dictionaries[column].append(value)
+        return code
+
+    def append(self, number, index_code, card_status, pep_type, created):
+        """Добавление строки таблицы."""
+
+        self.columns["number"].append(number)
+        self.columns["index_code"].append(
+            self.encode("index_code", index_code)
+        )
+        self.columns["card_status"].append(
+            self.encode("card_status", card_status)
+        )
+        self.columns["type"].append(self.encode("type", pep_type))
+        self.columns["created"].append(created_ordinal(created))
+
+    def column_codes(self, key):
+        """Коды и словарь столбца; год создания вычисляется из даты."""
+
+        if key != "year":
+            return self.columns[key], self.dictionaries[key]
+
+        years = sorted({
+            date.fromordinal(ordinal).year
+            for ordinal in set(self.columns["created"])
+            if ordinal
+        })
+        year_codes = {year: code for code, year in enumerate(years, 1)}
+        by_ordinal = {
+            ordinal: year_codes[date.fromordinal(ordinal).year]
+            if ordinal else 0
+            for ordinal in set(self.columns["created"])
+        }
+        codes = array(
+            "H", map(by_ordinal.__getitem__, self.columns["created"])
+        )
+        return codes, ["", *years]
+
+    def group_by(self, *keys):
+        """Число PEP по сочетаниям значений столбцов `keys`.
+
+        Коды столбцов сводятся в один целочисленный ключ (код первого
+        столбца - старший разряд, основание разряда - размер словаря
+        столбца), а группы считаются по массиву счётчиков с индексом
+        по этому ключу. Порядок групп - порядок значений в словарях
+        столбцов, то есть порядок их первого появления в таблице.
+        """
+
+        columns = [self.column_codes(key) for key in keys]
+        combined = array("Q", [0]) * len(self)
+        space = 1
+        for codes, dictionary in columns:
+            size = len(dictionary)
+            combined = array("Q", [
+                key * size + code for key, code in zip(combined, codes)
+            ])
+            space *= size
+
+        counts = array("L", [0]) * space
+        for key in combined:
+            counts[key] += 1
+
+        groups = {}
+        for key, count in enumerate(counts):
+            if not count:
+                continue
+            group = []
+            for _, dictionary in reversed(columns):
+                key, code = divmod(key, len(dictionary))
+                group.append(dictionary[code])
+            groups[tuple(reversed(group))] = count
+        return groups
+
+    def mismatches(self):
+        """Номера PEP, статус карточки которых не ждут по коду индекса."""
+
+        index_codes = self.dictionaries["index_code"]
+        statuses = self.dictionaries["card_status"]
+        # проверяются сочетания кодов, а не все строки таблицы
+        unexpected = {
+            (index_code, card_status)
+            for index_code in range(len(index_codes))
+            for card_status in range(len(statuses))
+            if utils.status_mismatch(
+                statuses[card_status], index_codes[index_code]
+            )
+        }
+        return [
+            (number, index_codes[index_code], statuses[card_status])
+            for number, index_code, card_status in zip(
+                self.columns["number"],
+                self.columns["index_code"],
+                self.columns["card_status"],
+            )
+            if (index_code, card_status) in unexpected
+        ]
+
+    def save(self, path):
+        """Атомарное сохранение таблицы в двоичном формате.
+
+        Файл состоит из сигнатуры, заголовка JSON со словарями столбцов
+        и порядком байт и байтов массивов столбцов подряд.
+        """
+
+        header = json.dumps({
+            "rows": len(self),
+            "byteorder": sys.byteorder,
+            "dictionaries": self.dictionaries,
+        }).encode()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as file:
+            file.write(MAGIC)
+            file.write(HEADER_SIZE.pack(len(header)))
+            file.write(header)
+            for name in COLUMNS:
+                self.columns[name].tofile(file)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Загрузка таблицы, сохранённой методом `save`."""
+
+        table = cls()
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Файл {path} не является таблицей PEP")
+            (size,) = HEADER_SIZE.unpack(file.read(HEADER_SIZE.size))
+            header = json.loads(file.read(size))
+            for name in COLUMNS:
+                table.columns[name].fromfile(file, header["rows"])
+                if header["byteorder"] != sys.byteorder:
+                    table.columns[name].byteswap()
+
+        for name, values in header["dictionaries"].items():
+            table.dictionaries[name] = values
+            table._codes[name] = {
+                value: code for code, value in enumerate(values)
+            }
+        return table
@@ -0,0 +1,215 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from lazy import lazy_import
+
+prettytable = lazy_import("prettytable")
+
+
+class Profiler:
+    """Сбор времени по фазам работы парсера и статистики запросов.
+
+    Время фазы считается без вложенных фаз того же потока: время
+    разбора HTML не входит во время извлечения данных, а время
+    ожидания строк режима - во время вывода результатов.
+    """
+
+    def __init__(self):
+        self.pid = os.getpid()
+        self.started = time.perf_counter()
+        self.phases = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.counters = defaultdict(int)
+        self.requests = defaultdict(lambda: defaultdict(float))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        return self._local.__dict__.setdefault("stack", [])
+
+    def _record(self, name, seconds, url=None):
+        with self._lock:
+            self.phases[name] += seconds
+            self.calls[name] += 1
+            if url is not None:
+                self.requests[url][name] += seconds
+
+    def add(self, name, seconds, url=None):
+        """Учёт `seconds` секунд фазы `name`, в том числе для запроса `url`."""
+
+        stack = self._stack()
+        if stack:
+            stack[-1] += seconds
+        self._record(name, seconds, url)
+
+    @contextmanager
+    def phase(self, name, url=None):
+        stack = self._stack()
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._record(name, elapsed - stack.pop(), url)
+            if stack:
+                stack[-1] += elapsed
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def record_response(self, url, response, seconds, stream=False):
+        """Учёт времени, попадания в кеш и объёма ответа на запрос."""
+
+        from_cache = getattr(response, "from_cache", False)
+        self.add("cache" if from_cache else "network", seconds, url)
+        self.count("cache_hits" if from_cache else "cache_misses")
+        if getattr(response, "revalidated", False):
+            self.count("revalidated")
+        if stream:
+            # тело потоковых ответов учитывается по мере чтения
+            return
+
+        size = len(response.content)
+        self.count(
+            "bytes_from_cache" if from_cache else "bytes_transferred", size
+        )
+        with self._lock:
+            self.requests[url]["bytes"] += size
+
+    def iterate(self, name, iterable):
+        """Итерация с учётом времени получения элементов как фазы `name`."""
+
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def summary(self):
+        lookups = self.counters["cache_hits"] + self.counters["cache_misses"]
+        return {
+            "total_s": round(time.perf_counter() - self.started, 4),
+            "phases": {
+                name: {"seconds": round(seconds, 4), "calls": self.calls[name]}
+                for name, seconds in sorted(
+                    self.phases.items(), key=lambda item: -item[1]
+                )
+            },
+            "counters": dict(self.counters),
+            "cache_hit_ratio": (
+                round(self.counters["cache_hits"] / lookups, 3)
+                if lookups
+                else None
+            ),
+            "requests": {
+                url: {name: round(value, 4) for name, value in stats.items()}
+                for url, stats in self.requests.items()
+            },
+        }
+
+
+_profiler = None
+
+
+def enable():
+    """Включение профилирования для текущего процесса."""
+
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+
+def disable():
+    global _profiler
+    _profiler = None
+
+
+def get_profiler():
+    """Профилировщик текущего процесса или None, если он не включён.
+
+    Процессы разбора, унаследовавшие профилировщик при fork, его не
+    используют: их замеры не попали бы в отчёт.
+    """
+
+    if _profiler is None or _profiler.pid != os.getpid():
+        return None
+    return _profiler
+
+
+@contextmanager
+def phase(name, url=None):
+    """Замер фазы; без включённого профилирования ничего не делает."""
+
+    profiler = get_profiler()
+    if profiler is None:
+        yield
+        return
+
+    with profiler.phase(name, url):
+        yield
+
+
+def count(name, value=1):
+    profiler = get_profiler()
+    if profiler is not None:
+        profiler.count(name, value)
+
+
+def record_response(url, response, seconds, stream=False):
+    profiler = get_profiler()
+    if profiler is not None:
+        profiler.record_response(url, response, seconds, stream)
+
+
+def iterate(name, iterable):
+    profiler = get_profiler()
+    if profiler is None:
+        return iterable
+    return profiler.iterate(name, iterable)
+
+
+def print_report(summary, file=None):
+    """Вывод сводки профилирования в виде таблиц."""
+
+    total = summary["total_s"]
+    table = prettytable.PrettyTable()
+    table.field_names = ("Фаза", "Время, с", "Вызовов", "Доля")
+    table.align = "l"
+    for name, stats in summary["phases"].items():
+        share = stats["seconds"] / total if total else 0
+        table.add_row((name, stats["seconds"], stats["calls"], f"{share:.1%}"))
+    print(table, file=file)
+
+    counters = prettytable.PrettyTable()
+    counters.field_names = ("Показатель", "Значение")
+    counters.align = "l"
+    counters.add_row(("total_s", total))
+    counters.add_rows(list(summary["counters"].items()))
+    counters.add_row(("cache_hit_ratio", summary["cache_hit_ratio"]))
+    print(counters, file=file)
+
+
+def report(json_path=None):
+    """Сводка профилирования в stderr и, если задан путь, в JSON-файл."""
+
+    profiler = get_profiler()
+    if profiler is None:
+        return
+
+    summary = profiler.summary()
+    print_report(summary, file=sys.stderr)
+    if json_path is not None:
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump(summary, file, ensure_ascii=False, indent=2)
+        logging.info(f"Отчёт профилирования сохранён: {json_path}")
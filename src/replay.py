@@ -0,0 +1,131 @@
+import hashlib
+import io
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3 import HTTPResponse
+
+from constants import REPLAY_BODIES_DIR, REPLAY_INDEX_FILE
+from state import load_state, save_state
+
+# тело ответа хранится уже раскодированным
+SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def body_name(url):
+    """Имя файла тела ответа в корпусе."""
+
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+class Recorder:
+    """Запись ответов, полученных через `utils.get_response`, в корпус.
+
+    Корпус - каталог с индексом `index.json` (URL, код ответа,
+    заголовки) и телами ответов в подкаталоге `bodies`. Ответ
+    записывается под URL каждого запроса цепочки перенаправлений.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.index_path = path / REPLAY_INDEX_FILE
+        self.bodies_dir = path / REPLAY_BODIES_DIR
+        self.bodies_dir.mkdir(parents=True, exist_ok=True)
+        self.index = load_state(self.index_path)
+        self._lock = threading.Lock()
+
+    def record(self, response):
+        urls = [
+            previous.request.url
+            for previous in (*response.history, response)
+        ]
+        name = body_name(urls[-1])
+        (self.bodies_dir / name).write_bytes(response.content)
+        entry = {
+            "status": response.status_code,
+            "headers": {
+                header: value
+                for header, value in response.headers.items()
+                if header.lower() not in SKIPPED_HEADERS
+            },
+            "body": name,
+        }
+        with self._lock:
+            for url in urls:
+                self.index[url] = entry
+
+    def close(self):
+        with self._lock:
+            save_state(self.index_path, self.index)
+
+
+class ThrottledReader(io.RawIOBase):
+    """Чтение байтов со скоростью не выше `bandwidth` байт в секунду."""
+
+    def __init__(self, data, bandwidth=None):
+        self._buffer = io.BytesIO(data)
+        self.bandwidth = bandwidth
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        chunk = self._buffer.read(len(buffer))
+        if self.bandwidth and chunk:
+            time.sleep(len(chunk) / self.bandwidth)
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Транспорт requests, отвечающий из записанного корпуса.
+
+    Перед каждым ответом выдерживается задержка `latency` секунд, тело
+    отдаётся со скоростью не выше `bandwidth` байт в секунду. На
+    условные запросы с совпадающим ETag или Last-Modified отвечает 304.
+    Для URL, которых нет в корпусе, возвращается 404.
+    """
+
+    def __init__(self, path, latency=0, bandwidth=None, **kwargs):
+        super().__init__(**kwargs)
+        self.bodies_dir = path / REPLAY_BODIES_DIR
+        self.index = load_state(path / REPLAY_INDEX_FILE)
+        self.latency = latency
+        self.bandwidth = bandwidth
+
+    def send(self, request, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+
+        entry = self.index.get(request.url)
+        if entry is None:
+            status, headers, body = 404, {}, b""
+        elif self.not_modified(request, entry["headers"]):
+            status, headers, body = 304, entry["headers"], b""
+        else:
+            status, headers = entry["status"], entry["headers"]
+            body = (self.bodies_dir / entry["body"]).read_bytes()
+
+        raw = HTTPResponse(
+            body=io.BufferedReader(ThrottledReader(body, self.bandwidth)),
+            headers={**headers, "Content-Length": str(len(body))},
+            status=status,
+            preload_content=False,
+            request_url=request.url,
+        )
+        return self.build_response(request, raw)
+
+    @staticmethod
+    def not_modified(request, headers):
+        headers = CaseInsensitiveDict(headers)
+        for condition, validator in (
+            ("If-None-Match", "ETag"),
+            ("If-Modified-Since", "Last-Modified"),
+        ):
+            value = request.headers.get(condition)
+            if value is not None and value == headers.get(validator):
+                return True
+
+        return False
@@ -0,0 +1,56 @@
+import pickle
+import sqlite3
+import threading
+
+
+class ResultsCache:
+    """Кеш данных, извлечённых из страниц.
+
+    Запись хранится по URL страницы и имени функции извлечения с версией
+    кеша вместе с валидатором ответа (ETag, Last-Modified или SHA-256
+    тела). Если валидатор ответа изменился, запись считается устаревшей.
+    """
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS extracted ("
+                "url TEXT, extractor TEXT, validator TEXT, record BLOB, "
+                "PRIMARY KEY (url, extractor))"
+            )
+
+    def get(self, url, extractor, validator):
+        """Извлечённые данные или None, если запись устарела или её нет."""
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT record FROM extracted "
+                "WHERE url = ? AND extractor = ? AND validator = ?",
+                (url, extractor, validator),
+            ).fetchone()
+        if row is None:
+            return None
+
+        return pickle.loads(row[0])
+
+    def set(self, url, extractor, validator, record):
+        """Сохранение извлечённых данных."""
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO extracted VALUES (?, ?, ?, ?)",
+                (url, extractor, validator, pickle.dumps(record)),
+            )
+
+    def clear(self):
+        """Удаление всех записей."""
+
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM extracted")
+
+    def close(self):
+        """Закрытие соединения с базой кеша."""
+
+        self._connection.close()
@@ -0,0 +1,39 @@
+import json
+import os
+import tempfile
+
+
+def load_state(path):
+    """Загрузка сохранённого состояния парсера из JSON-файла."""
+
+    if not path.exists():
+        return {}
+
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_state(path, state):
+    """Атомарное сохранение состояния парсера в JSON-файл.
+
+    У каждого сохранения свой временный файл, поэтому одновременные
+    запросы к демону не пишут в один и тот же файл.
+    """
+
+    path.parent.mkdir(exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        dir=path.parent,
+        prefix=path.name + ".",
+        suffix=".tmp",
+        delete=False,
+    ) as file:
+        try:
+            json.dump(state, file, ensure_ascii=False, indent=1)
+        except BaseException:
+            file.close()
+            os.unlink(file.name)
+            raise
+
+    os.replace(file.name, path)
@@ -0,0 +1,161 @@
+import datetime as dt
+import hashlib
+import logging
+import os
+import shutil
+import threading
+
+from requests import RequestException
+
+from constants import (
+    ARCHIVE_DOWNLOADED,
+    ARCHIVE_UNCHANGED,
+    LINK_SUFFIX,
+    STORE_OBJECTS_DIR,
+)
+from exceptions import RequestSendError
+from utils import download_file
+
+
+def remote_validators(session, url):
+    """ETag и Last-Modified архива по запросу HEAD мимо кеша запросов."""
+
+    try:
+        response = session.head(
+            url, headers={"Cache-Control": "no-store"}, allow_redirects=True
+        )
+    except RequestException:
+        raise RequestSendError(f"Ошибка ответа на запрос {url}")
+    if not response.ok:
+        raise RequestSendError(
+            f"Ошибка ответа на запрос {url}: {response.status_code}"
+        )
+    return {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+
+
+def link_file(source, path):
+    """Имя `path` для файла `source`: жёсткая ссылка, символьная ссылка
+    или, если файловая система не поддерживает ссылок, копия."""
+
+    if path.exists() and os.path.samefile(source, path):
+        return
+
+    tmp_path = path.with_name(path.name + LINK_SUFFIX)
+    if tmp_path.is_symlink() or tmp_path.exists():
+        tmp_path.unlink()
+    try:
+        os.link(source, tmp_path)
+    except OSError:
+        try:
+            os.symlink(os.path.relpath(source, path.parent), tmp_path)
+        except OSError:
+            shutil.copy2(source, tmp_path)
+    os.replace(tmp_path, path)
+
+
+class ContentStore:
+    """Хранилище архивов, адресуемых по SHA-256 содержимого.
+
+    Содержимое хранится один раз в `<root>/objects/<ab>/<cdef...>`,
+    а понятные имена файлов ссылаются на него. Одинаковые архивы
+    с разными именами и ссылками занимают место на диске один раз.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = root / STORE_OBJECTS_DIR
+        self._lock = threading.Lock()
+
+    def object_path(self, digest):
+        """Путь к содержимому с хешем `digest`."""
+
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def add(self, path, digest):
+        """Перенос загруженного файла `path` в хранилище.
+
+        Если такое содержимое уже есть, файл удаляется; на его месте
+        остаётся ссылка на содержимое из хранилища.
+        """
+
+        object_path = self.object_path(digest)
+        with self._lock:
+            if object_path.exists():
+                path.unlink()
+            else:
+                object_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, object_path)
+            link_file(object_path, path)
+        return object_path
+
+    def prune(self, manifest):
+        """Удаление содержимого, на которое не ссылается ни одна запись
+        манифеста; возвращает число удалённых объектов."""
+
+        referenced = {
+            self.object_path(entry["sha256"])
+            for entry in manifest.values()
+            if "sha256" in entry
+        }
+        pruned = 0
+        with self._lock:
+            for object_path in self.objects_dir.glob("*/*"):
+                if object_path not in referenced:
+                    object_path.unlink()
+                    pruned += 1
+            for directory in self.objects_dir.glob("*"):
+                if directory.is_dir() and not any(directory.iterdir()):
+                    directory.rmdir()
+        if pruned:
+            logging.info(f"Из хранилища удалено архивов: {pruned}")
+        return pruned
+
+    def is_unchanged(self, entry, validators):
+        """Совпадает ли архив на сервере с записью манифеста.
+
+        Архив без валидаторов на сервере считается изменившимся, как и
+        архив, содержимого которого нет в хранилище или размер этого
+        содержимого не совпадает с записанным.
+        """
+
+        if entry is None or "sha256" not in entry:
+            return False
+        if not any(validators.values()):
+            return False
+        object_path = self.object_path(entry["sha256"])
+        return (
+            all(entry.get(name) == value for name, value in validators.items())
+            and object_path.exists()
+            and object_path.stat().st_size == entry.get("size")
+        )
+
+    def fetch(self, session, url, path, entry=None, use_cache=False):
+        """Архив `url` под именем `path` с загрузкой только изменившегося.
+
+        Возвращает результат и запись манифеста: валидаторы ответа,
+        SHA-256 и размер содержимого и время загрузки. Для архива,
+        не изменившегося на сервере, запись прежняя, а имя `path`
+        восстанавливается ссылкой на содержимое без загрузки.
+        """
+
+        validators = remote_validators(session, url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if self.is_unchanged(entry, validators):
+            link_file(self.object_path(entry["sha256"]), path)
+            return ARCHIVE_UNCHANGED, entry
+
+        digest = hashlib.sha256()
+        download_file(session, url, path, use_cache, digest)
+        object_path = self.add(path, digest.hexdigest())
+        if entry is not None and entry.get("sha256") == digest.hexdigest():
+            logging.info(f"Содержимое архива не изменилось: {url}")
+
+        return ARCHIVE_DOWNLOADED, {
+            **validators,
+            "sha256": digest.hexdigest(),
+            "size": object_path.stat().st_size,
+            "updated": dt.datetime.now().isoformat(timespec="seconds"),
+        }
@@ -0,0 +1,60 @@
+import logging
+
+from requests.adapters import HTTPAdapter
+
+from constants import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_WORKERS,
+    POOL_HOSTS,
+)
+import profiling
+
+
+class PooledAdapter(HTTPAdapter):
+    """Транспорт requests с пулом соединений и тайм-аутами по умолчанию.
+
+    Для каждого хоста держится до `pool_size` соединений keep-alive.
+    Пулы всех хостов парсера помещаются в менеджер пулов одновременно,
+    поэтому соединения не закрываются при переходе между docs и peps.
+    Когда свободных соединений нет, поток ждёт освободившееся
+    соединение, а не открывает новое одноразовое соединение с TLS.
+    """
+
+    def __init__(
+        self,
+        pool_size=DEFAULT_WORKERS,
+        timeout=(DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT),
+        **kwargs,
+    ):
+        self.timeout = timeout
+        super().__init__(
+            pool_connections=POOL_HOSTS,
+            pool_maxsize=pool_size,
+            pool_block=True,
+            **kwargs,
+        )
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=timeout or self.timeout, **kwargs)
+
+    def connection_stats(self):
+        """Число открытых соединений и запросов по каждому хосту."""
+
+        pools = self.poolmanager.pools
+        stats = {}
+        for key in pools.keys():
+            pool = pools[key]
+            stats[pool.host] = (pool.num_connections, pool.num_requests)
+        return stats
+
+
+def log_connection_stats(adapter):
+    """Запись в лог и в профиль статистики переиспользования соединений."""
+
+    for host, (connections, requests) in adapter.connection_stats().items():
+        logging.info(
+            f"{host}: открыто соединений {connections} на {requests} запросов"
+        )
+        profiling.count("connections_opened", connections)
+        profiling.count("connection_requests", requests)
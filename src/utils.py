@@ -1,18 +1,54 @@
+import hashlib
 import logging
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from http import HTTPStatus
 from requests import RequestException
 
-from bs4 import BeautifulSoup
+from tqdm import tqdm
 
-from constants import EXPECTED_STATUS
+from constants import (
+    DEFAULT_PROCESSES,
+    DEFAULT_WORKERS,
+    DOWNLOAD_CHUNK_SIZE,
+    EXPECTED_STATUS,
+    PART_SUFFIX,
+    PART_VALIDATOR_SUFFIX,
+    PREFETCH,
+    RESULTS_CACHE_VERSION,
+)
 from exceptions import ParserFindTagException, RequestSendError
+import profiling
 
 
-def get_response(session, url):
+def get_response(session, url, **kwargs):
     """Функция отправки запроса и обработки исключений."""
 
     try:
-        response = session.get(url)
+        start = time.perf_counter()
+        response = session.get(url, **kwargs)
         response.encoding = "utf-8"
+        profiling.record_response(
+            url,
+            response,
+            time.perf_counter() - start,
+            stream=kwargs.get("stream", False),
+        )
+        access_log = getattr(session, "access_log", None)
+        cache_key = getattr(response, "cache_key", None)
+        if access_log is not None and cache_key and not kwargs.get("stream"):
+            access_log.touch(
+                cache_key, len(response.content), response.from_cache
+            )
+        recorder = getattr(session, "recorder", None)
+        # потоковые загрузки архивов в корпус не записываются
+        if recorder is not None and not kwargs.get("stream", False):
+            recorder.record(response)
 
         return response
 
@@ -20,14 +56,317 @@ def get_response(session, url):
         raise RequestSendError(f"Ошибка ответа на запрос {url}")
 
 
-def get_soup(session, url):
-    """Функция получения результатов работы BeautifulSoup."""
-    response = get_response(session, url)
-    if response is None:
-        return
+def get_fresh_response(session, url, **kwargs):
+    """Ответ, актуальный на момент запроса.
 
-    soup = BeautifulSoup(response.text, "lxml")
-    return soup
+    Ответ из кеша перепроверяется условным запросом и при отсутствии
+    изменений приходит как 304 без тела. Ответ без `ETag`
+    и `Last-Modified` перепроверить нельзя, и он загружается заново.
+    """
+
+    response = get_response(session, url, refresh=True, **kwargs)
+    if response.from_cache and not getattr(response, "revalidated", False):
+        response = get_response(session, url, force_refresh=True, **kwargs)
+    return response
+
+
+def ordered_map(submit, items, window, throttle=None):
+    """Генератор результатов `submit(item)` в порядке `items`.
+
+    В работе одновременно находится не больше `window` задач, чтобы не
+    накапливать результаты, которые ещё не забрал потребитель. Пока
+    `throttle()` истинно, новая задача добавляется, только когда
+    завершены все задачи в работе.
+    """
+
+    items = iter(items)
+    pending = deque(submit(item) for item in islice(items, window))
+    try:
+        while pending:
+            result = pending.popleft().result()
+            free = window - len(pending)
+            if throttle is not None and throttle():
+                profiling.count("memory_throttled")
+                free = 0 if pending else 1
+            pending.extend(submit(item) for item in islice(items, free))
+            yield result
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+
+
+def crawl(
+    session,
+    urls,
+    extract,
+    workers=DEFAULT_WORKERS,
+    processes=DEFAULT_PROCESSES,
+    fetch=get_response,
+    **kwargs,
+):
+    """Функция параллельной загрузки страниц и извлечения из них данных.
+
+    Страницы загружаются пулом из `workers` потоков через общую сессию.
+    `extract` получает байты страницы и возвращает извлечённые данные;
+    при `processes > 1` разбор выполняется в пуле процессов, куда
+    передаются только байты ответа и откуда возвращаются только
+    извлечённые кортежи. Генератор выдаёт результаты в порядке `urls`
+    по мере готовности, для страниц без ответа выдаётся None.
+    Страницы запрашиваются функцией `fetch` (по умолчанию
+    `get_response`), аргументы `kwargs` передаются в запрос каждой
+    страницы. Если к сессии подключён предел памяти (`session.memory`),
+    при подходе к нему новые страницы не загружаются, пока не будут
+    обработаны уже загруженные.
+    """
+
+    parse_pool = None
+    if processes > 1:
+        parse_pool = ProcessPoolExecutor(max_workers=processes)
+        # потоков должно хватать, чтобы загрузить все процессы разбором
+        workers = max(workers, processes)
+
+    def fetch_and_extract(url):
+        try:
+            response = fetch(session, url, **kwargs)
+        except RequestSendError as error:
+            # одна недоступная страница не должна прерывать весь обход
+            logging.error(error)
+            return None
+        if response is None:
+            return None
+        # ответ закрывается сразу после извлечения данных
+        with response:
+            return extract_response(session, response, extract, parse_pool)
+
+    try:
+        with tqdm(total=len(urls)) as progress_bar, ThreadPoolExecutor(
+            max_workers=workers
+        ) as executor:
+
+            def submit(url):
+                future = executor.submit(fetch_and_extract, url)
+                future.add_done_callback(lambda _: progress_bar.update())
+                return future
+
+            memory = getattr(session, "memory", None)
+            yield from ordered_map(
+                submit,
+                urls,
+                workers * PREFETCH,
+                memory.over if memory is not None else None,
+            )
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown(cancel_futures=True)
+
+
+def response_validator(response):
+    """Валидатор ответа: ETag, Last-Modified или SHA-256 тела."""
+
+    for header in ("ETag", "Last-Modified"):
+        if response.headers.get(header):
+            return f"{header}: {response.headers[header]}"
+
+    return f"sha256: {hashlib.sha256(response.content).hexdigest()}"
+
+
+def extractor_name(extract):
+    """Имя функции извлечения для ключа кеша извлечённых данных."""
+
+    if isinstance(extract, partial):
+        args = ", ".join(extractor_name(arg) for arg in extract.args)
+        return f"{extractor_name(extract.func)}({args})"
+
+    return f"{extract.__module__}.{extract.__qualname__}"
+
+
+def extract_response(session, response, extract, parse_pool=None):
+    """Извлечение данных из ответа с учётом общей памяти режимов.
+
+    Если к сессии подключена память извлечённых данных (`session.memo`),
+    страница, уже разобранная этой функцией в другом режиме, повторно
+    не разбирается.
+    """
+
+    memo = getattr(session, "memo", None)
+    if memo is None:
+        return extract_cached(session, response, extract, parse_pool)
+
+    return memo.get_or_compute(
+        (response.url, extractor_name(extract)),
+        partial(extract_cached, session, response, extract, parse_pool),
+    )
+
+
+def extract_cached(session, response, extract, parse_pool=None):
+    """Извлечение данных из ответа с учётом кеша извлечённых данных.
+
+    Если к сессии подключён кеш (`session.results_cache`) и в нём есть
+    запись для этого URL с тем же валидатором ответа и той же версией
+    кеша (`RESULTS_CACHE_VERSION`), страница не разбирается. Иначе
+    `extract` выполняется в текущем потоке или в пуле процессов
+    `parse_pool`, а результат сохраняется в кеш.
+    """
+
+    results_cache = getattr(session, "results_cache", None)
+    if results_cache is not None:
+        key = (
+            response.url,
+            f"{extractor_name(extract)}@v{RESULTS_CACHE_VERSION}",
+            response_validator(response),
+        )
+        with profiling.phase("results_cache", response.url):
+            record = results_cache.get(*key)
+        if record is not None:
+            profiling.count("results_cache_hits")
+            return record
+
+    # в пуле процессов сюда входят разбор и передача данных между
+    # процессами: сами процессы разбора не профилируются
+    with profiling.phase("extract", response.url):
+        if parse_pool is None:
+            record = extract(response.content)
+        else:
+            record = parse_pool.submit(extract, response.content).result()
+
+    if results_cache is not None:
+        with profiling.phase("results_cache", response.url):
+            results_cache.set(*key, record)
+    return record
+
+
+def download_file(session, url, path, use_cache=False, digest=None):
+    """Потоковая загрузка файла с докачкой и атомарным сохранением.
+
+    Файл пишется частями во временный `<имя>.part` рядом с `path`.
+    Если такой файл уже есть, загрузка продолжается с его конца через
+    заголовок Range с If-Range: валидатор ответа, с которого начат
+    временный файл, хранится рядом в `<имя>.part.validator`. Если файл
+    на сервере изменился или сервер вернул не тот диапазон, загрузка
+    начинается заново. После завершения файл переименовывается в `path`.
+    Без `use_cache` ответ не проходит через хранилище requests_cache.
+    Объект `digest` из hashlib обновляется всем содержимым файла
+    по ходу загрузки, включая докачанное начало.
+    """
+
+    part_path = path.with_name(path.name + PART_SUFFIX)
+    validator_path = part_path.with_name(
+        part_path.name + PART_VALIDATOR_SUFFIX
+    )
+    offset, headers = resume_headers(part_path, validator_path)
+    if not use_cache:
+        headers["Cache-Control"] = "no-store"
+
+    response = get_response(session, url, stream=True, headers=headers)
+    with response:
+        offset = resumed_offset(response, offset)
+        if offset is None:
+            # временный файл не соответствует файлу на сервере
+            discard_files(part_path, validator_path)
+            return download_file(session, url, path, use_cache, digest)
+        if not response.ok:
+            raise RequestSendError(
+                f"Ошибка ответа на запрос {url}: {response.status_code}"
+            )
+
+        if offset:
+            if digest is not None:
+                hash_file(part_path, digest)
+        else:
+            save_validator(response, validator_path)
+        content_length = response.headers.get("Content-Length")
+        total = offset + int(content_length) if content_length else None
+        with open(part_path, "ab" if offset else "wb") as file, tqdm(
+            total=total,
+            initial=offset,
+            unit="B",
+            unit_scale=True,
+            unit_divisor=1024,
+        ) as progress_bar:
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                file.write(chunk)
+                if digest is not None:
+                    digest.update(chunk)
+                progress_bar.update(len(chunk))
+                profiling.count("bytes_transferred", len(chunk))
+
+    os.replace(part_path, path)
+    discard_files(validator_path)
+    return path
+
+
+def resume_headers(part_path, validator_path):
+    """Смещение докачки и заголовки запроса для временного файла.
+
+    Временный файл без сохранённого валидатора продолжать нельзя:
+    неизвестно, совпадает ли он с файлом на сервере.
+    """
+
+    if not part_path.exists() or not validator_path.exists():
+        return 0, {}
+
+    offset = part_path.stat().st_size
+    if not offset:
+        return 0, {}
+    return offset, {
+        "Range": f"bytes={offset}-",
+        "If-Range": validator_path.read_text(encoding="utf-8"),
+    }
+
+
+def resumed_offset(response, offset):
+    """Смещение, с которого ответ продолжает временный файл.
+
+    0 - ответ содержит файл целиком, None - ответ не продолжает
+    временный файл и загрузку нужно начать заново.
+    """
+
+    if response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+        return None
+    if response.status_code != HTTPStatus.PARTIAL_CONTENT:
+        # файл изменился (If-Range) или сервер не поддерживает докачку
+        return 0
+
+    content_range = response.headers.get("Content-Range", "")
+    match = re.fullmatch(r"bytes (\d+)-\d+/(?:\d+|\*)", content_range)
+    if match is None or int(match.group(1)) != offset:
+        return None
+    return offset
+
+
+def save_validator(response, validator_path):
+    """Сохранение валидатора ответа для докачки через If-Range.
+
+    If-Range допускает только сильный ETag или Last-Modified.
+    """
+
+    etag = response.headers.get("ETag", "")
+    validator = (
+        etag
+        if etag and not etag.startswith("W/")
+        else response.headers.get("Last-Modified")
+    )
+    if validator:
+        validator_path.write_text(validator, encoding="utf-8")
+    else:
+        discard_files(validator_path)
+
+
+def discard_files(*paths):
+    """Удаление временных файлов загрузки, если они есть."""
+
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+def hash_file(path, digest):
+    """Обновление объекта `digest` из hashlib содержимым файла `path`."""
+
+    with open(path, "rb") as file:
+        for chunk in iter(partial(file.read, DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest
 
 
 def find_tag(soup, tag, attrs=None):
@@ -42,6 +381,18 @@ def find_tag(soup, tag, attrs=None):
     return searched_tag
 
 
+def with_digest(extract, html):
+    """Результат `extract(html)` вместе с SHA-256 содержимого страницы."""
+
+    return extract(html), hashlib.sha256(html).hexdigest()
+
+
+def pep_number(href):
+    """Номер PEP по ссылке на его карточку."""
+
+    return int(re.search(r"pep-(\d+)", href).group(1))
+
+
 def status_mismatch(status_current_card, status):
     """Функция для вывявления различий в статусах."""
 
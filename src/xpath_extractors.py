@@ -0,0 +1,154 @@
+import logging
+
+from lxml import etree
+
+from exceptions import ParserFindTagException, VersionsNotFound
+import profiling
+
+REGEXP_NS = {"re": "http://exslt.org/regular-expressions"}
+
+
+def has_class(name):
+    """Условие XPath на наличие класса в атрибуте class."""
+
+    return (
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+    )
+
+
+# Выражения компилируются один раз при импорте модуля; строковые
+# результаты не держат ссылку на дерево документа (smart_strings=False)
+WHATS_NEW_SECTION = etree.XPath(
+    "(//section[@id='what-s-new-in-python'])[1]"
+)
+TOCTREE_WRAPPER = etree.XPath(f"(.//div[{has_class('toctree-wrapper')}])[1]")
+TOCTREE_ITEMS = etree.XPath(f".//li[{has_class('toctree-l1')}]")
+FIRST_LINK_HREF = etree.XPath("(.//a)[1]/@href", smart_strings=False)
+FIRST_H1 = etree.XPath("(//h1)[1]")
+FIRST_DL = etree.XPath("(//dl)[1]")
+SIDEBAR = etree.XPath(f"(//div[{has_class('sphinxsidebarwrapper')}])[1]")
+ALL_VERSIONS_LIST = etree.XPath(
+    "(.//ul[contains(string(.), 'All versions')])[1]"
+)
+LINKS = etree.XPath(".//a")
+FIRST_TABLE = etree.XPath("(//table)[1]")
+PDF_A4_HREF = etree.XPath(
+    r"(.//a[re:test(@href, '.+pdf-a4\.zip$')])[1]/@href",
+    namespaces=REGEXP_NS,
+    smart_strings=False,
+)
+LINK_HREFS = etree.XPath(".//a/@href", smart_strings=False)
+NUMERICAL_INDEX = etree.XPath("(//section[@id='numerical-index'])[1]")
+FIRST_TBODY = etree.XPath("(.//tbody)[1]")
+TABLE_ROWS = etree.XPath(".//tr")
+FIRST_ABBR = etree.XPath("(.//abbr)[1]")
+STATUS_DD = etree.XPath(
+    "(.//dt[contains(string(.), 'Status')])[1]/following-sibling::dd[1]"
+)
+CARD_FIELD = etree.XPath(
+    "string((.//dt[normalize-space(.)=$label])[1]/following-sibling::dd[1])",
+    smart_strings=False,
+)
+TEXT = etree.XPath("string(.)", smart_strings=False)
+
+
+def make_tree(html):
+    """Построение дерева lxml из байтов ответа."""
+
+    # парсер lxml нельзя разделять между потоками
+    with profiling.phase("parse"):
+        return etree.fromstring(html, etree.HTMLParser(encoding="utf-8"))
+
+
+def find_node(xpath, node, tag, attrs=None):
+    """Поиск первого узла по XPath с обработкой исключений."""
+
+    found = xpath(node)
+    if not found:
+        err_msg = f"Не найден тег {tag} {attrs}"
+        logging.exception(err_msg, stack_info=True)
+        raise ParserFindTagException(err_msg)
+
+    return found[0]
+
+
+def whats_new_links(html):
+    """Извлечение ссылок на страницы изменений версий."""
+
+    main_div = find_node(
+        WHATS_NEW_SECTION,
+        make_tree(html),
+        "section",
+        {"id": "what-s-new-in-python"},
+    )
+    div_with_ul = find_node(
+        TOCTREE_WRAPPER, main_div, "div", {"class": "toctree-wrapper"}
+    )
+    return [
+        find_node(FIRST_LINK_HREF, section, "a")
+        for section in TOCTREE_ITEMS(div_with_ul)
+    ]
+
+
+def whats_new_card(html):
+    """Извлечение заголовка и авторов со страницы изменений версии."""
+
+    tree = make_tree(html)
+    h1 = find_node(FIRST_H1, tree, "h1")
+    dl2 = find_node(FIRST_DL, tree, "dl")
+    return TEXT(h1), TEXT(dl2).replace("\n", " ")
+
+
+def versions_links(html):
+    """Извлечение ссылок и подписей из списка всех версий Python."""
+
+    sidebar = find_node(
+        SIDEBAR, make_tree(html), "div", {"class": "sphinxsidebarwrapper"}
+    )
+    for ul in ALL_VERSIONS_LIST(sidebar):
+        return [(a_tag.get("href"), TEXT(a_tag)) for a_tag in LINKS(ul)]
+
+    err_msg = "Список версий Python на странице не найден."
+    logging.exception(err_msg, stack_info=True)
+    raise VersionsNotFound(err_msg)
+
+
+def pdf_a4_link(html):
+    """Извлечение ссылки на архив документации в формате PDF A4."""
+
+    table = find_node(FIRST_TABLE, make_tree(html), "table")
+    return find_node(PDF_A4_HREF, table, "a", {"href": r".+pdf-a4\.zip$"})
+
+
+def archive_links(html):
+    """Извлечение ссылок на все архивы со страницы загрузок документации."""
+
+    table = find_node(FIRST_TABLE, make_tree(html), "table")
+    return LINK_HREFS(table)
+
+
+def pep_index(html):
+    """Извлечение статуса из индекса и ссылки для каждого PEP."""
+
+    table_index = find_node(
+        NUMERICAL_INDEX, make_tree(html), "section", {"id": "numerical-index"}
+    )
+    table_body = find_node(FIRST_TBODY, table_index, "tbody")
+    return [
+        (
+            TEXT(find_node(FIRST_ABBR, row, "abbr"))[1:],
+            find_node(FIRST_LINK_HREF, row, "a"),
+        )
+        for row in TABLE_ROWS(table_body)
+    ]
+
+
+def pep_card(html):
+    """Извлечение статуса, типа и даты создания из карточки PEP."""
+
+    pep_card = find_node(FIRST_DL, make_tree(html), "dl")
+    return (
+        TEXT(find_node(STATUS_DD, pep_card, "dd")),
+        CARD_FIELD(pep_card, label="Type:").strip(),
+        CARD_FIELD(pep_card, label="Created:").strip(),
+    )
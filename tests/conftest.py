@@ -27,6 +27,11 @@ except (ImportError, ModuleNotFoundError, NameError):
         assert file in src_dir_files, f'Отсутсвует файл {file}'
 
 
+def collect(results):
+    """Строки результатов режима вместе со строкой заголовков."""
+    return [tuple(results.header), *results.rows]
+
+
 def pytest_make_parametrize_id(config, val):
     return repr(val)
 
@@ -87,6 +92,15 @@ def soup(response_page):
     return BeautifulSoup(response, features='lxml')
 
 
+@pytest.fixture
+def site_session(tempfile_session):
+    """Сессия, отвечающая страницами из tests/fixture_data/pages.py."""
+    from tests.fixture_data.pages import register_site
+    with requests_mock.Mocker() as mocker:
+        register_site(mocker)
+        yield tempfile_session
+
+
 @pytest.fixture
 def pep_namespace():
     return Namespace(mode='pep', clear_cache=False, output='file')
@@ -0,0 +1,197 @@
+import json
+
+PEP_INDEX_ROW = (
+    '<tr class="row-odd">'
+    '<td><abbr title="{title}">{abbr}</abbr></td>'
+    '<td><a class="pep reference internal" href="pep-{number:04d}/">'
+    '{number}</a></td>'
+    '<td>PEP {number} title</td>'
+    '<td>Author {number}</td>'
+    '</tr>'
+)
+
+PEP_INDEX = (
+    '<html><head><title>PEP 0</title></head><body>'
+    '<section id="introduction"><h2>Introduction</h2>'
+    '<dl><dt>Intro</dt><dd>Not a card</dd></dl></section>'
+    '<section id="index-by-category"><table><tbody>'
+    '<tr><td><abbr title="wrong">XX</abbr></td>'
+    '<td><a href="pep-9999/">9999</a></td></tr>'
+    '</tbody></table></section>'
+    '<section id="numerical-index"><h2>Numerical Index</h2>'
+    '<table class="pep-zero-table docutils align-default">'
+    '<thead><tr><th>Type</th><th>PEP</th></tr></thead>'
+    '<tbody>{rows}</tbody></table></section>'
+    '</body></html>'
+)
+
+PEP_CARD = (
+    '<html><head><title>PEP {number}</title></head><body>'
+    '<section id="pep-content"><h1 class="page-title">PEP {number}</h1>'
+    '<dl class="rfc2822 field-list simple">'
+    '<dt class="field-odd">Author<span class="colon">:</span></dt>'
+    '<dd class="field-odd">Author {number}</dd>'
+    '<dt class="field-even">Status<span class="colon">:</span></dt>'
+    '<dd class="field-even"><abbr title="{status}">{status}</abbr></dd>'
+    '<dt class="field-odd">Type<span class="colon">:</span></dt>'
+    '<dd class="field-odd"><abbr title="{type}">{type}</abbr></dd>'
+    '<dt class="field-even">Created<span class="colon">:</span></dt>'
+    '<dd class="field-even">{created}</dd>'
+    '</dl>'
+    '<section id="abstract"><h2>Abstract</h2>'
+    '<dl><dt>Status</dt><dd>Not a header field</dd></dl>'
+    '</section></section></body></html>'
+)
+
+WHATS_NEW_INDEX = (
+    '<html><body><div class="body">'
+    '<section id="what-s-new-in-python">'
+    '<h1>What’s New in Python<a class="headerlink" href="#">¶</a></h1>'
+    '<div class="toctree-wrapper compound"><ul>{items}</ul></div>'
+    '</section></div></body></html>'
+)
+
+WHATS_NEW_ITEM = (
+    '<li class="toctree-l1"><a class="reference internal" '
+    'href="{version}.html">What’s New In Python {version}</a>'
+    '<ul><li class="toctree-l2"><a href="{version}.html#summary">'
+    'Summary</a></li></ul></li>'
+)
+
+WHATS_NEW_PAGE = (
+    '<html><body><div class="sphinxsidebar"><h3>Navigation</h3></div>'
+    '<div class="body"><section id="what-s-new-in-python-{version}">'
+    '<h1>What’s New In Python {version}'
+    '<a class="headerlink" href="#">¶</a></h1>'
+    '<dl class="field-list simple">'
+    '<dt class="field-odd">Editor<span class="colon">:</span></dt>'
+    '<dd class="field-odd"><p>Editor {version}</p>\n</dd>'
+    '</dl>'
+    '<dl><dt>Other</dt><dd>Not the editor list</dd></dl>'
+    '</section></div></body></html>'
+)
+
+DOCS_MAIN = (
+    '<html><body><div class="sphinxsidebar">'
+    '<div class="sphinxsidebarwrapper">'
+    '<h3>Download</h3><ul><li><a href="download.html">Download</a></li></ul>'
+    '<h3>Docs by version</h3><ul>'
+    '<li><a href="https://docs.python.org/3.13/">'
+    'Python 3.13 (in development)</a></li>'
+    '<li><a href="https://docs.python.org/3.12/">Python 3.12 (stable)</a></li>'
+    '<li><a href="https://docs.python.org/2.7/">Python 2.7 (EOL)</a></li>'
+    '<li><a href="https://www.python.org/doc/versions/">All versions</a></li>'
+    '</ul></div></div></body></html>'
+)
+
+DOCS_DOWNLOAD = (
+    '<html><body><div class="body"><table class="docutils">'
+    '<tr><th>Format</th><th>Packed as .zip</th></tr>'
+    '<tr><td>PDF (A4 paper size)</td>'
+    '<td><a href="archives/python-3.12.0-docs-pdf-a4.zip">Download</a></td>'
+    '</tr>'
+    '<tr><td>HTML</td>'
+    '<td><a href="archives/python-3.12.0-docs-html.zip">Download</a></td>'
+    '</tr>'
+    '<tr><td>Plain text</td>'
+    '<td><a href="archives/python-3.12.0-docs-text.zip">Download</a></td>'
+    '</tr>'
+    '<tr><td>EPUB</td>'
+    '<td><a href="archives/python-3.12.0-docs.epub">Download</a></td>'
+    '</tr>'
+    '</table></div></body></html>'
+)
+
+PEPS = [
+    (1, 'PA', 'Active', 'Process', '13-Jun-2000'),
+    (8, 'PA', 'Active', 'Process', '05-Jul-2001'),
+    (20, 'IA', 'Active', 'Informational', '19-Aug-2004'),
+    (257, 'IA', 'Active', 'Informational', '29-May-2001'),
+    (308, 'SF', 'Final', 'Standards Track', '29-Sep-2005'),
+    (401, 'PR', 'April Fool!', 'Process', '01-Apr-2009'),
+    (572, 'SF', 'Final', 'Standards Track', '25-Feb-2018'),
+    (3000, 'PR', 'Rejected', 'Process', '05-Apr-2006'),
+    (3099, 'PF', 'Final', 'Process', '04-Apr-2006'),
+    (3105, 'SF', 'Final', 'Standards Track', '19-Nov-2006'),
+    (690, 'SD', 'Deferred', 'Standards Track', '12-Dec-2016'),
+    (703, 'S', 'Draft', 'Standards Track', '09-Jan-2023'),
+    (3333, 'IS', 'Superseded', 'Informational', '07-Dec-2003'),
+    (248, 'IW', 'Withdrawn', 'Informational', '08-May-2002'),
+    (517, 'SP', 'Provisional', 'Standards Track', '30-Sep-2015'),
+    (594, 'SA', 'Accepted', 'Standards Track', '20-May-2019'),
+]
+
+WHATS_NEW_VERSIONS = ['3.12', '3.11', '3.10', '2.7']
+
+ARCHIVE_CONTENT = b'PK\x03\x04' + bytes(range(256)) * 64
+ARCHIVE_HEADERS = {'ETag': '"archive"'}
+
+
+def pep_index(peps=PEPS):
+    rows = ''.join(
+        PEP_INDEX_ROW.format(number=number, abbr=abbr, title=status)
+        for number, abbr, status, _, _ in peps
+    )
+    return PEP_INDEX.format(rows=rows)
+
+
+def pep_card(number, status, pep_type, created):
+    return PEP_CARD.format(
+        number=number, status=status, type=pep_type, created=created
+    )
+
+
+def whats_new_index(versions=WHATS_NEW_VERSIONS):
+    items = ''.join(
+        WHATS_NEW_ITEM.format(version=version) for version in versions
+    )
+    return WHATS_NEW_INDEX.format(items=items)
+
+
+def whats_new_page(version):
+    return WHATS_NEW_PAGE.format(version=version)
+
+
+def peps_api(peps=PEPS):
+    """Документ api/peps.json с метаданными PEP."""
+    return json.dumps({
+        str(number): {
+            'number': number,
+            'title': f'PEP {number}',
+            'status': status,
+            'type': pep_type,
+            'created': created,
+            'url': f'https://peps.python.org/pep-{number:04d}/',
+        }
+        for number, _, status, pep_type, created in peps
+    })
+
+
+def register_site(mocker, peps=PEPS, versions=WHATS_NEW_VERSIONS):
+    """Регистрирует страницы документации и PEP в requests_mock."""
+    docs_url = 'https://docs.python.org/3/'
+    peps_url = 'https://peps.python.org/'
+    mocker.get(docs_url, text=DOCS_MAIN)
+    mocker.get(docs_url + 'download.html', text=DOCS_DOWNLOAD)
+    for archive in ('pdf-a4.zip', 'html.zip', 'text.zip', 'epub'):
+        separator = '.' if archive == 'epub' else '-'
+        archive_url = (
+            f'{docs_url}archives/python-3.12.0-docs{separator}{archive}'
+        )
+        mocker.get(
+            archive_url, content=ARCHIVE_CONTENT, headers=ARCHIVE_HEADERS
+        )
+        mocker.head(archive_url, headers=ARCHIVE_HEADERS)
+    mocker.get(docs_url + 'whatsnew/', text=whats_new_index(versions))
+    for version in versions:
+        mocker.get(
+            f'{docs_url}whatsnew/{version}.html',
+            text=whats_new_page(version),
+        )
+    mocker.get(peps_url, text=pep_index(peps))
+    mocker.get(peps_url + 'api/peps.json', text=peps_api(peps))
+    for number, _, status, pep_type, created in peps:
+        mocker.get(
+            f'{peps_url}pep-{number:04d}/',
+            text=pep_card(number, status, pep_type, created),
+        )
@@ -0,0 +1,101 @@
+import sqlite3
+import zlib
+from argparse import Namespace
+
+import requests_mock
+
+try:
+    from src import cache_access, configs, main, utils
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `cache_access.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `cache_access.py`'
+    )
+
+URLS = [f'https://peps.python.org/pep-{number:04d}/' for number in (1, 8, 20)]
+BODY = '<html><body>' + '<p>PEP</p>' * 500 + '</body></html>'
+
+
+def fetch(session, urls):
+    with requests_mock.Mocker() as mock:
+        for url in URLS:
+            mock.get(url, text=BODY)
+        for url in urls:
+            utils.get_response(session, url)
+
+
+def test_compressed_sqlite_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    session = configs.configure_session(backend='sqlite')
+    fetch(session, URLS[:1])
+    with sqlite3.connect(tmp_path / 'http_cache.sqlite') as connection:
+        (value,) = connection.execute(
+            'SELECT value FROM responses'
+        ).fetchone()
+    assert len(value) < len(BODY), 'Записи кеша должны храниться сжатыми'
+    assert zlib.decompress(value)
+
+    response = session.get(URLS[0])
+    assert response.from_cache and response.text == BODY
+    assert configs.decompress(b'plain') == b'plain', (
+        'Записи, сохранённые без сжатия, должны читаться как есть'
+    )
+
+
+def test_lru_eviction(tmp_path):
+    session = configs.configure_session(backend='memory')
+    session.access_log = cache_access.CacheAccessLog(tmp_path / 'access.db')
+    fetch(session, URLS)
+    # первая страница использована последней и должна остаться в кеше
+    fetch(session, URLS[:1])
+
+    evicted = session.access_log.evict(session.cache, 2 * len(BODY))
+    assert len(evicted) == 1
+    assert not session.cache.contains(url=URLS[1]), (
+        'Вытесняться должен ответ, к которому дольше всего не обращались'
+    )
+    assert session.cache.contains(url=URLS[0])
+    assert session.cache.contains(url=URLS[2])
+    assert session.access_log.stats() == {
+        'entries': 2, 'bytes': 2 * len(BODY), 'hits': 1, 'misses': 3,
+    }
+
+
+def test_cache_stats_mode(tmp_path):
+    session = configs.configure_session(backend='memory')
+    session.access_log = cache_access.CacheAccessLog(tmp_path / 'access.db')
+    fetch(session, URLS + URLS[:1])
+    session.cache.delete(urls=[URLS[2]])
+
+    cli_args = Namespace(cache_backend='memory', cache_max_size=1)
+    rows = dict(main.cache_stats(session, cli_args).rows)
+    assert rows['Записей'] == 2
+    assert rows['Объём ответов, байт'] == 2 * len(BODY), (
+        'Ответы, удалённые из кеша, не должны учитываться в объёме'
+    )
+    assert rows['Доля попаданий'] == '25.0%'
+    assert rows['Предел, байт'] == 1024**2
+
+
+def test_access_log_batches_writes(tmp_path):
+    path = tmp_path / 'access.db'
+    access_log = cache_access.CacheAccessLog(path)
+    for key in ('a', 'b', 'a'):
+        access_log.touch(key, 10, from_cache=key == 'a')
+    with sqlite3.connect(path) as connection:
+        assert connection.execute(
+            'SELECT count(*) FROM access'
+        ).fetchone() == (0,), (
+            'Обращения не должны записываться в базу на каждый запрос'
+        )
+    access_log.close()
+
+    reopened = cache_access.CacheAccessLog(path)
+    assert reopened.stats() == {
+        'entries': 2, 'bytes': 20, 'hits': 2, 'misses': 1,
+    }
+    reopened.touch('c', 5, from_cache=False)
+    assert reopened.stats()['misses'] == 2
@@ -1,5 +1,8 @@
 import pytest
 import argparse
+from datetime import datetime, timezone
+
+import requests_mock
 try:
     from src import configs
 except ModuleNotFoundError:
@@ -29,7 +32,7 @@ def test_configs_file():
     ),
     (
         argparse._StoreAction, ['-o', '--output'], 'output',
-        ('pretty', 'file'),
+        ('pretty', 'file', 'jsonl', 'csv.gz', 'sqlite'),
         'Дополнительные способы вывода данных'
     ),
 ])
@@ -64,3 +67,40 @@ def test_configure_argument_parser(
     assert got_action.help == help_str, (
         f'Укажите help-строку cli аргумента {got_action.dest}'
     )
+
+
+def test_configure_session_expiration():
+    session = configs.configure_session(backend='memory')
+    patterns = list(session.settings.urls_expire_after)
+    assert patterns.index('peps.python.org/pep-*') < patterns.index(
+        'peps.python.org'
+    ), 'Шаблоны для карточек PEP должны проверяться раньше индекса'
+    assert session.settings.stale_if_error
+
+
+def test_configure_session_revalidation():
+    url = 'https://peps.python.org/pep-0008/'
+    session = configs.configure_session(backend='memory')
+    with requests_mock.Mocker() as mock:
+        mock.get(url, text='PEP 8', headers={'ETag': '"v1"'})
+        assert not session.get(url).from_cache
+        session.cache.reset_expiration(datetime.now(timezone.utc))
+
+        mock.get(url, status_code=304, headers={'ETag': '"v1"'})
+        response = session.get(url)
+        assert mock.last_request.headers['If-None-Match'] == '"v1"', (
+            'Устаревший ответ с ETag должен перепроверяться '
+            'условным запросом'
+        )
+        assert response.from_cache and response.text == 'PEP 8'
+
+
+@pytest.mark.parametrize('arguments', [
+    ['pep', '--retries', '-1'],
+    ['pep', '--replay-latency', '-0.5'],
+])
+def test_rejects_negative_numbers(arguments):
+    parser = configs.configure_argument_parser(['pep'])
+    with pytest.raises(SystemExit):
+        parser.parse_args(arguments)
+    assert parser.parse_args(['pep', '--retries', '0']).retries == 0
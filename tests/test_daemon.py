@@ -0,0 +1,142 @@
+import sys
+import threading
+from argparse import Namespace
+
+import pytest
+
+try:
+    from src import daemon, main, state
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `daemon.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `daemon.py`'
+
+
+@pytest.fixture
+def server(site_session, tmp_path):
+    cli_args = Namespace(
+        workers=2, processes=1, engine='bs4', incremental=False,
+        group_by=['card_status'], pep_table=tmp_path / 'missing.table',
+    )
+    calls = []
+
+    def run_query(mode, query_args):
+        calls.append(mode)
+        return main.serve_query(site_session, cli_args, mode, query_args)
+
+    server = daemon.ParserServer(tmp_path / 'parser.sock', run_query, ttl=60)
+    server.calls = calls
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_query(server):
+    arguments = {'engine': 'bs4', 'incremental': False}
+    answers = daemon.query(
+        server.path, ['pep', 'latest-versions'], arguments
+    )
+    assert [answer['mode'] for answer in answers] == [
+        'pep', 'latest-versions'
+    ]
+    assert answers[0]['header'] == ['Status', 'Count']
+    assert ['Total', 16] in answers[0]['rows']
+
+    again = daemon.query(server.path, ['pep'], arguments)
+    assert again[0] == answers[0]
+    assert server.calls == ['pep', 'latest-versions'], (
+        'Повторный запрос режима должен отдаваться из памяти serve'
+    )
+
+    daemon.query(server.path, ['pep'], {**arguments, 'engine': 'lxml'})
+    assert server.calls[-1] == 'pep', (
+        'Запрос с другими аргументами режима должен выполняться заново'
+    )
+
+
+def test_query_error(server):
+    answers = daemon.query(server.path, ['pep-table'], {})
+    assert 'missing.table' in answers[0]['error'], (
+        'Сбой режима должен передаваться клиенту в ответе'
+    )
+
+
+def test_side_effect_modes_not_served(server):
+    answers = daemon.query(server.path, ['download', 'download'], {})
+    assert all('error' in answer for answer in answers)
+    assert server.calls == [], (
+        'Режимы, которые сохраняют архивы, не выполняются процессом serve'
+    )
+    assert not daemon.forwardable(Namespace(), ['download'])
+    assert daemon.query_args(Namespace(verify_sample=5))['verify_sample'] == 5
+
+
+def test_single_server(server):
+    with pytest.raises(RuntimeError):
+        daemon.ParserServer(server.path, server.run_query, ttl=1)
+
+
+def test_stale_socket_removed(tmp_path):
+    path = tmp_path / 'parser.sock'
+    stale = daemon.ParserServer(path, None, ttl=1)
+    # файл сокета без процесса, который его слушает
+    stale.socket.close()
+    server = daemon.ParserServer(path, None, ttl=1)
+    server.server_close()
+    assert not path.exists(), 'Файл сокета удаляется при остановке serve'
+
+
+def test_main_forwards_to_daemon(server, monkeypatch, capsys):
+    monkeypatch.setattr(sys, 'argv', [
+        'main.py', 'pep', '--socket', str(server.path),
+    ])
+    main.main()
+    assert server.calls == ['pep']
+    assert 'Total 16' in capsys.readouterr().out, (
+        'Клиент должен выводить результат, полученный от serve'
+    )
+
+
+def test_forward_fallback(tmp_path):
+    args = Namespace(
+        no_daemon=False, socket=tmp_path / 'missing.sock', clear_cache=False,
+        engine='bs4', incremental=False, group_by=['card_status'],
+    )
+    assert not main.forward_to_daemon(args, ['pep']), (
+        'Без запущенного serve режимы выполняются в текущем процессе'
+    )
+    args.no_daemon = True
+    assert not main.forward_to_daemon(args, ['pep'])
+    assert not daemon.forwardable(Namespace(record='corpus'), ['pep'])
+    assert not daemon.forwardable(Namespace(), ['serve'])
+    assert not daemon.forwardable(Namespace(), ['pep', 'mirror']), (
+        'Режим `mirror` должен сохранять архивы в текущем процессе'
+    )
+
+
+def test_concurrent_save_state(tmp_path):
+    path = tmp_path / 'state' / 'pep.json'
+    errors = []
+
+    def save(number):
+        try:
+            for _ in range(20):
+                state.save_state(path, {'number': number})
+        except OSError as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=save, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, (
+        'Одновременные сохранения состояния не должны мешать друг другу'
+    )
+    assert state.load_state(path)['number'] in range(8)
+    assert [file.name for file in path.parent.iterdir()] == ['pep.json'], (
+        'После сохранения не должно оставаться временных файлов'
+    )
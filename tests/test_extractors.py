@@ -0,0 +1,141 @@
+import pytest
+from argparse import Namespace
+from bs4 import BeautifulSoup
+
+from conftest import collect
+from tests.fixture_data import pages
+try:
+    from src import extractors, main, xpath_extractors
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файлы `extractors.py` '
+        'и `xpath_extractors.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файлы `extractors.py` '
+        'и `xpath_extractors.py`'
+    )
+
+
+def full_soup(html):
+    return BeautifulSoup(html, 'lxml')
+
+
+def test_pep_card_unchanged():
+    for number, _, status, pep_type, created in pages.PEPS:
+        html = pages.pep_card(number, status, pep_type, created)
+        card = full_soup(html).find('dl')
+        expected = card.select(
+            'dt:-soup-contains("Status")'
+        )[0].find_next_sibling('dd').text
+        got, _, _ = extractors.pep_card(html.encode())
+        assert got == expected == status, (
+            'Частичный разбор карточки PEP должен возвращать тот же статус'
+        )
+
+
+def test_whats_new_card_unchanged():
+    for version in pages.WHATS_NEW_VERSIONS:
+        html = pages.whats_new_page(version)
+        soup = full_soup(html)
+        expected = (
+            soup.find('h1').text,
+            soup.find('dl').text.replace('\n', ' '),
+        )
+        assert extractors.whats_new_card(html.encode()) == expected, (
+            'Частичный разбор страницы whats-new должен возвращать '
+            'те же заголовок и авторов'
+        )
+
+
+@pytest.mark.parametrize('html, strainer, tag, attrs', [
+    (
+        pages.pep_index(), extractors.PEP_INDEX,
+        'section', {'id': 'numerical-index'},
+    ),
+    (
+        pages.whats_new_index(), extractors.WHATS_NEW_INDEX,
+        'section', {'id': 'what-s-new-in-python'},
+    ),
+    (
+        pages.DOCS_MAIN, extractors.DOCS_SIDEBAR,
+        'div', {'class': 'sphinxsidebarwrapper'},
+    ),
+    (pages.DOCS_DOWNLOAD, extractors.DOWNLOADS_TABLE, 'table', {}),
+])
+def test_strained_region_unchanged(html, strainer, tag, attrs):
+    expected = full_soup(html).find(tag, attrs)
+    got = extractors.make_soup(html.encode(), strainer).find(tag, attrs)
+    assert str(got) == str(expected), (
+        'SoupStrainer должен сохранять нужную область страницы целиком'
+    )
+
+
+def test_modes_unchanged(site_session):
+    got = collect(main.latest_versions(site_session))
+    assert got == [
+        ('Ссылка на документацию', 'Версия', 'Статус'),
+        ('https://docs.python.org/3.13/', '3.13', 'in development'),
+        ('https://docs.python.org/3.12/', '3.12', 'stable'),
+        ('https://docs.python.org/2.7/', '2.7', 'EOL'),
+        ('https://www.python.org/doc/versions/', 'All versions', ''),
+    ]
+    got = collect(main.pep(site_session))
+    assert got[-1] == ('Total', len(pages.PEPS))
+
+
+ENGINE_FUNCTIONS = [
+    ('whats_new_links', pages.whats_new_index()),
+    ('whats_new_card', pages.whats_new_page('3.12')),
+    ('versions_links', pages.DOCS_MAIN),
+    ('pdf_a4_link', pages.DOCS_DOWNLOAD),
+    ('archive_links', pages.DOCS_DOWNLOAD),
+    ('pep_index', pages.pep_index()),
+] + [
+    (function, pages.pep_card(number, status, pep_type, created))
+    for number, _, status, pep_type, created in pages.PEPS
+    for function in ('pep_card',)
+]
+
+
+@pytest.mark.parametrize('function, html', ENGINE_FUNCTIONS)
+def test_xpath_engine_parity(function, html):
+    expected = getattr(extractors, function)(html.encode())
+    got = getattr(xpath_extractors, function)(html.encode())
+    assert got == expected, (
+        f'Функция `{function}` движка lxml должна возвращать то же, '
+        'что и движок BeautifulSoup'
+    )
+
+
+@pytest.mark.parametrize('function, html', [
+    ('whats_new_links', '<html><body></body></html>'),
+    ('pep_index', '<section id="numerical-index"></section>'),
+    ('pep_card', '<html><body><p>No card</p></body></html>'),
+])
+def test_xpath_engine_not_found(function, html):
+    with pytest.raises(BaseException) as excinfo:
+        getattr(xpath_extractors, function)(html.encode())
+    assert excinfo.typename == 'ParserFindTagException'
+
+
+def test_versions_not_found():
+    html = (
+        '<div class="sphinxsidebarwrapper"><ul><li>3.12</li></ul></div>'
+    ).encode()
+    for engine in (extractors, xpath_extractors):
+        with pytest.raises(BaseException) as excinfo:
+            engine.versions_links(html)
+        assert excinfo.typename == 'VersionsNotFound'
+
+
+@pytest.mark.parametrize('mode', ['whats-new', 'latest-versions', 'pep'])
+def test_modes_engine_parity(site_session, mode):
+    function = main.MODE_TO_FUNCTION[mode]
+    expected = collect(function(site_session, Namespace(engine='bs4')))
+    got = collect(function(site_session, Namespace(engine='lxml')))
+    assert got == expected, (
+        f'Режим `{mode}` должен возвращать одинаковый результат '
+        'для движков bs4 и lxml'
+    )
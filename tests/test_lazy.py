@@ -0,0 +1,97 @@
+import subprocess
+import sys
+
+from conftest import SRC_DIR
+try:
+    from src import lazy, main
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `lazy.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `lazy.py`'
+
+HEAVY_MODULES = ('requests_cache', 'requests', 'bs4', 'lxml', 'prettytable')
+
+
+def loaded_modules(code):
+    process = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return process.stdout.split()
+
+
+def test_lazy_import():
+    module = lazy.lazy_import('colorsys')
+    assert isinstance(module, lazy.LazyModule), (
+        'Ещё не загруженный модуль должен импортироваться при обращении'
+    )
+    assert module.rgb_to_hsv(1, 0, 0) == (0, 1, 1)
+    assert lazy.lazy_import('colorsys') is sys.modules['colorsys'], (
+        'Уже загруженный модуль должен возвращаться как есть'
+    )
+
+
+def test_mode_registry_resolves_on_access():
+    registry = lazy.ModeRegistry({
+        'pep': main.pep,
+        'hsv': 'colorsys:rgb_to_hsv',
+    })
+    assert dict.__getitem__(registry, 'hsv') == 'colorsys:rgb_to_hsv'
+    assert registry['pep'] is main.pep
+    assert registry['hsv'](1, 0, 0) == (0, 1, 1), (
+        'Режим по ссылке `модуль:функция` должен загружаться при обращении'
+    )
+    assert all(callable(function) for function in registry.values())
+    assert registry.get('missing') is None
+
+
+def test_main_import_is_light():
+    modules = loaded_modules(
+        'import sys, main; '
+        f'print(*[name for name in {HEAVY_MODULES} if name in sys.modules])'
+    )
+    assert modules == [], (
+        'Импорт `main.py` не должен загружать тяжёлые зависимости: '
+        f'{modules}'
+    )
+
+
+def test_local_mode_skips_session(tmp_path):
+    table_path = tmp_path / 'pep_table.bin'
+    main.PepTable().save(table_path)
+    modules = loaded_modules(
+        'import sys, main; '
+        f'sys.argv = ["main.py", "pep-table", "--pep-table", "{table_path}"]; '
+        'main.main(); '
+        f'print(*[name for name in {HEAVY_MODULES} if name in sys.modules])'
+    )
+    assert modules[-2:] == ['Total', '0']
+    assert 'requests_cache' not in modules, (
+        'Режиму с локальными данными не нужна сессия requests_cache'
+    )
+
+
+def test_mode_registry_entry_points(monkeypatch):
+    class EntryPoint:
+        name = 'pep'
+        value = 'colorsys:hls_to_rgb'
+
+    class PluginEntryPoint:
+        name = 'hsv'
+        value = 'colorsys:rgb_to_hsv'
+
+    def entry_points(group):
+        assert group == 'bs4_parser_pep.modes'
+        return [EntryPoint, PluginEntryPoint]
+
+    import importlib.metadata
+    monkeypatch.setattr(importlib.metadata, 'entry_points', entry_points)
+    registry = lazy.ModeRegistry(main.MODE_TO_FUNCTION)
+    registry.load_entry_points('bs4_parser_pep.modes')
+    assert registry['hsv'](1, 0, 0) == (0, 1, 1)
+    assert registry['pep'] is main.pep, (
+        'Точки входа не должны переопределять встроенные режимы'
+    )
@@ -0,0 +1,115 @@
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+import requests_mock
+
+try:
+    from src import limiter, utils
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `limiter.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `limiter.py`'
+
+URL = 'mock://peps.python.org/pep-0001/'
+
+
+def limited_session(responses, **kwargs):
+    inner = requests_mock.Adapter()
+    inner.register_uri('GET', URL, responses)
+    rate_limiter = limiter.RateLimiter(
+        rate=1000, backoff_base=0.001, **kwargs
+    )
+    session = requests.Session()
+    session.mount('mock://', limiter.LimitedAdapter(inner, rate_limiter))
+    return session, inner, rate_limiter
+
+
+def test_retry_after_and_success():
+    session, inner, rate_limiter = limited_session([
+        {'status_code': 503, 'headers': {'Retry-After': '0'}},
+        {'status_code': 429},
+        {'text': 'ok'},
+    ])
+    response = session.get(URL)
+    assert response.text == 'ok', (
+        'После ответов 503 и 429 запрос должен повторяться до успеха'
+    )
+    assert inner.call_count == 3
+    assert rate_limiter.failures == 2
+    assert rate_limiter.successes == 1
+
+
+def test_retries_exhausted():
+    session, inner, _ = limited_session(
+        [{'exc': requests.exceptions.ConnectionError}], retries=2
+    )
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get(URL)
+    assert inner.call_count == 3, (
+        'Запрос должен выполняться один раз и повторяться `retries` раз'
+    )
+
+    session, inner, _ = limited_session([{'status_code': 503}], retries=1)
+    assert session.get(URL).status_code == 503, (
+        'После последнего повтора должен возвращаться ответ сервера'
+    )
+    assert inner.call_count == 2
+
+
+def test_aimd():
+    rate_limiter = limiter.RateLimiter(rate=10, max_rate=12, max_concurrency=8)
+    rate_limiter.decrease('ответ 503')
+    assert rate_limiter.rate == 5
+    assert rate_limiter.concurrency == 4, (
+        'После сбоя темп и число одновременных запросов уменьшаются вдвое'
+    )
+    for _ in range(10):
+        rate_limiter.success(0.01)
+    assert rate_limiter.rate == 12, 'Темп не должен превышать max_rate'
+    assert 5 < rate_limiter.concurrency <= 8
+    rate_limiter.success(rate_limiter.slow_response + 1)
+    assert rate_limiter.rate == 6, (
+        'Медленный ответ должен считаться признаком перегрузки'
+    )
+    for _ in range(20):
+        rate_limiter.decrease('ConnectionError')
+    assert rate_limiter.rate == limiter.MIN_RATE
+    assert rate_limiter.concurrency == 1
+
+
+def test_pacing():
+    rate_limiter = limiter.RateLimiter(rate=20, max_rate=20)
+    start = time.monotonic()
+    for _ in range(5):
+        with rate_limiter.slot():
+            pass
+    assert time.monotonic() - start >= 0.2, (
+        'Запросы должны идти не чаще заданного темпа'
+    )
+
+
+def test_retry_after_date():
+    header = formatdate(time.time() + 60, usegmt=True)
+    response = requests.Response()
+    response.headers['Retry-After'] = header
+    assert 55 < limiter.retry_after(response) <= 60
+    response.headers['Retry-After'] = 'soon'
+    assert limiter.retry_after(response) is None
+
+
+def test_crawl_survives_failed_page(mock_session):
+    failing = 'https://peps.python.org/pep-0008/'
+    with requests_mock.Mocker() as mock:
+        mock.get(URL.replace('mock', 'https'), text='ok')
+        mock.get(failing, exc=requests.exceptions.ConnectionError)
+        results = list(utils.crawl(
+            mock_session,
+            [URL.replace('mock', 'https'), failing],
+            lambda html: html.decode(),
+            workers=2,
+        ))
+    assert results == ['ok', None], (
+        'Недоступная страница не должна прерывать обход остальных'
+    )
@@ -1,5 +1,9 @@
+import logging
 import pytest
+from argparse import Namespace
 from pathlib import Path
+
+from conftest import collect
 try:
     from src import main
 except ModuleNotFoundError:
@@ -31,11 +35,15 @@ def test_main_file():
 
 
 def test_whats_new(mock_session):
-    got = main.whats_new(mock_session)
+    results = main.whats_new(mock_session)
     header = ('Ссылка на статью', 'Заголовок', 'Редактор, Автор')
-    assert isinstance(got, list), (
-        'Функция `whats_new` должна возвращать объект типа `list`'
+    assert isinstance(results, main.Results), (
+        'Функция `whats_new` должна возвращать объект типа `Results`'
     )
+    assert results.header == header, (
+        'Заголовки результатов `whats_new` передаются в `Results.header`'
+    )
+    got = collect(results)
     assert len(got) > 0, (
         'Убедитесь что функция `whats_new` модуля `main.py` '
         'возвращает непустой список'
@@ -53,7 +61,7 @@ def test_whats_new(mock_session):
 
 @pytest.mark.skip()
 def test_latest_versions(mock_session):
-    got = main.latest_versions(mock_session)
+    got = collect(main.latest_versions(mock_session))
     assert isinstance(got, list), (
         'Функция `latest_versions` должна возвращать объект типа `list`'
     )
@@ -123,7 +131,10 @@ def test_mode_to_function():
             f'{name_func} - это строка.'
         )
         assert (
-            name_func in ['whats-new', 'latest-versions', 'download', 'pep']
+            name_func in [
+                'whats-new', 'latest-versions', 'download', 'mirror', 'pep',
+                'cache-stats', 'pep-table', 'serve', 'watch',
+            ]
         ), (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет ключа `{name_func}`'
@@ -134,9 +145,132 @@ def test_mode_to_function():
         )
         assert (
             func.__name__ in [
-                'whats_new', 'latest_versions', 'download', 'pep'
+                'whats_new', 'latest_versions', 'download', 'mirror', 'pep',
+                'cache_stats', 'pep_table', 'serve', 'watch',
             ]
         ), (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+@pytest.mark.parametrize('workers, processes', [(1, 1), (4, 1), (1, 2)])
+def test_pep_workers(site_session, caplog, workers, processes):
+    cli_args = Namespace(mode='pep', workers=workers, processes=processes)
+    with caplog.at_level(logging.INFO):
+        got = collect(main.pep(site_session, cli_args))
+    expected = [
+        ('Status', 'Count'),
+        ('Active', 4),
+        ('Final', 4),
+        ('April Fool!', 1),
+        ('Rejected', 1),
+        ('Deferred', 1),
+        ('Draft', 1),
+        ('Superseded', 1),
+        ('Withdrawn', 1),
+        ('Provisional', 1),
+        ('Accepted', 1),
+        ('Total', 16),
+    ]
+    assert got == expected, (
+        'Результат функции `pep` не должен зависеть от числа потоков '
+        'и процессов'
+    )
+    mismatches = [
+        record for record in caplog.records
+        if 'Несовпадающие статусы' in record.getMessage()
+    ]
+    assert len(mismatches) == 1 and 'pep-0401/' in mismatches[0].getMessage()
+
+
+def test_whats_new_processes(site_session):
+    sequential = collect(main.whats_new(site_session))
+    parallel = collect(main.whats_new(
+        site_session, Namespace(mode='whats-new', workers=2, processes=2)
+    ))
+    assert parallel == sequential, (
+        'Разбор страниц в пуле процессов должен давать тот же результат'
+    )
+    assert sequential[1] == (
+        'https://docs.python.org/3/whatsnew/3.12.html',
+        'What’s New In Python 3.12¶',
+        'Editor:Editor 3.12 ',
+    )
+
+
+def test_download_streaming(monkeypatch, tmp_path, site_session):
+    from tests.fixture_data.pages import ARCHIVE_CONTENT
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    assert main.download(site_session) is None
+    archive = tmp_path / 'downloads' / 'python-3.12.0-docs-pdf-a4.zip'
+    assert archive.read_bytes() == ARCHIVE_CONTENT
+
+
+def test_pep_incremental(monkeypatch, tmp_path):
+    from requests_cache import CachedSession
+    import requests_mock
+    from tests.fixture_data import pages
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    cli_args = Namespace(mode='pep', incremental=True)
+
+    def run(peps):
+        with requests_mock.Mocker() as mock:
+            pages.register_site(mock, peps=peps)
+            got = collect(
+                main.pep(CachedSession(backend='memory'), cli_args)
+            )
+            cards = [
+                request.url for request in mock.request_history
+                if '/pep-' in request.url
+            ]
+        return got, cards
+
+    full, cards = run(pages.PEPS)
+    assert len(cards) == len(pages.PEPS)
+    with requests_mock.Mocker() as mock:
+        pages.register_site(mock)
+        expected = collect(main.pep(CachedSession(backend='memory')))
+    assert full == expected, (
+        'Первый инкрементальный запуск должен совпадать с полным'
+    )
+
+    changed = [
+        (703, 'SA', 'Accepted', 'Standards Track', '09-Jan-2023'),
+        (3999, 'S', 'Draft', 'Standards Track', '01-Jan-2026'),
+    ]
+    peps = [pep for pep in pages.PEPS if pep[0] not in (703, 248)] + changed
+    got, cards = run(peps)
+    assert sorted(cards) == [
+        'https://peps.python.org/pep-0703/',
+        'https://peps.python.org/pep-3999/',
+    ], 'Инкрементальный режим должен загружать только изменившиеся PEP'
+    assert dict(got[1:])['Total'] == len(peps)
+    assert dict(got[1:])['Accepted'] == 2
+    assert 'Withdrawn' not in dict(got[1:]), (
+        'PEP, пропавшие из индекса, должны удаляться из состояния'
+    )
+
+
+def test_selected_modes():
+    assert main.selected_modes(['pep', 'all', 'pep']) == [
+        'pep', 'whats-new', 'latest-versions'
+    ], 'Режим `all` должен раскрываться, повторы режимов - отбрасываться'
+
+
+def test_run_modes(site_session, capsys):
+    args = Namespace(mode=['all'], output=None, workers=2, processes=1)
+    main.run_modes(site_session, args, main.selected_modes(args.mode))
+    out = capsys.readouterr().out
+    headers = [
+        out.index('Ссылка на статью'),
+        out.index('Ссылка на документацию'),
+        out.index('Status Count'),
+    ]
+    assert headers == sorted(headers), (
+        'Результаты режимов должны выводиться по очереди в порядке режимов'
+    )
+    assert 'Total 16' in out
+    assert len(site_session.memo) == 1 + 4 + 1 + 1 + 16, (
+        'Извлечённые данные всех страниц должны попадать в общую память'
+    )
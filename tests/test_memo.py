@@ -0,0 +1,67 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+try:
+    from src import memo
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `memo.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `memo.py`'
+
+
+def test_single_flight():
+    documents = memo.DocumentMemo()
+    calls = []
+    lock = threading.Lock()
+
+    def compute():
+        with lock:
+            calls.append(1)
+        time.sleep(0.05)
+        return ('PEP 1', 'Active')
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(
+            lambda _: documents.get_or_compute(('url', 'pep'), compute),
+            range(4),
+        ))
+    assert results == [('PEP 1', 'Active')] * 4
+    assert len(calls) == 1, (
+        'Одновременные запросы одной записи должны вычислять её один раз'
+    )
+
+
+def test_failure_not_memoized():
+    documents = memo.DocumentMemo()
+
+    def fail():
+        raise ValueError('нет тега')
+
+    with pytest.raises(ValueError):
+        documents.get_or_compute('key', fail)
+    assert documents.get_or_compute('key', lambda: 1) == 1, (
+        'Неудачное вычисление не должно сохраняться в памяти'
+    )
+
+
+def test_timed_memo_expires():
+    results = memo.TimedMemo(ttl=60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert results.get_or_compute('pep', compute) == 1
+    assert results.get_or_compute('pep', compute) == 1, (
+        'До истечения срока результат должен отдаваться из памяти'
+    )
+    results.ttl = 0
+    assert results.get_or_compute('latest', compute) == 2
+    assert results.get_or_compute('latest', compute) == 3, (
+        'Устаревший результат должен вычисляться заново'
+    )
+    assert len(results) == 2
@@ -0,0 +1,80 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tests.fixture_data import pages
+try:
+    from src import extractors, memory, utils
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `memory.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `memory.py`'
+
+
+def run_ordered_map(throttle):
+    active = []
+    peak = {}
+    lock = threading.Lock()
+
+    def work(item):
+        with lock:
+            active.append(item)
+            peak[item] = len(active)
+        time.sleep(0.01)
+        with lock:
+            active.remove(item)
+        return item * 10
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(utils.ordered_map(
+            lambda item: executor.submit(work, item), range(12), 4, throttle
+        ))
+    return results, peak
+
+
+def test_ordered_map_throttle():
+    results, peak = run_ordered_map(None)
+    assert results == [item * 10 for item in range(12)]
+    assert max(peak.values()) > 1
+
+    results, peak = run_ordered_map(lambda: True)
+    assert results == [item * 10 for item in range(12)], (
+        'Торможение обхода не должно терять и переставлять результаты'
+    )
+    # задачи первого окна уже в работе, новые идут по одной
+    assert max(peak[item] for item in range(4, 12)) == 1, (
+        'У предела памяти новые задачи должны выполняться по одной'
+    )
+
+
+def test_memory_ceiling():
+    assert memory.current_memory() > 0
+    assert memory.peak_memory() > 0
+    assert memory.MemoryCeiling(1).over(), (
+        'Память процесса выше предела должна тормозить обход'
+    )
+    assert not memory.MemoryCeiling(1024**5).over()
+    assert 'предел 1024.0 МБ' in memory.MemoryCeiling(1024**3).describe()
+
+
+def test_crawl_with_ceiling(site_session):
+    urls = [
+        f'https://peps.python.org/pep-{pep[0]:04d}/' for pep in pages.PEPS
+    ]
+    expected = list(utils.crawl(site_session, urls, extractors.pep_card))
+    site_session.memory = memory.MemoryCeiling(1)
+    got = list(utils.crawl(site_session, urls, extractors.pep_card))
+    assert got == expected, (
+        'Обход у предела памяти должен возвращать те же данные'
+    )
+
+
+def test_parsed_releases_tree():
+    with extractors.parsed(pages.DOCS_DOWNLOAD.encode()) as soup:
+        assert soup.find('table') is not None
+    assert soup.decomposed, (
+        'Дерево BeautifulSoup должно разрушаться после извлечения данных'
+    )
+    assert type(extractors.pep_card(pages.pep_card(
+        8, 'Active', 'Process', '05-Jul-2001'
+    ).encode())[0]) is str
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor
+
+import requests_mock
+from requests_cache import CachedSession
+
+from conftest import collect
+from tests.fixture_data import pages
+try:
+    from src import main, mirror
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `mirror.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `mirror.py`'
+
+VERSIONS = ('3.13', '3.12', '2.7')
+ARCHIVES = re.compile(r'https://docs\.python\.org/[\d.]+/archives/.+')
+
+
+def register_mirror(mock, etags):
+    pages.register_site(mock)
+    for version in VERSIONS:
+        mock.get(
+            f'https://docs.python.org/{version}/download.html',
+            text=pages.DOCS_DOWNLOAD,
+        )
+
+    def etag(request):
+        return etags.get(request.url.split('/')[3], '"v1"')
+
+    def archive(request, context):
+        context.headers['ETag'] = etag(request)
+        return pages.ARCHIVE_CONTENT
+
+    def head(request, context):
+        context.headers['ETag'] = etag(request)
+        return b''
+
+    mock.get(ARCHIVES, content=archive)
+    mock.head(ARCHIVES, content=head)
+
+
+def run_mirror(cli_args, etags=None):
+    with requests_mock.Mocker() as mock:
+        register_mirror(mock, etags or {})
+        got = collect(main.mirror(CachedSession(backend='memory'), cli_args))
+        downloads = [
+            request.url for request in mock.request_history
+            if request.method == 'GET' and ARCHIVES.match(request.url)
+        ]
+    return got, downloads
+
+
+def test_host_limits():
+    limits = mirror.HostLimits(2)
+    active = {'a.org': 0, 'b.org': 0}
+    peak = {'a.org': 0, 'b.org': 0}
+    lock = threading.Lock()
+
+    def download(host):
+        with limits.slot(f'https://{host}/archive.zip'):
+            with lock:
+                active[host] += 1
+                peak[host] = max(peak[host], active[host])
+            time.sleep(0.02)
+            with lock:
+                active[host] -= 1
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(download, ['a.org'] * 6 + ['b.org'] * 6))
+    assert peak == {'a.org': 2, 'b.org': 2}, (
+        'Одновременных загрузок с одного хоста не должно быть больше предела'
+    )
+
+
+def test_mirror(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    cli_args = Namespace(
+        mode='mirror', workers=4, host_concurrency=2,
+        formats=['pdf-a4', 'epub'],
+    )
+    got, downloads = run_mirror(cli_args)
+    assert got[0] == ('Версия', 'Формат', 'Результат', 'Файл')
+    assert [row[:3] for row in got[1:]] == [
+        (version, archive_format, 'downloaded')
+        for version in VERSIONS
+        for archive_format in ('pdf-a4', 'epub')
+    ]
+    assert len(downloads) == 6
+    assert got[1][3] == '3.13/python-3.12.0-docs-pdf-a4.zip', (
+        'В строках результата путь к архиву должен быть строкой'
+    )
+    archive = tmp_path / 'mirror' / '3.13' / 'python-3.12.0-docs-pdf-a4.zip'
+    assert archive.read_bytes() == pages.ARCHIVE_CONTENT
+
+    manifest = json.loads(
+        (tmp_path / 'mirror' / 'manifest.json').read_text()
+    )
+    entry = manifest[
+        'https://docs.python.org/2.7/archives/python-3.12.0-docs.epub'
+    ]
+    assert entry['etag'] == '"v1"'
+    assert entry['size'] == len(pages.ARCHIVE_CONTENT)
+    assert entry['path'] == '2.7/python-3.12.0-docs.epub'
+    assert entry['sha256'] == hashlib.sha256(pages.ARCHIVE_CONTENT).hexdigest()
+    objects = [
+        path for path in (tmp_path / 'mirror' / 'objects').rglob('*')
+        if path.is_file()
+    ]
+    assert len(objects) == 1, (
+        'Одинаковые архивы разных версий должны храниться один раз'
+    )
+    assert archive.samefile(
+        tmp_path / 'mirror' / '2.7' / 'python-3.12.0-docs.epub'
+    )
+
+    got, downloads = run_mirror(cli_args, etags={'3.12': '"v2"'})
+    assert {row[0]: row[2] for row in got[1:]} == {
+        '3.13': 'unchanged', '3.12': 'downloaded', '2.7': 'unchanged',
+    }, 'Неизменившиеся архивы не должны загружаться повторно'
+    assert len(downloads) == 2
+
+
+def test_session_concurrency():
+    parser = main.configure_argument_parser(list(main.MODE_TO_FUNCTION))
+    args = parser.parse_args(['mirror', '--host-concurrency', '3'])
+    assert main.session_concurrency(args) == 3, (
+        'Пул соединений должен вмещать все загрузки с одного хоста'
+    )
+    args = parser.parse_args(['pep', '--processes', '4'])
+    assert main.session_concurrency(args) == 4
+    args = parser.parse_args(['pep', '--host-concurrency', '3'])
+    assert main.session_concurrency(args) == 1
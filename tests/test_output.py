@@ -90,3 +90,135 @@ def test_output_file():
     assert hasattr(outputs, 'file_output'), (
         'Напишите функцию `file_output` в модуле `output.py`'
     )
+
+
+def test_file_output_streaming(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    header = ('Status', 'Count')
+
+    def rows():
+        yield ('Active', 1)
+        written = next((tmp_path / 'results').glob('*.csv')).read_text()
+        assert '"Active","1"' in written, (
+            'Строки должны записываться в файл по мере поступления'
+        )
+        yield ('Final', 2)
+        raise RuntimeError('Сбой посреди обхода')
+
+    with pytest.raises(RuntimeError):
+        outputs.control_output(
+            outputs.Results(header, rows()), cli_args('pep', 'file')
+        )
+    written = next((tmp_path / 'results').glob('*.csv')).read_text()
+    assert written.splitlines() == [
+        '"Status","Count"', '"Active","1"', '"Final","2"'
+    ], 'При сбое в файле должна остаться уже полученная часть результатов'
+
+
+def test_default_output_streaming(capsys):
+    def rows():
+        yield ('Active', 1)
+        assert 'Active 1' in capsys.readouterr().out
+        yield ('Total', 1)
+
+    outputs.control_output(
+        outputs.Results(('Status', 'Count'), rows()), cli_args('pep', None)
+    )
+    assert 'Total 1' in capsys.readouterr().out
+
+
+def test_jsonl_output(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    outputs.control_output(
+        outputs.Results(('Status', 'Count'), iter([('Active', 4)])),
+        cli_args('pep', 'jsonl'),
+    )
+    (path,) = (tmp_path / 'results').glob('pep_*.jsonl')
+    assert path.read_text(encoding='utf-8').splitlines() == [
+        '{"Status": "Active", "Count": 4}'
+    ], 'Каждая строка JSON Lines должна быть объектом с полями заголовка'
+
+
+def test_csv_gz_output(monkeypatch, tmp_path):
+    import gzip
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    rows = [(f'https://peps.python.org/pep-{n:04d}/', n) for n in range(500)]
+    outputs.control_output(
+        outputs.Results(('Ссылка', 'Номер'), iter(rows)),
+        cli_args('pep', 'csv.gz'),
+    )
+    (path,) = (tmp_path / 'results').glob('pep_*.csv.gz')
+    lines = gzip.decompress(path.read_bytes()).decode().splitlines()
+    assert lines[0] == '"Ссылка","Номер"'
+    assert lines[-1] == '"https://peps.python.org/pep-0499/","499"'
+    assert path.stat().st_size < len('\n'.join(lines)) / 4, (
+        'Результаты в csv.gz должны храниться сжатыми'
+    )
+
+
+def test_sqlite_output(monkeypatch, tmp_path):
+    import sqlite3
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    monkeypatch.setattr(outputs, 'SQLITE_BATCH_SIZE', 7)
+    header = ('Ссылка на статью', 'Заголовок', 'Редактор, Автор')
+    rows = [(f'{n}.html', f'What’s New {n}', 'Editor') for n in range(20)]
+    for _ in range(2):
+        outputs.control_output(
+            outputs.Results(header, iter(rows)),
+            cli_args('whats-new', 'sqlite'),
+        )
+
+    with sqlite3.connect(tmp_path / 'results' / 'results.sqlite') as db:
+        columns = [
+            column[1] for column in db.execute('PRAGMA table_info(whats_new)')
+        ]
+        got = db.execute(
+            'SELECT "Ссылка на статью", "Заголовок", "Редактор, Автор" '
+            'FROM whats_new'
+        ).fetchall()
+    assert columns == ['run_at', *header], (
+        'Таблица должна называться по режиму и иметь столбцы из заголовка'
+    )
+    assert got == rows * 2, (
+        'Каждый запуск должен добавлять все строки результатов в таблицу'
+    )
+
+
+def test_sqlite_output_new_columns(monkeypatch, tmp_path):
+    import sqlite3
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    outputs.control_output(
+        outputs.Results(('card_status', 'count'), [('Active', 3)]),
+        cli_args('pep-table', 'sqlite'),
+    )
+    outputs.control_output(
+        outputs.Results(('type', 'year', 'count'), [('Process', '2000', 2)]),
+        cli_args('pep-table', 'sqlite'),
+    )
+    with sqlite3.connect(tmp_path / 'results' / 'results.sqlite') as db:
+        got = db.execute(
+            'SELECT card_status, type, year, count FROM pep_table'
+        ).fetchall()
+    assert got == [('Active', None, None, 3), (None, 'Process', '2000', 2)], (
+        'Столбцы нового заголовка должны добавляться в таблицу режима'
+    )
+
+
+def test_sqlite_output_streaming(monkeypatch, tmp_path):
+    import sqlite3
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+
+    def events():
+        yield ('2026-01-01T00:00:00', 'pep-new', 'PEP 1', '', 'Draft')
+        raise KeyboardInterrupt
+
+    header = ('Время', 'Событие', 'Объект', 'Было', 'Стало')
+    with pytest.raises(KeyboardInterrupt):
+        outputs.control_output(
+            outputs.Results(header, events()), cli_args('watch', 'sqlite')
+        )
+    with sqlite3.connect(tmp_path / 'results' / 'results.sqlite') as db:
+        got = db.execute('SELECT "Объект" FROM watch').fetchall()
+    assert got == [('PEP 1',)], (
+        'События watch должны сохраняться в базу сразу после получения'
+    )
@@ -0,0 +1,72 @@
+import logging
+from argparse import Namespace
+
+import requests_mock
+from requests_cache import CachedSession
+
+from conftest import collect
+from tests.fixture_data import pages
+try:
+    from src import main, pep_api
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_api.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_api.py`'
+
+
+def run_pep(cli_args, peps=pages.PEPS, api_peps=pages.PEPS):
+    with requests_mock.Mocker() as mock:
+        pages.register_site(mock, peps=peps)
+        mock.get(
+            'https://peps.python.org/api/peps.json',
+            text=pages.peps_api(api_peps),
+        )
+        got = collect(main.pep(CachedSession(backend='memory'), cli_args))
+        urls = [request.url for request in mock.request_history]
+    return got, urls
+
+
+def test_api_peps():
+    got = pep_api.api_peps(pages.peps_api().encode())
+    assert got[0] == ('A', 'pep-0001/', ('Active', 'Process', '13-Jun-2000'))
+    assert [href for _, href, _ in got] == sorted(
+        f'pep-{pep[0]:04d}/' for pep in pages.PEPS
+    ), 'PEP из API должны идти по возрастанию номера'
+    assert dict((href, code) for code, href, _ in got)['pep-0401/'] == 'R'
+
+
+def test_pep_source_api(caplog):
+    html, _ = run_pep(Namespace(mode='pep', source='html'))
+    with caplog.at_level(logging.INFO):
+        got, urls = run_pep(Namespace(mode='pep', source='api'))
+    assert urls == ['https://peps.python.org/api/peps.json'], (
+        'Режим `pep --source api` должен обходиться одним запросом'
+    )
+    assert got[0] == ('Status', 'Count')
+    assert dict(got[1:]) == dict(html[1:]), (
+        'Подсчёт по API должен совпадать с подсчётом по карточкам'
+    )
+    assert 'pep-0401/' in caplog.text
+
+
+def test_verify_sample(caplog):
+    api_peps = [
+        (703, 'SA', 'Accepted', 'Standards Track', '09-Jan-2023')
+        if pep[0] == 703 else pep
+        for pep in pages.PEPS
+    ]
+    cli_args = Namespace(
+        mode='pep', source='api', verify_sample=len(pages.PEPS)
+    )
+    with caplog.at_level(logging.INFO):
+        got, urls = run_pep(cli_args, api_peps=api_peps)
+    assert len(urls) == 1 + len(pages.PEPS)
+    assert dict(got[1:])['Accepted'] == 2
+    warnings = [
+        record.getMessage() for record in caplog.records
+        if record.levelno == logging.WARNING
+    ]
+    assert len(warnings) == 1 and 'pep-0703/' in warnings[0], (
+        'Расхождение статуса в API и карточке должно попадать в лог'
+    )
+    assert 'проверено 16, расхождений 1' in caplog.text
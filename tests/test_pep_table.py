@@ -0,0 +1,61 @@
+from argparse import Namespace
+
+try:
+    from src import main, pep_table
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_table.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `pep_table.py`'
+from conftest import collect
+from tests.fixture_data.pages import PEPS
+
+
+def make_table():
+    index_rows = [
+        (abbr[1:], f'pep-{number:04d}/') for number, abbr, *_ in PEPS
+    ]
+    cards = [card for _, _, *card in PEPS]
+    return main.build_pep_table(index_rows, cards)
+
+
+def test_group_by():
+    table = make_table()
+    assert len(table) == len(PEPS)
+    assert table.group_by('type') == {
+        ('Process',): 5, ('Informational',): 4, ('Standards Track',): 7,
+    }
+    by_year = table.group_by('year')
+    assert by_year[(2006,)] == 3 and sum(by_year.values()) == len(PEPS), (
+        'Группировка по году должна учитывать дату создания каждого PEP'
+    )
+    assert table.group_by('index_code', 'card_status')[('A', 'Active')] == 4
+    assert table.mismatches() == [(401, 'R', 'April Fool!')], (
+        'Сверка статусов должна находить PEP с неожиданным статусом'
+    )
+
+
+def test_save_load(tmp_path):
+    table = make_table()
+    path = tmp_path / 'peps.table'
+    table.save(path)
+    loaded = pep_table.PepTable.load(path)
+    assert loaded.columns == table.columns
+    assert loaded.dictionaries == table.dictionaries
+    assert loaded.group_by('card_status') == table.group_by('card_status')
+    assert path.stat().st_size < 1024, (
+        'Таблица должна храниться в компактном двоичном формате'
+    )
+
+
+def test_pep_table_mode(site_session, tmp_path):
+    path = tmp_path / 'peps.table'
+    got = collect(main.pep(site_session, Namespace(pep_table=path)))
+    assert got[-1] == ('Total', len(PEPS))
+
+    cli_args = Namespace(pep_table=path, group_by=['type', 'card_status'])
+    report = collect(main.pep_table(None, cli_args))
+    assert report[0] == ('type', 'card_status', 'count')
+    assert ('Standards Track', 'Final', 3) in report
+    assert report[-1] == ('Total', '', len(PEPS)), (
+        'Отчёт по сохранённой таблице не должен требовать обхода карточек'
+    )
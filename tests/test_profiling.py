@@ -0,0 +1,89 @@
+import json
+import time
+from argparse import Namespace
+
+import pytest
+
+from tests.fixture_data.pages import PEPS
+
+try:
+    from src import main
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `main.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `main.py`'
+
+# модули src импортируют профилировщик без префикса пакета
+profiling = main.profiling
+
+
+@pytest.fixture
+def profiler():
+    yield profiling.enable()
+    profiling.disable()
+
+
+def test_nested_phases_exclusive(profiler):
+    with profiler.phase('outer'):
+        time.sleep(0.02)
+        with profiler.phase('inner'):
+            time.sleep(0.05)
+    assert profiler.phases['inner'] >= 0.05, (
+        'Время вложенной фазы должно учитываться полностью'
+    )
+    assert profiler.phases['outer'] < 0.05, (
+        'Время вложенной фазы не должно входить во время внешней фазы'
+    )
+
+
+def test_disabled_profiler_is_noop():
+    profiling.disable()
+    rows = [(1,), (2,)]
+    assert profiling.iterate('rows', rows) is rows, (
+        'Без профилирования строки результатов не должны оборачиваться'
+    )
+    with profiling.phase('parse'):
+        profiling.count('cache_hits')
+    assert profiling.get_profiler() is None
+
+
+@pytest.mark.parametrize('engine', list(main.ENGINES))
+def test_pep_profile(site_session, profiler, engine, capsys, tmp_path):
+    cli_args = Namespace(
+        mode='pep', output=None, workers=2, processes=1, engine=engine
+    )
+    with profiling.phase('mode'):
+        results = main.pep(site_session, cli_args)
+    main.control_output(results, cli_args)
+    main.control_output(main.pep(site_session, cli_args), cli_args)
+    capsys.readouterr()
+
+    summary = profiler.summary()
+    pages = 1 + len(PEPS)
+    assert summary['counters']['cache_misses'] == pages, (
+        'Первый прогон должен загрузить индекс и все карточки PEP из сети'
+    )
+    assert summary['counters']['cache_hits'] == pages, (
+        'Повторный прогон должен взять все страницы из кеша'
+    )
+    assert summary['cache_hit_ratio'] == 0.5
+    assert summary['counters']['bytes_transferred'] > 0
+    for phase in ('network', 'cache', 'parse', 'extract', 'output', 'rows'):
+        assert phase in summary['phases'], (
+            f'В отчёте профилирования нет фазы {phase}'
+        )
+    assert summary['phases']['parse']['calls'] == 2 * pages
+    card = summary['requests']['https://peps.python.org/pep-0001/']
+    assert {'network', 'cache', 'extract', 'bytes'} <= set(card), (
+        'В отчёте должно быть время фаз для каждого запроса'
+    )
+
+    report_path = tmp_path / 'profile.json'
+    profiling.report(report_path)
+    report = json.loads(report_path.read_text(encoding='utf-8'))
+    assert report['counters'] == summary['counters'], (
+        'JSON-отчёт должен содержать счётчики профилирования'
+    )
+    assert 'network' in capsys.readouterr().err, (
+        'Сводка профилирования должна выводиться в stderr'
+    )
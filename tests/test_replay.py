@@ -0,0 +1,91 @@
+import json
+import time
+from argparse import Namespace
+
+import requests_mock
+from requests_cache import CachedSession
+
+from conftest import collect
+from tests.fixture_data.pages import register_site
+
+try:
+    from src import main, replay, utils
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `replay.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `replay.py`'
+
+PEP_URL = 'https://peps.python.org/pep-0001/'
+
+
+def replay_session(corpus, **kwargs):
+    session = CachedSession(backend='memory')
+    session.mount('https://', replay.ReplayAdapter(corpus, **kwargs))
+    return session
+
+
+def record(session, corpus, fetch):
+    """Запись ответов, полученных `fetch(session)`, с сайта из фикстур."""
+    session.recorder = replay.Recorder(corpus)
+    with requests_mock.Mocker() as mocker:
+        register_site(mocker)
+        result = fetch(session)
+    session.recorder.close()
+    return result
+
+
+def test_record_and_replay_pep(tempfile_session, tmp_path):
+    cli_args = Namespace(mode='pep', workers=4, processes=1)
+    recorded = record(
+        tempfile_session,
+        tmp_path,
+        lambda session: collect(main.pep(session, cli_args)),
+    )
+    assert (tmp_path / 'index.json').exists(), (
+        'Индекс корпуса должен сохраняться в index.json'
+    )
+    replayed = collect(main.pep(replay_session(tmp_path), cli_args))
+    assert replayed == recorded, (
+        'Режим на воспроизведённом корпусе должен давать те же результаты'
+    )
+
+
+def test_replay_conditional_and_missing(tempfile_session, tmp_path):
+    record(
+        tempfile_session,
+        tmp_path,
+        lambda session: utils.get_response(session, PEP_URL),
+    )
+    index_path = tmp_path / 'index.json'
+    index = json.loads(index_path.read_text(encoding='utf-8'))
+    index[PEP_URL]['headers']['ETag'] = '"v1"'
+    index_path.write_text(json.dumps(index), encoding='utf-8')
+
+    session = replay_session(tmp_path)
+    response = session.get(PEP_URL, headers={'If-None-Match': '"v1"'})
+    assert response.status_code == 304, (
+        'На условный запрос с тем же ETag корпус должен отвечать 304'
+    )
+    missing = session.get('https://peps.python.org/pep-9999/')
+    assert missing.status_code == 404, (
+        'Для страниц вне корпуса должен возвращаться 404'
+    )
+
+
+def test_replay_latency_and_bandwidth(tempfile_session, tmp_path):
+    response = record(
+        tempfile_session,
+        tmp_path,
+        lambda session: utils.get_response(session, PEP_URL),
+    )
+    size = len(response.content)
+
+    start = time.perf_counter()
+    replayed = replay_session(
+        tmp_path, latency=0.05, bandwidth=size * 10
+    ).get(PEP_URL)
+    elapsed = time.perf_counter() - start
+    assert replayed.content == response.content
+    assert elapsed >= 0.15, (
+        'Ответ должен задерживаться на latency и время передачи тела'
+    )
@@ -0,0 +1,92 @@
+import requests_mock
+
+from conftest import collect
+
+try:
+    from src import main, results_cache, utils
+except ModuleNotFoundError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `results_cache.py`'
+    )
+except ImportError:
+    assert False, (
+        'Убедитесь что в директории `src` есть файл `results_cache.py`'
+    )
+
+URLS = [f'https://peps.python.org/pep-{number:04d}/' for number in (1, 8)]
+
+
+def test_results_cache_skips_parsing(mock_session, tmp_path):
+    mock_session.results_cache = results_cache.ResultsCache(
+        tmp_path / 'results.sqlite'
+    )
+    calls = []
+
+    def extract(html):
+        calls.append(html)
+        return len(html), html[:3].decode()
+
+    with requests_mock.Mocker() as mock:
+        for url in URLS:
+            mock.get(url, content=b'<p>' + url.encode())
+        first = list(utils.crawl(mock_session, URLS, extract))
+        second = list(utils.crawl(mock_session, URLS, extract))
+        assert second == first and len(calls) == len(URLS), (
+            'Повторный разбор неизменившихся страниц должен '
+            'пропускаться'
+        )
+
+        mock.get(URLS[0], content=b'<p>changed')
+        mock_session.cache.clear()
+        third = list(utils.crawl(mock_session, URLS, extract))
+    assert third[0] == (len(b'<p>changed'), '<p>')
+    assert len(calls) == len(URLS) + 1, (
+        'Запись кеша должна обновляться при изменении ответа'
+    )
+
+
+def test_results_cache_version(monkeypatch, mock_session, tmp_path):
+    mock_session.results_cache = results_cache.ResultsCache(
+        tmp_path / 'results.sqlite'
+    )
+    calls = []
+
+    def extract(html):
+        calls.append(html)
+        return html.decode()
+
+    with requests_mock.Mocker() as mock:
+        mock.get(URLS[0], content=b'<p>pep')
+        list(utils.crawl(mock_session, URLS[:1], extract))
+        monkeypatch.setattr(
+            utils, 'RESULTS_CACHE_VERSION', utils.RESULTS_CACHE_VERSION + 1
+        )
+        list(utils.crawl(mock_session, URLS[:1], extract))
+    assert len(calls) == 2, (
+        'Записи прежней версии кеша извлечённых данных '
+        'не должны использоваться'
+    )
+
+
+def test_results_cache_etag(tmp_path):
+    cache = results_cache.ResultsCache(tmp_path / 'results.sqlite')
+    cache.set(URLS[0], 'extractor', 'ETag: "v1"', ('Active', 'abc'))
+    assert cache.get(URLS[0], 'extractor', 'ETag: "v1"') == ('Active', 'abc')
+    assert cache.get(URLS[0], 'extractor', 'ETag: "v2"') is None
+    cache.clear()
+    assert cache.get(URLS[0], 'extractor', 'ETag: "v1"') is None
+
+
+def test_pep_with_results_cache(site_session, tmp_path):
+    expected = collect(main.pep(site_session))
+    site_session.results_cache = results_cache.ResultsCache(
+        tmp_path / 'results.sqlite'
+    )
+    assert collect(main.pep(site_session)) == expected
+    assert collect(main.pep(site_session)) == expected, (
+        'Результаты из кеша извлечённых данных должны совпадать '
+        'с результатами разбора'
+    )
+    assert utils.extractor_name(main.extractors.pep_card) == (
+        'extractors.pep_card'
+    )
@@ -0,0 +1,94 @@
+import hashlib
+import json
+from argparse import Namespace
+
+import requests_mock
+from requests_cache import CachedSession
+
+from tests.fixture_data import pages
+try:
+    from src import main, store
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `store.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `store.py`'
+
+ARCHIVE_URL = (
+    'https://docs.python.org/3/archives/python-3.12.0-docs-pdf-a4.zip'
+)
+NEW_DIGEST = hashlib.sha256(b'new archive').hexdigest()
+
+
+def run_download(etag='"archive"', content=pages.ARCHIVE_CONTENT):
+    with requests_mock.Mocker() as mock:
+        pages.register_site(mock)
+        mock.get(ARCHIVE_URL, content=content, headers={'ETag': etag})
+        mock.head(ARCHIVE_URL, headers={'ETag': etag})
+        main.download(CachedSession(backend='memory'), Namespace())
+        return [
+            request.method for request in mock.request_history
+            if request.url == ARCHIVE_URL
+        ]
+
+
+def stored_objects(root):
+    return [
+        path for path in (root / 'objects').rglob('*') if path.is_file()
+    ]
+
+
+def test_download_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    downloads = tmp_path / 'downloads'
+    archive = downloads / 'python-3.12.0-docs-pdf-a4.zip'
+    digest = hashlib.sha256(pages.ARCHIVE_CONTENT).hexdigest()
+
+    assert run_download() == ['HEAD', 'GET']
+    assert archive.read_bytes() == pages.ARCHIVE_CONTENT
+    assert archive.samefile(downloads / 'objects' / digest[:2] / digest[2:])
+    manifest = json.loads((downloads / 'manifest.json').read_text())
+    assert manifest[ARCHIVE_URL]['sha256'] == digest
+    assert manifest[ARCHIVE_URL]['etag'] == '"archive"'
+
+    archive.unlink()
+    assert run_download() == ['HEAD'], (
+        'Неизменившийся архив не должен загружаться повторно'
+    )
+    assert archive.read_bytes() == pages.ARCHIVE_CONTENT, (
+        'Имя архива должно восстанавливаться из хранилища'
+    )
+
+    assert run_download(etag='"touched"') == ['HEAD', 'GET']
+    assert len(stored_objects(downloads)) == 1, (
+        'То же содержимое не должно сохраняться повторно'
+    )
+
+    assert run_download(etag='"new"', content=b'new archive') == [
+        'HEAD', 'GET'
+    ]
+    assert archive.read_bytes() == b'new archive'
+    assert stored_objects(downloads) == [
+        downloads / 'objects' / NEW_DIGEST[:2] / NEW_DIGEST[2:]
+    ], 'Содержимое, на которое не ссылается манифест, должно удаляться'
+    assert not (downloads / 'objects' / digest[:2]).exists()
+
+
+def test_link_fallback(monkeypatch, tmp_path):
+    source = tmp_path / 'objects' / 'ab' / 'cdef'
+    source.parent.mkdir(parents=True)
+    source.write_bytes(b'content')
+
+    def no_links(*args):
+        raise OSError('links are not supported')
+
+    monkeypatch.setattr(store.os, 'link', no_links)
+    store.link_file(source, tmp_path / 'symlink.zip')
+    assert (tmp_path / 'symlink.zip').is_symlink()
+    assert (tmp_path / 'symlink.zip').read_bytes() == b'content'
+
+    monkeypatch.setattr(store.os, 'symlink', no_links)
+    store.link_file(source, tmp_path / 'copy.zip')
+    assert not (tmp_path / 'copy.zip').is_symlink()
+    assert (tmp_path / 'copy.zip').read_bytes() == b'content', (
+        'Без поддержки ссылок содержимое должно копироваться'
+    )
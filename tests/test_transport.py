@@ -0,0 +1,85 @@
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+try:
+    from src import configs, transport
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `transport.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `transport.py`'
+
+BODY = b'<html><body>' + b'<p>PEP</p>' * 1000 + b'</body></html>'
+
+
+class GzipHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = BODY
+        self.send_response(200)
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), GzipHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}/'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_configure_session_transport():
+    session = configs.configure_session(workers=16, backend='memory')
+    adapter = session.transport
+    assert isinstance(adapter, configs.transport.PooledAdapter)
+    assert adapter._pool_maxsize == 16, (
+        'Размер пула соединений должен соответствовать числу потоков'
+    )
+    assert adapter._pool_block, (
+        'При исчерпании пула поток должен ждать свободное соединение'
+    )
+    assert 'gzip' in session.headers['Accept-Encoding']
+
+
+def test_default_timeout(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        requests.adapters.HTTPAdapter,
+        'send',
+        lambda self, request, **kwargs: calls.append(kwargs['timeout']),
+    )
+    adapter = transport.PooledAdapter(timeout=(1, 2))
+    adapter.send(None)
+    adapter.send(None, timeout=7)
+    assert calls == [(1, 2), 7], (
+        'Тайм-аут по умолчанию не должен заменять явно переданный'
+    )
+
+
+def test_connection_reuse_and_gzip(server):
+    session = requests.Session()
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    adapter = transport.PooledAdapter(pool_size=2)
+    session.mount('http://', adapter)
+    for _ in range(5):
+        response = session.get(server)
+        assert response.content == BODY, 'Ответ в gzip должен распаковываться'
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+    assert adapter.connection_stats() == {'127.0.0.1': (1, 5)}, (
+        'Запросы к одному хосту должны идти через одно соединение keep-alive'
+    )
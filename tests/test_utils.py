@@ -1,3 +1,5 @@
+import hashlib
+
 import pytest
 import requests
 import requests_mock
@@ -54,3 +56,137 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+ARCHIVE_URL = MAIN_DOC_URL + 'archives/docs.zip'
+CONTENT = b'0123456789' * 1000
+
+
+ETAG = '"docs-v1"'
+
+
+def range_callback(request, context):
+    context.headers['ETag'] = ETAG
+    if 'Range' not in request.headers or request.headers['If-Range'] != ETAG:
+        return CONTENT
+    start = int(request.headers['Range'][len('bytes='):-1])
+    context.status_code = 206
+    context.headers['Content-Range'] = (
+        f'bytes {start}-{len(CONTENT) - 1}/{len(CONTENT)}'
+    )
+    return CONTENT[start:]
+
+
+def write_part(tmp_path, content, validator=ETAG):
+    (tmp_path / 'docs.zip.part').write_bytes(content)
+    (tmp_path / 'docs.zip.part.validator').write_text(validator)
+
+
+def test_download_file(mock_session, tmp_path):
+    path = tmp_path / 'docs.zip'
+    with requests_mock.Mocker() as mock:
+        mock.get(ARCHIVE_URL, content=CONTENT)
+        got = utils.download_file(mock_session, ARCHIVE_URL, path)
+    assert got == path and path.read_bytes() == CONTENT
+    assert not (tmp_path / 'docs.zip.part').exists(), (
+        'Временный файл должен переименовываться после загрузки'
+    )
+    assert not mock_session.cache.contains(url=ARCHIVE_URL), (
+        'Архивы не должны сохраняться в кеше без --cache-downloads'
+    )
+
+
+def test_download_file_resume(mock_session, tmp_path):
+    path = tmp_path / 'docs.zip'
+    write_part(tmp_path, CONTENT[:4321])
+    with requests_mock.Mocker() as mock:
+        mock.get(ARCHIVE_URL, content=range_callback)
+        utils.download_file(mock_session, ARCHIVE_URL, path)
+        assert mock.last_request.headers['Range'] == 'bytes=4321-'
+        assert mock.last_request.headers['If-Range'] == ETAG, (
+            'Докачка должна проверять валидатор временного файла'
+        )
+    assert path.read_bytes() == CONTENT, (
+        'Докачка должна продолжать загрузку с конца временного файла'
+    )
+    assert not (tmp_path / 'docs.zip.part.validator').exists(), (
+        'Валидатор временного файла должен удаляться после загрузки'
+    )
+
+
+def test_download_file_without_validator(mock_session, tmp_path):
+    path = tmp_path / 'docs.zip'
+    (tmp_path / 'docs.zip.part').write_bytes(b'stale')
+    with requests_mock.Mocker() as mock:
+        mock.get(ARCHIVE_URL, content=range_callback)
+        utils.download_file(mock_session, ARCHIVE_URL, path)
+        assert 'Range' not in mock.last_request.headers, (
+            'Временный файл без валидатора нельзя докачивать'
+        )
+    assert path.read_bytes() == CONTENT
+
+
+@pytest.mark.parametrize('headers, expected', (
+    ({'ETag': ETAG}, ETAG),
+    ({'ETag': 'W/"weak"', 'Last-Modified': 'Mon, 01 Jan 2024'},
+     'Mon, 01 Jan 2024'),
+    ({'ETag': 'W/"weak"'}, None),
+))
+def test_save_validator(tmp_path, headers, expected):
+    response = requests.Response()
+    response.headers.update(headers)
+    validator_path = tmp_path / 'docs.zip.part.validator'
+    utils.save_validator(response, validator_path)
+    got = validator_path.read_text() if validator_path.exists() else None
+    assert got == expected, (
+        'Для If-Range сохраняется сильный ETag или Last-Modified'
+    )
+
+
+@pytest.mark.parametrize('validator, content_range', (
+    ('"docs-v0"', None),
+    (ETAG, 'bytes 0-9999/10000'),
+))
+def test_download_file_changed(
+    mock_session, tmp_path, validator, content_range
+):
+    path = tmp_path / 'docs.zip'
+    write_part(tmp_path, b'stale' * 100, validator)
+
+    def callback(request, context):
+        if content_range is None or 'Range' not in request.headers:
+            return range_callback(request, context)
+        context.status_code = 206
+        context.headers['Content-Range'] = content_range
+        return CONTENT
+
+    with requests_mock.Mocker() as mock:
+        mock.get(ARCHIVE_URL, content=callback)
+        utils.download_file(mock_session, ARCHIVE_URL, path)
+    assert path.read_bytes() == CONTENT, (
+        'Если архив изменился или сервер вернул не тот диапазон, '
+        'файл загружается заново'
+    )
+
+
+def test_download_file_digest(mock_session, tmp_path):
+    path = tmp_path / 'docs.zip'
+    write_part(tmp_path, CONTENT[:4321])
+    digest = hashlib.sha256()
+    with requests_mock.Mocker() as mock:
+        mock.get(ARCHIVE_URL, content=range_callback)
+        utils.download_file(mock_session, ARCHIVE_URL, path, digest=digest)
+    assert digest.hexdigest() == hashlib.sha256(CONTENT).hexdigest(), (
+        'Хеш должен учитывать и докачанное начало файла'
+    )
+
+
+def test_download_file_restart(mock_session, tmp_path):
+    path = tmp_path / 'docs.zip'
+    write_part(tmp_path, b'stale')
+    with requests_mock.Mocker() as mock:
+        mock.get(ARCHIVE_URL, content=CONTENT, status_code=200)
+        utils.download_file(mock_session, ARCHIVE_URL, path)
+    assert path.read_bytes() == CONTENT, (
+        'Если сервер не поддерживает Range, файл загружается заново'
+    )
@@ -0,0 +1,162 @@
+import sys
+from argparse import Namespace
+
+import pytest
+import requests
+import requests_mock
+from requests_cache import CachedSession
+
+from conftest import collect
+from tests.fixture_data import pages
+try:
+    from src import changes, main
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `changes.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `changes.py`'
+
+DOCS_MAIN = pages.DOCS_MAIN.replace(
+    'Python 3.13 (in development)', 'Python 3.13 (stable)'
+).replace(
+    '<li><a href="https://docs.python.org/2.7/">',
+    '<li><a href="https://docs.python.org/3.14/">'
+    'Python 3.14 (in development)</a></li>'
+    '<li><a href="https://docs.python.org/2.7/">',
+)
+CARD_URL = 'https://peps.python.org/pep-0703/'
+
+
+def test_pep_events():
+    old = {'1': 'Active', '703': 'Draft'}
+    new = {'1': 'Active', '703': 'Accepted', '3999': 'Draft'}
+    assert changes.pep_events(None, new) == [], (
+        'Для первого снимка события не выводятся'
+    )
+    assert changes.pep_events(old, new) == [
+        ('pep-status', 'PEP 703', 'Draft', 'Accepted'),
+        ('pep-new', 'PEP 3999', '', 'Draft'),
+    ]
+
+
+def test_version_events():
+    old = {'3.12': ['https://docs.python.org/3.12/', 'stable']}
+    new = {
+        '3.12': ['https://docs.python.org/3.12/', 'security-fixes'],
+        '3.13': ['https://docs.python.org/3.13/', 'stable'],
+    }
+    assert changes.version_events(old, new) == [
+        ('version-status', '3.12', 'stable', 'security-fixes'),
+        ('version-new', '3.13', '', 'stable'),
+    ]
+
+
+def test_watch(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    session = CachedSession(backend='memory')
+    cli_args = Namespace(mode='watch', polls=2, interval=0)
+
+    with requests_mock.Mocker() as mock:
+        pages.register_site(mock)
+        mock.get(CARD_URL, text=pages.pep_card(
+            703, 'Draft', 'Standards Track', '09-Jan-2023'
+        ), headers={'ETag': '"draft"'})
+        got = collect(main.watch(session, cli_args))
+        urls = [request.url for request in mock.request_history]
+    assert got == [('Время', 'Событие', 'Объект', 'Было', 'Стало')], (
+        'Первый опрос сохраняет исходный снимок без событий'
+    )
+    assert (tmp_path / 'state' / 'watch.json').exists()
+    cards = [url for url in urls if '/pep-' in url]
+    assert len(cards) == len(pages.PEPS), (
+        'Повторный опрос без изменений не должен загружать карточки PEP'
+    )
+    assert len(urls) == len(pages.PEPS) + 4
+
+    peps = [
+        (703, 'SA', 'Accepted', 'Standards Track', '09-Jan-2023')
+        if pep[0] == 703 else pep
+        for pep in pages.PEPS
+    ] + [(3999, 'S', 'Draft', 'Standards Track', '01-Jan-2026')]
+    cli_args.polls = 1
+    with requests_mock.Mocker() as mock:
+        pages.register_site(mock, peps=peps)
+        # карточка в кеше сессии перепроверяется по ETag
+        mock.get(CARD_URL, text=pages.pep_card(
+            703, 'Accepted', 'Standards Track', '09-Jan-2023'
+        ), headers={'ETag': '"accepted"'})
+        mock.get('https://docs.python.org/3/', text=DOCS_MAIN)
+        got = collect(main.watch(session, cli_args))
+    assert [row[1:] for row in got[1:]] == [
+        ('pep-status', 'PEP 703', 'Draft', 'Accepted'),
+        ('pep-new', 'PEP 3999', '', 'Draft'),
+        ('version-status', '3.13', 'in development', 'stable'),
+        ('version-new', '3.14', '', 'in development'),
+    ], 'Режим `watch` должен выводить только изменения с прошлого опроса'
+
+
+def test_watch_keeps_events_on_failed_poll(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    peps = [
+        (703, 'SA', 'Accepted', 'Standards Track', '09-Jan-2023')
+        if pep[0] == 703 else pep
+        for pep in pages.PEPS
+    ]
+    index_polls = []
+
+    def pep_index(request, context):
+        index_polls.append(request.url)
+        return pages.pep_index(peps if len(index_polls) > 1 else pages.PEPS)
+
+    def card(request, context):
+        # карточка без ETag и Last-Modified
+        status = 'Accepted' if len(index_polls) > 1 else 'Draft'
+        return pages.pep_card(703, status, 'Standards Track', '09-Jan-2023')
+
+    def docs_main(request, context):
+        if len(index_polls) == 2:
+            raise requests.exceptions.ConnectionError('docs are down')
+        return pages.DOCS_MAIN
+
+    with requests_mock.Mocker() as mock:
+        pages.register_site(mock)
+        mock.get('https://peps.python.org/', text=pep_index)
+        mock.get(CARD_URL, text=card)
+        mock.get('https://docs.python.org/3/', text=docs_main)
+        got = collect(main.watch(
+            CachedSession(backend='memory'),
+            Namespace(mode='watch', polls=3, interval=0),
+        ))
+    assert [row[1:] for row in got[1:]] == [
+        ('pep-status', 'PEP 703', 'Draft', 'Accepted'),
+    ], (
+        'Сбой опроса одной страницы не должен терять изменения другой, '
+        'а карточка без валидаторов должна загружаться заново'
+    )
+
+
+def test_watch_stops_on_interrupt(monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+
+    def interrupt(seconds):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(main.time, 'sleep', interrupt)
+    with requests_mock.Mocker() as mock:
+        pages.register_site(mock)
+        got = collect(main.watch(
+            CachedSession(backend='memory'),
+            Namespace(mode='watch', polls=None, interval=60),
+        ))
+    assert got == [('Время', 'Событие', 'Объект', 'Было', 'Стало')], (
+        'Ctrl+C должен завершать поток событий без исключения'
+    )
+    assert (tmp_path / 'state' / 'watch.json').exists()
+
+
+def test_watch_rejects_pretty(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['main.py', 'watch', '-o', 'pretty'])
+    with pytest.raises(SystemExit) as excinfo:
+        main.main()
+    assert excinfo.value.code == 2, (
+        'Для бесконечного потока событий вывод pretty недоступен'
+    )